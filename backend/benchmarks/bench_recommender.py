@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Recommender Benchmark and Regression Suite
+
+Drives the AI recommender in-process (no HTTP) on synthetic skill graphs
+and reports p50/p99 latency and peak allocation per call for:
+- _recommend
+- _extract_skills_from_text
+- _get_course_recommendations
+
+Results are compared against the committed baseline
+(benchmarks/recommender_baseline.json) and the run fails when a case
+regresses past the allowed tolerance in two runs in a row, or when there
+is no baseline.
+
+Run from the backend directory:
+    python benchmarks/bench_recommender.py
+    python benchmarks/bench_recommender.py --sizes 1000 10000 --iterations 200
+    python benchmarks/bench_recommender.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Make `routes` / `services` importable when run from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes import ai_recommender
+from services.skill_cooccurrence import SkillCooccurrence
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "recommender_baseline.json")
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+MESSAGE_WORDS = [10, 100, 1_000]
+FILLER_WORDS = ["i", "want", "to", "learn", "more", "about", "and", "also", "some", "the"]
+
+
+def build_synthetic_graph(size: int, rng: random.Random, edges_per_skill: int = 4):
+    """Build a GRAPH-shaped dict plus a course table for `size` skills"""
+    skills = [f"skill{i}" for i in range(size)]
+    graph = {}
+    for skill in skills:
+        graph[skill] = [
+            {
+                "skill": rng.choice(skills),
+                "reason": f"Synthetic progression from {skill}",
+                "weight": round(rng.uniform(0.5, 2.0), 2),
+            }
+            for _ in range(edges_per_skill)
+        ]
+
+    courses = {
+        skill: [
+            {
+                "title": f"{skill} course {n}",
+                "provider": "Synthetic",
+                "instructor": "Benchmark",
+                "level": "Intermediate",
+                "description": f"Synthetic course {n} for {skill}",
+                "url": f"https://example.com/{skill}/{n}",
+            }
+            for n in range(3)
+        ]
+        # Roughly a third of the skills have courses, like the real table
+        for skill in skills[::3]
+    }
+    return skills, graph, courses
+
+
+def build_cooccurrence(skills: List[str], rng: random.Random, learners: int = 2_000) -> SkillCooccurrence:
+    """Seed a co-occurrence matrix as if `learners` had certificates"""
+    cooc = SkillCooccurrence()
+    for learner in range(learners):
+        cooc.observe(f"learner{learner}", rng.sample(skills, 3))
+    return cooc
+
+
+def install(skills, graph, courses, cooc) -> None:
+    """Point the recommender module at a synthetic graph"""
+    ai_recommender.GRAPH = graph
+    ai_recommender.KNOWN_SKILLS = set(skills)
+    ai_recommender.EDGES = ai_recommender._build_edge_index(graph)
+    ai_recommender.COURSE_RECOMMENDATIONS = courses
+    ai_recommender.skill_cooccurrence = cooc
+
+
+def build_message(skills: List[str], words: int, rng: random.Random) -> str:
+    """Mix known skills into filler text at roughly 1 in 5 words"""
+    return " ".join(
+        rng.choice(skills) if rng.random() < 0.2 else rng.choice(FILLER_WORDS)
+        for _ in range(words)
+    )
+
+
+def measure(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    """Time and allocation profile of `fn` over `iterations` calls"""
+    # Warm up caches and the interpreter
+    for _ in range(min(10, iterations)):
+        fn()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        latencies.append(time.perf_counter_ns() - start)
+
+    # Allocation profile is taken separately so tracing does not skew timing
+    allocations = []
+    tracemalloc.start()
+    for _ in range(min(50, iterations)):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        allocations.append(peak - base)
+    tracemalloc.stop()
+
+    latencies.sort()
+    allocations.sort()
+    return {
+        "p50_us": round(latencies[len(latencies) // 2] / 1_000, 2),
+        "p99_us": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1_000, 2),
+        "alloc_kib": round(allocations[len(allocations) // 2] / 1024, 2),
+    }
+
+
+def run(sizes: List[int], iterations: int, seed: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        rng = random.Random(seed)
+        skills, graph, courses = build_synthetic_graph(size, rng)
+        install(skills, graph, courses, build_cooccurrence(skills, rng))
+
+        inputs = [rng.sample(skills, 5) for _ in range(iterations)]
+        cursor = iter(range(10**9))
+
+        def next_input():
+            return inputs[next(cursor) % len(inputs)]
+
+        results[f"recommend/{size}"] = measure(
+            lambda: ai_recommender._recommend(next_input(), 5), iterations
+        )
+        results[f"course_recommendations/{size}"] = measure(
+            lambda: ai_recommender._get_course_recommendations(next_input()), iterations
+        )
+        for words in MESSAGE_WORDS:
+            message = build_message(skills, words, rng)
+            results[f"extract_skills/{size}/{words}w"] = measure(
+                lambda: ai_recommender._extract_skills_from_text(message), iterations
+            )
+    return results
+
+
+def compare(
+    results,
+    baseline,
+    latency_tolerance: float,
+    alloc_tolerance: float,
+    latency_slack_us: float = 0.0
+) -> List[str]:
+    """Return a list of human-readable regressions"""
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        for metric, tolerance in (("p50_us", latency_tolerance), ("p99_us", latency_tolerance), ("alloc_kib", alloc_tolerance)):
+            limit = previous[metric] * (1 + tolerance)
+            if metric != "alloc_kib":
+                # Microsecond-scale cases jitter by more than any relative tolerance
+                limit = max(limit, previous[metric] + latency_slack_us)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{case} {metric}: {current[metric]} > {previous[metric]} (+{tolerance:.0%} allowed)"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the AI recommender in-process")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5)
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10)
+    parser.add_argument("--latency-slack-us", type=float, default=50.0,
+                        help="Absolute latency increase always allowed, on top of the relative tolerance")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.iterations, args.seed)
+
+    print(f"{'case':<40} {'p50 (us)':>10} {'p99 (us)':>10} {'alloc (KiB)':>12}")
+    print("-" * 75)
+    for case, metrics in results.items():
+        print(f"{case:<40} {metrics['p50_us']:>10} {metrics['p99_us']:>10} {metrics['alloc_kib']:>12}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # A missing baseline must not pass silently; record one deliberately
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        return 2
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.latency_tolerance, args.alloc_tolerance, args.latency_slack_us)
+    if regressions:
+        # A single noisy run (preemption, frequency scaling) should not fail
+        # the suite: measure again and keep the better value of each metric
+        print(f"\n{len(regressions)} possible regression(s); measuring again to confirm")
+        rerun = run(args.sizes, args.iterations, args.seed)
+        results = {
+            case: {metric: min(value, rerun[case][metric]) for metric, value in metrics.items()}
+            for case, metrics in results.items()
+        }
+        regressions = compare(results, baseline, args.latency_tolerance, args.alloc_tolerance, args.latency_slack_us)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,14 @@
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Local routers
 from routes import certificates, verify, ai_recommender, wallet, contracts, issue, ai_verification, mint_certificate
+from services.block_follower import block_follower
+from services.chain_indexer import chain_indexer
+from services.skill_cooccurrence import skill_cooccurrence
 
 app = FastAPI()
 
@@ -26,6 +32,45 @@ app.include_router(wallet.router)  # mounted at /wallet
 app.include_router(contracts.router)  # mounted at /contracts
 
 
+def _enabled(name: str) -> bool:
+    # Background chain services are opt-in; set the variable to 1 to run them
+    return os.getenv(name, "0").lower() in ("1", "true", "yes", "on")
+
+
+@app.on_event("startup")
+async def start_block_follower():
+    # Invalidates cached account state as new blocks arrive; the indexer reads its blocks too
+    if _enabled("BLOCK_FOLLOWER") or _enabled("CHAIN_INDEXER"):
+        block_follower.start()
+
+
+@app.on_event("startup")
+async def start_chain_indexer():
+    # Local SQLite index behind the per-address / issuer / course lookups
+    if _enabled("CHAIN_INDEXER"):
+        chain_indexer.start()
+
+
+@app.on_event("startup")
+async def seed_skill_cooccurrence():
+    # Rebuild the recommender's co-occurrence counts from certificates already indexed
+    if not os.path.exists(chain_indexer.db_path):
+        return
+    rows = await asyncio.to_thread(chain_indexer.active_courses)
+    for row in rows:
+        skill_cooccurrence.observe(row["recipient"], ai_recommender.skills_in_text(row["course"]))
+
+
+@app.on_event("shutdown")
+async def stop_chain_indexer():
+    await chain_indexer.stop()
+
+
+@app.on_event("shutdown")
+async def stop_block_follower():
+    await block_follower.stop()
+
+
 @app.get("/")
 def root():
     return {"message": "SkillDCX backend is running 🚀"}
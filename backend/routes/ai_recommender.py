@@ -1,8 +1,10 @@
-from typing import List, Dict, Set
+from typing import Any, List, Dict, Set, Tuple
 from fastapi import APIRouter
 from pydantic import BaseModel
 import re
 
+from services.skill_cooccurrence import skill_cooccurrence
+
 # Group all AI endpoints under /ai
 router = APIRouter(prefix="/ai", tags=["ai"])
 
@@ -24,8 +26,9 @@ class MentorInput(BaseModel):
 
 
 # ----- Simple knowledge graph -----
-# Map: skill -> list of (next_skill, reason)
-GRAPH: Dict[str, List[Dict[str, str]]] = {
+# Map: skill -> list of (next_skill, reason[, weight])
+# Edges without an explicit "weight" count as 1.0.
+GRAPH: Dict[str, List[Dict[str, Any]]] = {
     "python": [
         {
             "skill": "machine learning",
@@ -106,6 +109,24 @@ KNOWN_SKILLS: Set[str] = set(GRAPH.keys()) | {
     n["skill"] for v in GRAPH.values() for n in v
 }
 
+# How much the learned co-occurrence signal contributes relative to a
+# unit-weight graph edge.
+COOCCURRENCE_WEIGHT = 0.5
+
+
+def _build_edge_index(graph: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Tuple[str, float, str]]]:
+    """Flatten GRAPH once into (target, weight, reason) tuples for scoring."""
+    return {
+        source.lower(): [
+            (rec["skill"].lower(), float(rec.get("weight", 1.0)), rec["reason"])
+            for rec in edges
+        ]
+        for source, edges in graph.items()
+    }
+
+
+EDGES: Dict[str, List[Tuple[str, float, str]]] = _build_edge_index(GRAPH)
+
 
 # ----- Course recommendations database -----
 COURSE_RECOMMENDATIONS: Dict[str, List[Dict[str, str]]] = {
@@ -386,18 +407,30 @@ def _extract_skills_from_text(message: str) -> List[str]:
     return list(present)
 
 
+def skills_in_text(text: str) -> List[str]:
+    """Known graph skills named in free text, including multi-word ones ("machine learning")"""
+    padded = " " + " ".join(re.findall(r"[a-zA-Z0-9+.#]+", text.lower())) + " "
+    return sorted(skill for skill in KNOWN_SKILLS if f" {skill} " in padded)
+
+
 def _recommend(skills: List[str], top_k: int) -> List[Dict]:
     have = set(_normalize(skills))
     candidate_scores: Dict[str, float] = {}
     candidate_reasons: Dict[str, Set[str]] = {}
 
     for s in have:
-        for rec in GRAPH.get(s, []):
-            target = rec["skill"].lower()
+        for target, weight, reason in EDGES.get(s, ()):
             if target in have:
                 continue
-            candidate_scores[target] = candidate_scores.get(target, 0.0) + 1.0
-            candidate_reasons.setdefault(target, set()).add(rec["reason"])
+            candidate_scores[target] = candidate_scores.get(target, 0.0) + weight
+            candidate_reasons.setdefault(target, set()).add(reason)
+
+    # Blend in what issued certificates say learners actually combine
+    for target, score in skill_cooccurrence.scores(have).items():
+        candidate_scores[target] = candidate_scores.get(target, 0.0) + COOCCURRENCE_WEIGHT * score
+        candidate_reasons.setdefault(target, set()).add(
+            "Learners with your skills often also earn certificates in this"
+        )
 
     # Simple normalization by max score
     if candidate_scores:
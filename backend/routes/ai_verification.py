@@ -1,9 +1,30 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, File, Form, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import json
+import os
 import random
+import shutil
+import tempfile
+import zipfile
+
+from services.ai_certificate_verifier import verify_certificate_files, detect_file_type
+from services.certificate_scoring import score_certificates
 
 router = APIRouter()
 
+# Directory batches are only allowed below this root (unset = archive uploads only)
+BATCH_VERIFY_ROOT = os.getenv("BATCH_VERIFY_ROOT")
+BATCH_VERIFY_MAX_FILES = int(os.getenv("BATCH_VERIFY_MAX_FILES", "10000"))
+BATCH_VERIFY_MAX_ARCHIVE_BYTES = int(os.getenv("BATCH_VERIFY_MAX_ARCHIVE_BYTES", str(2 * 1024 ** 3)))
+# Size of the uploaded (compressed) zip itself, checked while it is saved
+BATCH_VERIFY_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_VERIFY_MAX_UPLOAD_BYTES", str(512 * 1024 ** 2)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Largest number of items accepted by /verifyCertificate/batch
+AI_VERIFY_MAX_BATCH = int(os.getenv("AI_VERIFY_MAX_BATCH", "1000"))
+
 
 class CertificateVerificationRequest(BaseModel):
     """Certificate data for AI verification"""
@@ -21,6 +42,16 @@ class CertificateVerificationResponse(BaseModel):
     reason: str
 
 
+class CertificateVerificationBatchRequest(BaseModel):
+    """Several certificates to verify in one call (at most AI_VERIFY_MAX_BATCH)"""
+    items: List[CertificateVerificationRequest] = Field(max_length=AI_VERIFY_MAX_BATCH)
+
+
+class CertificateVerificationBatchResponse(BaseModel):
+    """One result per item, in request order"""
+    results: List[CertificateVerificationResponse]
+
+
 @router.post("/verifyCertificate")
 async def verify_certificate_ai(request: CertificateVerificationRequest) -> CertificateVerificationResponse:
     """
@@ -38,56 +69,30 @@ async def verify_certificate_ai(request: CertificateVerificationRequest) -> Cert
     """
     
     try:
-        # Simulate AI verification logic
-        validation_score = 0.0
-        reasons = []
-        
-        # Check 1: Certificate ID format (should not be empty)
-        if request.cert_id and len(request.cert_id) > 5:
-            validation_score += 0.20
-        else:
-            reasons.append("Invalid certificate ID format")
-        
-        # Check 2: IPFS hash format (CID validation)
-        if request.ipfs_hash.startswith("Qm") or request.ipfs_hash.startswith("bafy"):
-            validation_score += 0.25
-        else:
-            reasons.append("Invalid IPFS hash format")
-        
-        # Check 3: Recipient address (Algorand address length = 58)
-        if len(request.recipient_address) == 58:
-            validation_score += 0.20
-        else:
-            reasons.append("Invalid recipient address")
-        
-        # Check 4: Issuer address
-        if len(request.issuer_address) == 58:
-            validation_score += 0.15
-        else:
-            reasons.append("Invalid issuer address")
-        
-        # Check 5: Metadata completeness
-        required_fields = ["courseName", "studentName", "issueDate"]
-        metadata_valid = all(field in request.metadata for field in required_fields)
-        
-        if metadata_valid:
-            validation_score += 0.20
-        else:
-            reasons.append("Incomplete metadata")
-        
-        # Determine validity (threshold: 0.80)
-        is_valid = validation_score >= 0.80
-        
-        # If valid, provide positive reason
-        if is_valid:
-            reason = "Certificate passed all AI verification checks"
-        else:
-            reason = f"Verification failed: {'; '.join(reasons)}"
-        
-        return CertificateVerificationResponse(
-            valid=is_valid,
-            confidence=round(validation_score, 2),
-            reason=reason
+        return _score_verification_requests([request])[0]
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"AI verification error: {str(e)}"
+        )
+
+
+@router.post("/verifyCertificate/batch")
+async def verify_certificate_ai_batch(
+    request: CertificateVerificationBatchRequest
+) -> CertificateVerificationBatchResponse:
+    """
+    Batch version of /verifyCertificate.
+    
+    Runs the same checks over every item in one columnar pass and
+    returns the results in request order. Batches are capped at
+    AI_VERIFY_MAX_BATCH items by the request model (422 above that).
+    """
+    
+    try:
+        return CertificateVerificationBatchResponse(
+            results=_score_verification_requests(request.items)
         )
     
     except Exception as e:
@@ -97,6 +102,123 @@ async def verify_certificate_ai(request: CertificateVerificationRequest) -> Cert
         )
 
 
+def _score_verification_requests(
+    requests: List[CertificateVerificationRequest]
+) -> List[CertificateVerificationResponse]:
+    """Score requests column-wise against the verification rules"""
+    return [
+        CertificateVerificationResponse(valid=valid, confidence=confidence, reason=reason)
+        for valid, confidence, reason in score_certificates([r.dict() for r in requests])
+    ]
+
+
+def _collect_certificate_files(root: str) -> List[str]:
+    """All supported certificate files below a directory, in a stable order"""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if detect_file_type(name):
+                paths.append(os.path.join(dirpath, name))
+    return paths
+
+
+def _extract_archive(upload: UploadFile, dest: str) -> None:
+    """Save an uploaded zip and unpack it safely into dest"""
+    archive_path = os.path.join(dest, "upload.zip")
+    written = 0
+    with open(archive_path, "wb") as f:
+        while True:
+            chunk = upload.file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > BATCH_VERIFY_MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Uploaded archive is too large")
+            f.write(chunk)
+
+    extract_dir = os.path.join(dest, "files")
+    with zipfile.ZipFile(archive_path) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+        if sum(info.file_size for info in members) > BATCH_VERIFY_MAX_ARCHIVE_BYTES:
+            raise HTTPException(status_code=413, detail="Archive is too large")
+
+        for info in members:
+            # Reject absolute paths and parent references (zip slip)
+            parts = [p for p in info.filename.replace("\\", "/").split("/") if p not in ("", ".")]
+            if not parts or ".." in parts:
+                continue
+            target = os.path.join(extract_dir, *parts)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zf.open(info) as src, open(target, "wb") as out:
+                shutil.copyfileobj(src, out)
+
+    os.remove(archive_path)
+
+
+@router.post("/verifyCertificateFiles/batch")
+async def verify_certificate_files_batch(
+    archive: Optional[UploadFile] = File(None),
+    directory: Optional[str] = Form(None),
+    concurrency: Optional[int] = Form(None)
+):
+    """
+    Batch OCR verification of certificate files.
+    
+    Accepts either a zip archive upload or a server-side directory below
+    BATCH_VERIFY_ROOT. Identical files are verified once, files are
+    processed by a bounded worker pool, and results are streamed back as
+    NDJSON (one JSON object per line) as each file finishes, each with a
+    progress counter.
+    """
+    
+    if (archive is None) == (directory is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of 'archive' or 'directory'")
+    
+    tmp_dir = None
+    try:
+        if archive is not None:
+            tmp_dir = tempfile.mkdtemp(prefix="cert-batch-")
+            try:
+                await run_in_threadpool(_extract_archive, archive, tmp_dir)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail="Archive is not a valid zip file")
+            root = os.path.join(tmp_dir, "files")
+        else:
+            if not BATCH_VERIFY_ROOT:
+                raise HTTPException(status_code=403, detail="Directory batches are disabled")
+            allowed_root = os.path.realpath(BATCH_VERIFY_ROOT)
+            root = os.path.realpath(os.path.join(allowed_root, directory))
+            if os.path.commonpath([allowed_root, root]) != allowed_root or not os.path.isdir(root):
+                raise HTTPException(status_code=400, detail="Invalid directory")
+        
+        paths = await run_in_threadpool(_collect_certificate_files, root)
+        if not paths:
+            raise HTTPException(status_code=400, detail="No certificate files found")
+        if len(paths) > BATCH_VERIFY_MAX_FILES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch exceeds {BATCH_VERIFY_MAX_FILES} files"
+            )
+    except Exception:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    
+    async def stream():
+        try:
+            async for record in verify_certificate_files(paths, concurrency):
+                record["file"] = os.path.relpath(record["file"], root)
+                if "duplicate_of" in record:
+                    record["duplicate_of"] = os.path.relpath(record["duplicate_of"], root)
+                yield json.dumps(record) + "\n"
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/verifyCertificate/mock")
 async def verify_certificate_mock(request: dict) -> dict:
     """
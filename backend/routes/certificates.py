@@ -2,7 +2,9 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Dict
 from routes.auth import get_current_user
+from routes.ai_recommender import skills_in_text
 from services.pinata import upload_to_ipfs  # this should exist
+from services.skill_cooccurrence import skill_cooccurrence
 
 router = APIRouter()
 
@@ -41,6 +43,9 @@ def issue_certificate(
 
         certificates_db[cert_id] = {**cert_data, "ipfs_hash": ipfs_hash}
 
+        # Feed the recommender's co-occurrence signal with the graph skills the course covers
+        skill_cooccurrence.observe(data.student_id, skills_in_text(data.course))
+
         return {"status": "success", "ipfs_hash": ipfs_hash, "cert_id": cert_id}
     except Exception as e:
         print(f"Error issuing certificate: {e}")
@@ -1,23 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import json
 import os
-import base64
-from algosdk.v2client import algod
-from algosdk import encoding, transaction
+from algosdk import transaction
 import logging
 
+from services.algorand_address import is_valid_address
+from services.algod_pool import algod_pool
+from services.account_cache import account_cache
+from services.certificate_minting_service import minting_service
+from services.certificate_record import is_valid_cid
+from services.chain_indexer import chain_indexer
+from services.revocation_list import revocation_list
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Largest number of items accepted by /verify/batch
+CONTRACT_VERIFY_MAX_BATCH = int(os.getenv("CONTRACT_VERIFY_MAX_BATCH", "500"))
+
+# Largest page returned by the chain index lookups
+INDEX_QUERY_MAX_LIMIT = 1000
 
 # Load deployed contract info
 # Path: backend/routes/contracts.py -> backend/routes -> backend -> SkillDCX -> contracts/
@@ -45,6 +53,25 @@ class CertificateIssueRequest(BaseModel):
 class CertificateVerifyRequest(BaseModel):
     certificate_holder: str
     expected_ipfs_hash: str
+    cert_id: Optional[str] = None  # enables the in-memory revocation pre-check
+
+class CertificateVerifyBatchRequest(BaseModel):
+    """Several holder / IPFS hash pairs to verify in one call"""
+    items: List[CertificateVerifyRequest]
+
+class CertificateVerifyResult(BaseModel):
+    certificate_holder: str
+    expected_ipfs_hash: str
+    verified: bool
+    revoked: Optional[bool] = None
+    error: Optional[str] = None
+
+class CertificateVerifyBatchResponse(BaseModel):
+    """One result per item, in request order"""
+    results: List[CertificateVerifyResult]
+    verified_count: int
+    error_count: int
+    unique_checks: int
 
 class CertificateRevokeRequest(BaseModel):
     issuer_address: str
@@ -60,18 +87,29 @@ class CertificateInfo(BaseModel):
 
 class ContractCallResponse(BaseModel):
     success: bool
-    transaction_id: Optional[str]
+    transaction_id: Optional[str] = None
     message: str
     data: Optional[Dict[str, Any]] = None
 
-def get_contract_app_id(contract_name: str) -> int:
-    """Get application ID for a contract"""
-    if contract_name == "certification":
-        return deployed_contracts.get("certification_app_id", 0)
-    elif contract_name == "issuer_registry":
-        return deployed_contracts.get("issuer_registry_app_id", 0)
-    else:
-        raise ValueError(f"Unknown contract: {contract_name}")
+async def refresh_revocations() -> bool:
+    """Bring the revocation list up to date; False when the chain index is not serving"""
+    if not revocation_list.available:
+        return False
+    # Only reads the index when it advanced since the last refresh
+    if revocation_list.stale:
+        await run_in_threadpool(revocation_list.refresh)
+    return True
+
+async def require_revocations() -> None:
+    # An empty list from a stopped indexer would read as "nothing revoked"
+    if not await refresh_revocations():
+        raise HTTPException(
+            status_code=503,
+            detail="Revocation list unavailable: the chain indexer is not running (set CHAIN_INDEXER=1)"
+        )
+
+def _page_size(limit: int) -> int:
+    return min(max(limit, 1), INDEX_QUERY_MAX_LIMIT)
 
 @router.post("/verify", response_model=ContractCallResponse)
 async def verify_certificate(request: CertificateVerifyRequest):
@@ -79,88 +117,65 @@ async def verify_certificate(request: CertificateVerifyRequest):
     Verify a certificate's authenticity using the smart contract
     
     This endpoint:
-    1. Calls the certification contract's verify function
-    2. Checks if the certificate exists and matches the expected IPFS hash
+    1. Calls the unified contract's read-only verify_holder method through
+       algod simulate (no signature, no fee, nothing submitted)
+    2. The contract checks the holder has an active, AI verified
+       certificate whose IPFS multihash matches the expected hash
     3. Returns verification result
     """
     try:
-        # Get certification contract app ID
-        cert_app_id = get_contract_app_id("certification")
-        if cert_app_id == 0:
-            raise HTTPException(status_code=503, detail="Certification contract not deployed")
+        if not minting_service.unified_app_id:
+            raise HTTPException(status_code=503, detail=minting_service.unified_error)
         
         # Validate addresses
-        if not encoding.is_valid_address(request.certificate_holder):
+        if not is_valid_address(request.certificate_holder):
             raise HTTPException(status_code=400, detail="Invalid certificate holder address")
         
-        # Get account info to check if they have opted into the contract
-        try:
-            account_info = algod_client.account_info(request.certificate_holder)
-            apps_local_state = account_info.get('apps-local-state', [])
-            
-            # Check if user has opted into the certification app
-            app_state = None
-            for app in apps_local_state:
-                if app['id'] == cert_app_id:
-                    app_state = app.get('key-value', [])
-                    break
-            
-            if app_state is None:
-                return ContractCallResponse(
-                    success=False,
-                    message="Certificate holder has not opted into the certification contract",
-                    data={"opted_in": False}
-                )
-            
-            # Parse the local state to extract certificate data
-            cert_data = {}
-            for kv in app_state:
-                key = base64.b64decode(kv['key']).decode('utf-8')
-                if kv['value']['type'] == 1:  # bytes
-                    value = base64.b64decode(kv['value']['bytes']).decode('utf-8')
-                else:  # uint
-                    value = kv['value']['uint']
-                cert_data[key] = value
-            
-            # Check if certificate exists and is active
-            if 'ipfs_hash' not in cert_data or cert_data.get('active', 0) != 1:
-                return ContractCallResponse(
-                    success=False,
-                    message="No active certificate found for this address",
-                    data={"certificate_data": cert_data}
-                )
-            
-            # Verify IPFS hash matches
-            stored_hash = cert_data.get('ipfs_hash', '')
-            if stored_hash == request.expected_ipfs_hash:
-                return ContractCallResponse(
-                    success=True,
-                    message="Certificate verified successfully",
-                    data={
-                        "certificate_data": cert_data,
-                        "verified": True,
-                        "issuer": cert_data.get('issuer', ''),
-                        "timestamp": cert_data.get('timestamp', 0),
-                        "metadata": cert_data.get('metadata', '')
-                    }
-                )
-            else:
+        if not is_valid_cid(request.expected_ipfs_hash):
+            raise HTTPException(status_code=400, detail="Invalid IPFS hash")
+        
+        # Revoked certificates are rejected from memory, without a chain call
+        if request.cert_id is not None and await refresh_revocations():
+            if revocation_list.is_revoked(request.cert_id):
                 return ContractCallResponse(
                     success=False,
-                    message="Certificate IPFS hash does not match expected value",
+                    message="Certificate has been revoked",
                     data={
-                        "expected_hash": request.expected_ipfs_hash,
-                        "stored_hash": stored_hash,
-                        "certificate_data": cert_data
+                        "verified": False,
+                        "revoked": True,
+                        "cert_id": request.cert_id,
+                        "revocation_round": revocation_list.round
                     }
                 )
-                
-        except Exception as e:
-            logger.error(f"Error reading certificate data: {e}")
+        
+        # The contract's own verify logic, evaluated by the node
+        [(verified, error)] = await minting_service.simulator.verify_holders(
+            [(request.certificate_holder, request.expected_ipfs_hash)]
+        )
+        if error:
+            logger.error(f"Error simulating certificate verification: {error}")
             return ContractCallResponse(
                 success=False,
-                message=f"Error reading certificate data: {str(e)}"
+                message=f"Error verifying certificate: {error}"
+            )
+        
+        data = {
+            "verified": bool(verified),
+            "certificate_holder": request.certificate_holder,
+            "ipfs_hash": request.expected_ipfs_hash,
+            "app_id": minting_service.unified_app_id
+        }
+        if verified:
+            return ContractCallResponse(
+                success=True,
+                message="Certificate verified successfully",
+                data=data
             )
+        return ContractCallResponse(
+            success=False,
+            message="No active certificate with this IPFS hash found for this address",
+            data=data
+        )
             
     except HTTPException:
         raise
@@ -168,58 +183,97 @@ async def verify_certificate(request: CertificateVerifyRequest):
         logger.error(f"Unexpected error verifying certificate: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during verification")
 
+@router.post("/verify/batch", response_model=CertificateVerifyBatchResponse)
+async def verify_certificates_batch(request: CertificateVerifyBatchRequest):
+    """
+    Batch version of /verify for employers screening many applicants
+    
+    Duplicate holder / hash pairs are checked once, and the unique checks
+    run as simulated verify_holder calls, 16 per simulate request. Invalid
+    addresses or hashes and failed calls are reported per item; they never
+    fail the batch. Batches are capped at CONTRACT_VERIFY_MAX_BATCH items.
+    """
+    if len(request.items) > CONTRACT_VERIFY_MAX_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (max {CONTRACT_VERIFY_MAX_BATCH})"
+        )
+    if not minting_service.unified_app_id:
+        raise HTTPException(status_code=503, detail=minting_service.unified_error)
+    
+    try:
+        # Items naming a revoked certificate are answered from memory
+        revoked = set()
+        if any(item.cert_id is not None for item in request.items) and await refresh_revocations():
+            revoked = {
+                item.cert_id for item in request.items
+                if item.cert_id is not None and revocation_list.is_revoked(item.cert_id)
+            }
+        
+        # Dedupe, keeping first-seen order
+        unique = list(dict.fromkeys(
+            (item.certificate_holder, item.expected_ipfs_hash)
+            for item in request.items if item.cert_id not in revoked
+        ))
+        outcomes = dict(zip(unique, await minting_service.simulator.verify_holders(unique)))
+        
+        results = []
+        for item in request.items:
+            if item.cert_id in revoked:
+                verified, error = False, None
+            else:
+                verified, error = outcomes[(item.certificate_holder, item.expected_ipfs_hash)]
+            results.append(CertificateVerifyResult(
+                certificate_holder=item.certificate_holder,
+                expected_ipfs_hash=item.expected_ipfs_hash,
+                verified=bool(verified),
+                revoked=(item.cert_id in revoked) if item.cert_id is not None else None,
+                error=error
+            ))
+        
+        return CertificateVerifyBatchResponse(
+            results=results,
+            verified_count=sum(1 for r in results if r.verified),
+            error_count=sum(1 for r in results if r.error),
+            unique_checks=len(unique)
+        )
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in batch verification: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error during verification")
+
 @router.get("/certificate/{address}", response_model=ContractCallResponse)
-async def get_certificate_info(address: str):
+async def get_certificate_info(address: str, limit: int = 100):
     """
     Get certificate information for a specific address
+    
+    Read from the unified contract: the holder's recipient index boxes and
+    the certificate box of each indexed key.
     """
     try:
         # Validate address
-        if not encoding.is_valid_address(address):
+        if not is_valid_address(address):
             raise HTTPException(status_code=400, detail="Invalid Algorand address")
         
-        # Get certification contract app ID
-        cert_app_id = get_contract_app_id("certification")
-        if cert_app_id == 0:
-            raise HTTPException(status_code=503, detail="Certification contract not deployed")
+        if not minting_service.unified_app_id:
+            raise HTTPException(status_code=503, detail=minting_service.unified_error)
         
-        # Get account info
-        account_info = algod_client.account_info(address)
-        apps_local_state = account_info.get('apps-local-state', [])
+        total, certificates = await minting_service.get_recipient_certificates(address, _page_size(limit))
         
-        # Find certificate data
-        cert_data = None
-        for app in apps_local_state:
-            if app['id'] == cert_app_id:
-                app_state = app.get('key-value', [])
-                cert_data = {}
-                for kv in app_state:
-                    key = base64.b64decode(kv['key']).decode('utf-8')
-                    if kv['value']['type'] == 1:  # bytes
-                        try:
-                            # Try to decode as string first
-                            value = base64.b64decode(kv['value']['bytes']).decode('utf-8')
-                        except:
-                            # If decoding fails, keep as base64
-                            value = kv['value']['bytes']
-                    else:  # uint
-                        value = kv['value']['uint']
-                    cert_data[key] = value
-                break
-        
-        if cert_data is None:
+        if total == 0:
             return ContractCallResponse(
                 success=False,
                 message="No certificate found for this address",
-                data={"opted_in": False}
+                data={"total": 0, "certificates": []}
             )
         
         return ContractCallResponse(
             success=True,
             message="Certificate information retrieved successfully",
             data={
-                "certificate_data": cert_data,
-                "app_id": cert_app_id,
+                "certificates": certificates,
+                "total": total,
+                "app_id": minting_service.unified_app_id,
                 "address": address
             }
         )
@@ -231,35 +285,88 @@ async def get_certificate_info(address: str):
         raise HTTPException(status_code=500, detail=f"Error retrieving certificate info: {str(e)}")
 
 @router.get("/certificates/{address}")
-async def get_user_certificates(address: str):
+async def get_user_certificates(address: str, limit: int = 100, offset: int = 0):
     """
     Get all certificates owned by a user
-    This would typically involve reading from multiple apps or indexing service
+    
+    Served from the local chain index (services/chain_indexer.py), so the
+    lookup never touches algod.
     """
     try:
-        # For now, just get the single certificate from our main contract
-        cert_response = await get_certificate_info(address)
+        if not is_valid_address(address):
+            raise HTTPException(status_code=400, detail="Invalid Algorand address")
         
-        if cert_response.success:
-            certificates = [{
-                "id": 1,
-                "contract_app_id": get_contract_app_id("certification"),
-                "certificate_data": cert_response.data["certificate_data"]
-            }]
-        else:
-            certificates = []
+        certificates = await run_in_threadpool(
+            chain_indexer.certificates_by_recipient, address, _page_size(limit), max(offset, 0)
+        )
+        total = await run_in_threadpool(chain_indexer.count_by_recipient, address)
         
         return {
             "success": True,
             "address": address,
             "certificates": certificates,
-            "total": len(certificates)
+            "total": total,
+            "contract_app_id": chain_indexer.app_id,
+            "indexed_round": chain_indexer.indexed_round
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting user certificates: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving certificates: {str(e)}")
 
+@router.get("/issuer/{address}/certificates")
+async def get_issuer_certificates(address: str, limit: int = 100, offset: int = 0):
+    """
+    Get certificates issued by an address, from the local chain index
+    """
+    try:
+        if not is_valid_address(address):
+            raise HTTPException(status_code=400, detail="Invalid Algorand address")
+        
+        certificates = await run_in_threadpool(
+            chain_indexer.certificates_by_issuer, address, _page_size(limit), max(offset, 0)
+        )
+        total = await run_in_threadpool(chain_indexer.count_by_issuer, address)
+        
+        return {
+            "success": True,
+            "issuer": address,
+            "certificates": certificates,
+            "total": total,
+            "indexed_round": chain_indexer.indexed_round
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting issuer certificates: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving certificates: {str(e)}")
+
+@router.get("/course/{course}/certificates")
+async def get_course_certificates(course: str, limit: int = 100, offset: int = 0):
+    """
+    Get certificates for a course (case-insensitive), from the local chain index
+    """
+    try:
+        certificates = await run_in_threadpool(
+            chain_indexer.certificates_by_course, course, _page_size(limit), max(offset, 0)
+        )
+        total = await run_in_threadpool(chain_indexer.count_by_course, course)
+        
+        return {
+            "success": True,
+            "course": course,
+            "certificates": certificates,
+            "total": total,
+            "indexed_round": chain_indexer.indexed_round
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting course certificates: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving certificates: {str(e)}")
+
 @router.get("/issuer/{address}/status")
 async def check_issuer_status(address: str):
     """
@@ -267,45 +374,27 @@ async def check_issuer_status(address: str):
     """
     try:
         # Validate address
-        if not encoding.is_valid_address(address):
+        if not is_valid_address(address):
             raise HTTPException(status_code=400, detail="Invalid Algorand address")
         
-        # Get issuer registry contract app ID
-        registry_app_id = get_contract_app_id("issuer_registry")
-        if registry_app_id == 0:
+        if not minting_service.unified_app_id:
             return {
                 "success": False,
-                "message": "Issuer registry contract not deployed",
+                "message": minting_service.unified_error,
                 "authorized": False
             }
         
-        # Get account info
-        account_info = algod_client.account_info(address)
-        apps_local_state = account_info.get('apps-local-state', [])
-        
-        # Check if address is in the issuer registry
-        issuer_data = None
-        for app in apps_local_state:
-            if app['id'] == registry_app_id:
-                app_state = app.get('key-value', [])
-                issuer_data = {}
-                for kv in app_state:
-                    key = base64.b64decode(kv['key']).decode('utf-8')
-                    if kv['value']['type'] == 1:  # bytes
-                        value = base64.b64decode(kv['value']['bytes']).decode('utf-8')
-                    else:  # uint
-                        value = kv['value']['uint']
-                    issuer_data[key] = value
-                break
+        # The issuer registry lives in the unified contract's issuer boxes
+        issuer_data = await minting_service.get_issuer_record(address)
         
-        is_authorized = issuer_data is not None and issuer_data.get('authorized', 0) == 1
+        is_authorized = issuer_data is not None and issuer_data["authorized"]
         
         return {
             "success": True,
             "address": address,
             "authorized": is_authorized,
             "issuer_data": issuer_data,
-            "registry_app_id": registry_app_id
+            "app_id": minting_service.unified_app_id
         }
         
     except HTTPException:
@@ -330,3 +419,56 @@ async def get_contract_info():
         },
         "available": len(deployed_contracts) > 0
     }
+
+@router.get("/revocations/snapshot")
+async def get_revocation_snapshot(if_none_match: Optional[str] = Header(None)):
+    """
+    Compact binary revocation snapshot for offline verifiers
+    
+    Format is documented in services/revocation_list.py (read it with
+    RevocationSnapshot). The ETag only changes when a revocation is
+    added, so polling clients get 304 until then.
+    """
+    await require_revocations()
+    etag = f'"{revocation_list.version}"'
+    headers = {
+        "ETag": etag,
+        "X-Revocation-Round": str(revocation_list.round or 0),
+        "X-Revocation-Count": str(len(revocation_list.revoked))
+    }
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    content = await run_in_threadpool(revocation_list.snapshot)
+    return Response(content=content, media_type="application/octet-stream", headers=headers)
+
+@router.get("/revocations/{cert_id}")
+async def get_revocation_status(cert_id: str):
+    """
+    Revocation status of a certificate, answered from memory
+    """
+    await require_revocations()
+    return {
+        "cert_id": cert_id,
+        "revoked": revocation_list.is_revoked(cert_id),
+        "round": revocation_list.round,
+        "version": revocation_list.version
+    }
+
+@router.get("/indexer/status")
+async def get_indexer_status():
+    """
+    Checkpoint round, follower tip and row counts of the local chain index
+    """
+    status = await run_in_threadpool(chain_indexer.status)
+    status["revocation_list"] = revocation_list.metrics()
+    return status
+
+@router.get("/algod/metrics")
+async def get_algod_metrics():
+    """
+    Per-node latency, error and circuit-breaker state of the algod pool,
+    plus account cache hit rates
+    """
+    metrics = algod_pool.metrics()
+    metrics["account_cache"] = account_cache.metrics()
+    return metrics
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import sys
 import os
 
@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from services.certificate_minting_service import minting_service
+from services.merkle import proof_store
 
 router = APIRouter()
 
@@ -31,6 +32,71 @@ class MintCertificateResponse(BaseModel):
     message: str
 
 
+class CohortCertificate(BaseModel):
+    """One certificate in a cohort"""
+    cert_id: str
+    recipient_address: str
+    certificate_metadata: Dict
+    ipfs_hash: str
+
+
+class MintCohortRequest(BaseModel):
+    """Request model for minting a cohort from one issuer"""
+    issuer_private_key: str
+    certificates: List[CohortCertificate]
+
+
+class MintCohortResponse(BaseModel):
+    """Response model for cohort minting"""
+    total: int
+    succeeded: int
+    results: List[MintCertificateResponse]
+
+
+class AnchoredCertificateResponse(BaseModel):
+    """Per-certificate result of Merkle batch anchoring"""
+    success: bool
+    cert_id: str
+    verification_layers: Dict
+    merkle_root: Optional[str]
+    leaf_index: Optional[int]
+    proof: Optional[str]
+    transaction_id: Optional[str]
+    message: str
+
+
+class AnchorCohortResponse(BaseModel):
+    """Response model for Merkle batch anchoring"""
+    total: int
+    anchored: int
+    merkle_root: Optional[str]
+    transaction_id: Optional[str]
+    results: List[AnchoredCertificateResponse]
+
+
+class VerifyProofRequest(BaseModel):
+    """
+    Request model for Merkle inclusion checks
+    
+    recipient_address, ipfs_hash and certificate_metadata recompute the
+    leaf preimage from the certificate's content (otherwise the stored
+    one is used); merkle_root and proof (hex) override the stored proof.
+    """
+    cert_id: str
+    recipient_address: Optional[str] = None
+    ipfs_hash: Optional[str] = None
+    certificate_metadata: Optional[Dict] = None
+    merkle_root: Optional[str] = None
+    proof: Optional[str] = None
+    on_chain: bool = False
+
+
+class RevokeBatchRequest(BaseModel):
+    """Request model for deactivating an anchored batch"""
+    issuer_private_key: str
+    merkle_root: str
+
+
 @router.post("/certificate", response_model=MintCertificateResponse)
 async def mint_certificate(request: MintCertificateRequest):
     """
@@ -66,6 +132,131 @@ async def mint_certificate(request: MintCertificateRequest):
         )
 
 
+@router.post("/cohort", response_model=MintCohortResponse)
+async def mint_cohort(request: MintCohortRequest):
+    """
+    Mint NFT certificates for a whole cohort
+    
+    The issuer is verified once and all certificates go through AI
+    verification in batch calls; each certificate is then IPFS-checked,
+    minted and recorded on its own. Results are in request order.
+    """
+    
+    try:
+        results = await minting_service.issue_cohort_full_flow(
+            issuer_private_key=request.issuer_private_key,
+            certificates=[cert.dict() for cert in request.certificates]
+        )
+        
+        return MintCohortResponse(
+            total=len(results),
+            succeeded=sum(1 for r in results if r["success"]),
+            results=[MintCertificateResponse(**r) for r in results]
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Cohort minting error: {str(e)}"
+        )
+
+
+@router.post("/cohort/anchor", response_model=AnchorCohortResponse)
+async def anchor_cohort(request: MintCohortRequest):
+    """
+    Issue a cohort by anchoring one Merkle root on chain
+    
+    Certificates go through the same 3-layer verification as /cohort but
+    are not minted individually: the ones that pass are hashed into a
+    Merkle tree and only its root is recorded, with one app call for the
+    whole cohort. Each result carries the certificate's inclusion proof.
+    """
+    
+    try:
+        batch = await minting_service.issue_cohort_anchored(
+            issuer_private_key=request.issuer_private_key,
+            certificates=[cert.dict() for cert in request.certificates]
+        )
+        results = batch["results"]
+        
+        return AnchorCohortResponse(
+            total=len(results),
+            anchored=sum(1 for r in results if r["success"]),
+            merkle_root=batch["merkle_root"],
+            transaction_id=batch["transaction_id"],
+            results=[AnchoredCertificateResponse(**r) for r in results]
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Cohort anchoring error: {str(e)}"
+        )
+
+
+@router.post("/cohort/revoke")
+async def revoke_anchored_cohort(request: RevokeBatchRequest):
+    """
+    Deactivate an anchored batch
+    
+    Only the issuer that anchored it (or the contract admin) can. Every
+    certificate in the batch then fails /proof/verify, off-chain and
+    on-chain.
+    """
+    try:
+        merkle_root = bytes.fromhex(request.merkle_root)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="merkle_root must be hex")
+    if len(merkle_root) != 32:
+        raise HTTPException(status_code=400, detail="merkle_root must be 32 bytes")
+    
+    success, message = await minting_service.revoke_batch_on_chain(
+        request.issuer_private_key,
+        merkle_root
+    )
+    if not success:
+        raise HTTPException(status_code=500, detail=message)
+    return {"success": True, "merkle_root": request.merkle_root.lower(), "transaction_id": message}
+
+
+@router.get("/proof/{cert_id}")
+async def get_certificate_proof(cert_id: str):
+    """Stored Merkle inclusion proof of an anchored certificate"""
+    entry = proof_store.get(cert_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No proof stored for this certificate")
+    return entry
+
+
+@router.post("/proof/verify")
+async def verify_certificate_proof(request: VerifyProofRequest):
+    """
+    Verify an anchored certificate's membership in its batch
+    
+    The proof is checked off-chain and the root is confirmed anchored and
+    active on chain; on_chain=true also runs the contract's proof check
+    through algod simulate, passing the leaf preimage so the contract
+    applies the leaf prefix itself.
+    """
+    
+    try:
+        return await minting_service.verify_anchored_certificate(
+            cert_id=request.cert_id,
+            recipient_address=request.recipient_address,
+            ipfs_hash=request.ipfs_hash,
+            certificate_metadata=request.certificate_metadata,
+            merkle_root=request.merkle_root,
+            proof=request.proof,
+            on_chain=request.on_chain
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Proof verification error: {str(e)}"
+        )
+
+
 @router.get("/status/{cert_id}")
 async def get_certificate_status(cert_id: str):
     """
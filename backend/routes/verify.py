@@ -1,22 +1,19 @@
 from fastapi import APIRouter, HTTPException
-import requests
 
-router = APIRouter()
+from services.pinata import fetch_from_ipfs
 
-PINATA_GATEWAY = "https://gateway.pinata.cloud/ipfs"
+router = APIRouter()
 
 
 @router.get("/certificate/{ipfs_hash}")
 def verify_certificate(ipfs_hash: str):
     try:
         # Fetch JSON from IPFS
-        url = f"{PINATA_GATEWAY}/{ipfs_hash}"
-        res = requests.get(url)
+        data = fetch_from_ipfs(ipfs_hash)
 
-        if res.status_code != 200:
+        if data is None:
             raise HTTPException(status_code=404, detail="Certificate not found")
 
-        data = res.json()
         return {"status": "success", "data": data}
 
     except Exception as e:
@@ -3,21 +3,18 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import json
 import os
-from algosdk.v2client import algod
-from algosdk import encoding, mnemonic
+from algosdk import mnemonic
 import logging
 
+from services.algorand_address import is_valid_address
+from services.chain_reads import read_balance
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/wallet", tags=["wallet"])
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
-
 # Load deployed contract info if available
 CONTRACTS_FILE = "../contracts/deployed_contracts.json"
 deployed_contracts = {}
@@ -62,12 +59,12 @@ async def connect_wallet(request: WalletConnectionRequest):
     """
     try:
         # Validate Algorand address format
-        if not encoding.is_valid_address(request.address):
+        if not is_valid_address(request.address):
             raise HTTPException(status_code=400, detail="Invalid Algorand address format")
         
         # Get account information from Algorand
         try:
-            account_info = algod_client.account_info(request.address)
+            account_info = await read_balance(request.address)
             balance = account_info['amount'] / 1e6  # Convert microAlgos to Algos
             
             logger.info(f"Wallet connected: {request.address} with balance: {balance} ALGO")
@@ -125,7 +122,7 @@ async def get_wallet_status(address: str):
     Check if a wallet is connected and get its status
     """
     try:
-        if not encoding.is_valid_address(address):
+        if not is_valid_address(address):
             raise HTTPException(status_code=400, detail="Invalid Algorand address format")
         
         is_connected = address in connected_wallets
@@ -133,7 +130,7 @@ async def get_wallet_status(address: str):
         if is_connected:
             # Refresh balance
             try:
-                account_info = algod_client.account_info(address)
+                account_info = await read_balance(address)
                 balance = account_info['amount'] / 1e6
                 
                 # Update stored info
@@ -0,0 +1,151 @@
+"""
+Account State Cache
+
+Round-aware cache in front of algod's account endpoints:
+1. Entries are keyed by address (plus request variant) and remember the
+   round the state was read at
+2. An entry is dropped as soon as the block follower reports a block
+   touching the address, and expires after max_age_rounds regardless
+3. Concurrent lookups for the same key share one in-flight algod call
+
+Without a running follower, age is estimated from wall-clock time at
+ROUND_SECONDS per round and touched-address invalidation is not
+available, so entries simply expire.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from services.algod_pool import AlgodPool, algod_pool
+from services.block_follower import BlockFollower, block_follower
+
+# Average Algorand block time, used when no follower round is available
+ROUND_SECONDS = 2.8
+
+
+class AccountCache:
+    """Coalescing (address, round) cache of account_info responses"""
+
+    def __init__(
+        self,
+        pool: Optional[AlgodPool] = None,
+        follower: Optional[BlockFollower] = None,
+        max_age_rounds: Optional[int] = None,
+        max_entries: int = 10000
+    ):
+        self.pool = pool or algod_pool
+        self.follower = follower or block_follower
+        self.max_age_rounds = (
+            max_age_rounds if max_age_rounds is not None
+            else int(os.getenv("ACCOUNT_CACHE_MAX_ROUNDS", "10"))
+        )
+        self.max_entries = max_entries
+        # key -> (round read at, monotonic time fetched, response)
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, Dict]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        # In-flight keys whose address changed while the call was running
+        self._stale_inflight = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.follower.subscribe(self._on_block)
+
+    def _age_rounds(self, read_round: int, fetched_at: float) -> float:
+        if self.follower.running and self.follower.last_round is not None:
+            return self.follower.last_round - read_round
+        return (time.monotonic() - fetched_at) / ROUND_SECONDS
+
+    def _lookup(self, key: Tuple) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        read_round, fetched_at, info = entry
+        if self._age_rounds(read_round, fetched_at) > self.max_age_rounds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return info
+
+    def _store(self, key: Tuple, info: Dict) -> None:
+        read_round = info.get("round") or self.follower.last_round or 0
+        self._entries[key] = (read_round, time.monotonic(), info)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def fetch(self, method: str, address: str, *args, **kwargs) -> Dict:
+        """Cached pool.call(method, address, *args, **kwargs) for account-scoped reads"""
+        key = (address, method, args, tuple(sorted(kwargs.items())))
+
+        info = self._lookup(key)
+        if info is not None:
+            self.hits += 1
+            return info
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            info = await self.pool.call(method, address, *args, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited failure does not log a warning
+            future.exception()
+            raise
+        else:
+            if key not in self._stale_inflight:
+                self._store(key, info)
+            future.set_result(info)
+            return info
+        finally:
+            del self._inflight[key]
+            self._stale_inflight.discard(key)
+
+    async def account_info(self, address: str, **kwargs) -> Dict:
+        return await self.fetch("account_info", address, **kwargs)
+
+    def invalidate(self, addresses: Iterable[str]) -> None:
+        """Drop every cached variant for these addresses"""
+        addresses = set(addresses)
+        for key in [k for k in self._entries if k[0] in addresses]:
+            del self._entries[key]
+            self.invalidations += 1
+        for key in self._inflight:
+            if key[0] in addresses:
+                self._stale_inflight.add(key)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._stale_inflight.update(self._inflight)
+
+    def _on_block(self, round_number: int, block: Any, touched: Optional[set]) -> None:
+        if touched is None:
+            self.clear()
+        elif touched:
+            self.invalidate(touched)
+
+    def metrics(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "max_age_rounds": self.max_age_rounds,
+            "follower_round": self.follower.last_round,
+        }
+
+
+# Shared cache for wallet and contract routes
+account_cache = AccountCache()
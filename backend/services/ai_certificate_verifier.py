@@ -10,9 +10,9 @@ Uses OCR + LLM to extract and validate certificate information:
 
 import os
 import json
-from typing import Dict, Optional, Tuple
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import base64
-import re
 
 try:
     import pytesseract
@@ -23,23 +23,79 @@ except ImportError:
     OCR_AVAILABLE = False
     print("Warning: OCR dependencies not installed. Install with: pip install pytesseract pillow pdf2image")
 
+from services.ocr_engine import ocr_engine
+from services.verification_cache import VerificationCache, file_sha256
+from services.certificate_fields import FieldExtractor, default_field_extractor
+from services.similarity import is_similar
+from services.rule_engine import Rule, RuleSet, custom, has_keys, min_length, non_empty, present
+
+# Bump whenever OCR, parsing or preprocessing code changes what gets
+# extracted; cached results from other versions are then ignored.
+VERIFIER_VERSION = "2.3.0"
+
+
+def cache_namespace(engine) -> str:
+    """Verifier version plus the OCR engine's settings (OCR_PREPROCESS, OCR_GRAYSCALE, ...)"""
+    return f"{VERIFIER_VERSION}-{engine.fingerprint()}"
+
+
+# Shared so every verifier instance benefits from the memory tier
+verification_cache = VerificationCache(cache_namespace(ocr_engine))
+
+REQUIRED_FIELDS = ['student_name', 'course_name', 'issuer_name', 'issue_date']
+
+# Heuristic authenticity checks on parsed fields; authentic at 0.7
+AUTHENTICITY_RULES = RuleSet(
+    [
+        Rule("required_fields", None, has_keys(*REQUIRED_FIELDS), 0.3,
+             pass_reason="All required fields present"),
+        Rule("name_format", "student_name",
+             custom(lambda name: len(name.split()) >= 2 and name[0].isupper(), "name_format"), 0.2,
+             pass_reason="Valid name format"),
+        Rule("course_name", "course_name", min_length(5), 0.2,
+             pass_reason="Valid course name"),
+        Rule("issuer", "issuer_name", non_empty(), 0.15,
+             pass_reason="Issuer identified"),
+        Rule("issue_date", "issue_date", present(), 0.15,
+             pass_reason="Issue date present"),
+    ],
+    threshold=0.7
+)
+
 
 class AICertificateVerifier:
     """AI-powered certificate verification"""
     
-    def __init__(self):
-        self.required_fields = [
-            'student_name',
-            'course_name',
-            'issuer_name',
-            'issue_date'
-        ]
+    def __init__(
+        self,
+        engine=None,
+        streaming: bool = True,
+        cache: Optional[VerificationCache] = None,
+        field_extractor: Optional[FieldExtractor] = None,
+        authenticity_rules: Optional[RuleSet] = None
+    ):
+        # Shared process-pool OCR engine unless a dedicated one is given
+        self.ocr_engine = engine or ocr_engine
+        # Process PDFs page by page and stop once all required fields are found
+        self.streaming = streaming
+        # Content-hash cache of extracted text and parsed fields, kept
+        # apart for engines with other OCR settings
+        if cache is None:
+            cache = verification_cache if self.ocr_engine is ocr_engine else VerificationCache(
+                cache_namespace(self.ocr_engine)
+            )
+        self.cache = cache
+        # Register extra certificate templates on this to support new formats
+        self.field_extractor = field_extractor or default_field_extractor
+        self.required_fields = list(REQUIRED_FIELDS)
+        self.authenticity_rules = authenticity_rules or AUTHENTICITY_RULES
     
     async def verify_certificate(
         self, 
         file_path: str, 
         file_type: str,
-        provided_data: Optional[Dict] = None
+        provided_data: Optional[Dict] = None,
+        digest: Optional[str] = None
     ) -> Tuple[bool, Dict, str]:
         """
         Verify certificate authenticity
@@ -48,20 +104,18 @@ class AICertificateVerifier:
             file_path: Path to certificate file
             file_type: 'pdf' or 'image'
             provided_data: Optional manually provided data
+            digest: Optional precomputed SHA-256 of the file
         
         Returns:
             (is_valid, extracted_data, error_message)
         """
         
-        # Step 1: Extract text from certificate
-        extracted_text = await self._extract_text(file_path, file_type)
+        # Step 1 + 2: Extract text and parse certificate data
+        extracted_text, extracted_data = await self._extract_and_parse(file_path, file_type, digest)
         
         if not extracted_text:
             return False, {}, "Failed to extract text from certificate"
         
-        # Step 2: Parse certificate data
-        extracted_data = await self._parse_certificate_data(extracted_text)
-        
         # Step 3: Validate against provided data if available
         if provided_data:
             is_consistent, error = self._validate_consistency(
@@ -103,20 +157,74 @@ class AICertificateVerifier:
         
         try:
             if file_type == 'pdf':
-                # Convert PDF to images
-                images = pdf2image.convert_from_path(file_path)
-                text = ""
-                for image in images:
-                    text += pytesseract.image_to_string(image)
-                return text
+                # Pages are rendered and OCR'd in parallel, in page order
+                return await self.ocr_engine.extract_pdf(file_path)
             else:
                 # Direct image OCR
-                image = Image.open(file_path)
-                return pytesseract.image_to_string(image)
+                return await self.ocr_engine.extract_image(file_path)
         except Exception as e:
             print(f"OCR extraction error: {e}")
             return self._placeholder_extraction(file_path)
     
+    async def _extract_and_parse(
+        self,
+        file_path: str,
+        file_type: str,
+        digest: Optional[str] = None
+    ) -> Tuple[str, Dict]:
+        """Extract and parse a file, served from the content-hash cache when possible"""
+        
+        loop = asyncio.get_running_loop()
+        digest, cached = await loop.run_in_executor(None, self.cache.lookup, file_path, digest)
+        if cached is not None:
+            # Copy so callers can annotate the result without touching the cache
+            return cached["text"], dict(cached["fields"])
+        
+        if file_type == 'pdf' and self.streaming and OCR_AVAILABLE:
+            extracted_text, extracted_data = await self._extract_and_parse_streaming(file_path)
+        else:
+            extracted_text = await self._extract_text(file_path, file_type)
+            extracted_data = await self._parse_certificate_data(extracted_text) if extracted_text else {}
+        
+        # Only cache real extractions, never placeholder/empty results
+        if digest and extracted_text:
+            await loop.run_in_executor(
+                None, self.cache.put, digest, extracted_text, dict(extracted_data)
+            )
+        
+        return extracted_text, extracted_data
+    
+    async def _extract_and_parse_streaming(self, file_path: str) -> Tuple[str, Dict]:
+        """
+        OCR a PDF one page at a time, parsing as pages arrive
+        
+        Fields keep the value from the first page they appear on. Stops
+        rendering as soon as every required field has been found, so a
+        one-page certificate never pays for the rest of a long transcript.
+        """
+        
+        texts = []
+        data = {}
+        pages = self.ocr_engine.iter_pdf_pages(file_path)
+        
+        try:
+            async for page_text in pages:
+                texts.append(page_text)
+                
+                page_data = await self._parse_certificate_data(page_text)
+                for field, value in page_data.items():
+                    data.setdefault(field, value)
+                
+                if all(data.get(field) for field in self.required_fields):
+                    break
+        except Exception as e:
+            print(f"OCR extraction error: {e}")
+            return self._placeholder_extraction(file_path), {}
+        finally:
+            await pages.aclose()
+        
+        return "".join(texts), data
+    
     def _placeholder_extraction(self, file_path: str) -> str:
         """Placeholder for when OCR is not available"""
         # In production, this would use actual OCR
@@ -126,37 +234,8 @@ class AICertificateVerifier:
     async def _parse_certificate_data(self, text: str) -> Dict:
         """Parse certificate data from extracted text using patterns"""
         
-        data = {}
-        
-        # Common certificate patterns
-        patterns = {
-            'student_name': [
-                r'(?:awarded to|presented to|this certifies that)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
-                r'(?:name|student):\s*([A-Za-z\s]+)',
-            ],
-            'course_name': [
-                r'(?:course|program|training):\s*([A-Za-z\s]+)',
-                r'(?:completed|finished|passed)\s+([A-Za-z\s]+(?:course|program))',
-            ],
-            'issuer_name': [
-                r'(?:issued by|from|by)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-                r'(?:university|institute|academy|school):\s*([A-Za-z\s]+)',
-            ],
-            'issue_date': [
-                r'(?:date|issued on|dated):\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})',
-            ]
-        }
-        
-        # Try to extract each field
-        for field, field_patterns in patterns.items():
-            for pattern in field_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    data[field] = match.group(1).strip()
-                    break
-        
-        return data
+        # Precompiled, single-pass extraction over all registered templates
+        return self.field_extractor.extract(text)
     
     def _validate_consistency(
         self, 
@@ -179,24 +258,8 @@ class AICertificateVerifier:
     def _is_similar(self, str1: str, str2: str, threshold: float = 0.8) -> bool:
         """Check if two strings are similar (fuzzy matching)"""
         
-        # Simple similarity check (can be enhanced with libraries like fuzzywuzzy)
-        if str1 == str2:
-            return True
-        
-        # Check if one is contained in the other
-        if str1 in str2 or str2 in str1:
-            return True
-        
-        # Check Levenshtein distance (simple implementation)
-        max_len = max(len(str1), len(str2))
-        if max_len == 0:
-            return True
-        
-        # Count matching characters
-        matches = sum(c1 == c2 for c1, c2 in zip(str1, str2))
-        similarity = matches / max_len
-        
-        return similarity >= threshold
+        # Bounded edit distance plus token-set normalization for names
+        return is_similar(str1, str2, threshold)
     
     async def _ai_authenticity_check(
         self, 
@@ -215,50 +278,41 @@ class AICertificateVerifier:
         # Placeholder validation logic
         # TODO: Integrate with actual AI service
         
-        confidence = 0.0
-        reasons = []
-        
-        # Check 1: Required fields present
-        if all(field in data for field in self.required_fields):
-            confidence += 0.3
-            reasons.append("All required fields present")
-        
-        # Check 2: Reasonable name format
-        if 'student_name' in data:
-            name = data['student_name']
-            if len(name.split()) >= 2 and name[0].isupper():
-                confidence += 0.2
-                reasons.append("Valid name format")
-        
-        # Check 3: Reasonable course name
-        if 'course_name' in data:
-            course = data['course_name']
-            if len(course) >= 5:
-                confidence += 0.2
-                reasons.append("Valid course name")
-        
-        # Check 4: Has issuer
-        if 'issuer_name' in data and len(data['issuer_name']) > 0:
-            confidence += 0.15
-            reasons.append("Issuer identified")
-        
-        # Check 5: Has date
-        if 'issue_date' in data:
-            confidence += 0.15
-            reasons.append("Issue date present")
-        
-        # Determine if authentic based on confidence
-        is_authentic = confidence >= 0.7
+        result = self.authenticity_rules.score(data)
+        is_authentic = result.passed
+        confidence = result.score
+        reasons = result.passed_reasons
         reason = " | ".join(reasons) if reasons else "Insufficient data for validation"
         
         return is_authentic, confidence, reason
 
 
+# Shared verifier so OCR pool and caches are reused across calls
+default_verifier = AICertificateVerifier()
+
+# Extensions accepted by batch verification
+SUPPORTED_FILE_TYPES = {
+    '.pdf': 'pdf',
+    '.png': 'image',
+    '.jpg': 'image',
+    '.jpeg': 'image',
+    '.tif': 'image',
+    '.tiff': 'image',
+}
+
+
+def detect_file_type(file_path: str) -> Optional[str]:
+    """Map a file name to 'pdf' / 'image', or None if unsupported"""
+    return SUPPORTED_FILE_TYPES.get(os.path.splitext(file_path)[1].lower())
+
+
 # Example usage
 async def verify_certificate_file(
     file_path: str,
     file_type: str,
-    provided_data: Optional[Dict] = None
+    provided_data: Optional[Dict] = None,
+    verifier: Optional[AICertificateVerifier] = None,
+    digest: Optional[str] = None
 ) -> Dict:
     """
     Convenient wrapper for certificate verification
@@ -272,11 +326,12 @@ async def verify_certificate_file(
         }
     """
     
-    verifier = AICertificateVerifier()
+    verifier = verifier or default_verifier
     is_valid, extracted_data, message = await verifier.verify_certificate(
         file_path,
         file_type,
-        provided_data
+        provided_data,
+        digest
     )
     
     return {
@@ -287,6 +342,104 @@ async def verify_certificate_file(
     }
 
 
+async def verify_certificate_files(
+    file_paths: List[str],
+    concurrency: Optional[int] = None,
+    verifier: Optional[AICertificateVerifier] = None
+) -> AsyncIterator[Dict]:
+    """
+    Verify many certificate files, yielding each result as it finishes
+    
+    - Files with identical content are verified once; later copies are
+      reported with 'duplicate_of' pointing at the first one
+    - At most `concurrency` files are in flight (capped at twice the OCR
+      workers, whatever the caller asks for), and both the work queue
+      and the result queue are bounded, so a slow consumer slows the
+      workers down instead of buffering results
+    - Every result carries a progress counter
+    
+    Yields:
+        {
+            'index': int,
+            'file': str,
+            'sha256': str,
+            'verified': bool,
+            ...,
+            'progress': {'completed': int, 'total': int}
+        }
+    """
+    
+    verifier = verifier or default_verifier
+    # More files in flight than the OCR pool can take only queues decoded images
+    max_concurrency = verifier.ocr_engine.max_workers * 2
+    concurrency = max(1, min(concurrency or max_concurrency, max_concurrency))
+    total = len(file_paths)
+    loop = asyncio.get_running_loop()
+    
+    pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    # sha256 -> future resolved with (first path, result)
+    by_digest: Dict[str, asyncio.Future] = {}
+    
+    async def feed():
+        for index, path in enumerate(file_paths):
+            await pending.put((index, path))
+        for _ in range(concurrency):
+            await pending.put(None)
+    
+    async def work():
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            
+            index, path = item
+            record = {'index': index, 'file': path}
+            try:
+                file_type = detect_file_type(path)
+                if file_type is None:
+                    record.update(verified=False, message="Unsupported file type")
+                else:
+                    digest = await loop.run_in_executor(None, file_sha256, path)
+                    record['sha256'] = digest
+                    
+                    first = by_digest.get(digest)
+                    if first is None:
+                        first = by_digest[digest] = loop.create_future()
+                        try:
+                            result = await verify_certificate_file(
+                                path, file_type, verifier=verifier, digest=digest
+                            )
+                        except Exception as e:
+                            result = {
+                                'verified': False,
+                                'extracted_data': {},
+                                'confidence': 0.0,
+                                'message': f"Verification error: {str(e)}"
+                            }
+                        first.set_result((path, result))
+                        record.update(result)
+                    else:
+                        original, result = await asyncio.shield(first)
+                        record.update(result, duplicate_of=original)
+            except Exception as e:
+                record.update(verified=False, message=f"Verification error: {str(e)}")
+            
+            await results.put(record)
+    
+    tasks = [asyncio.create_task(feed())]
+    tasks += [asyncio.create_task(work()) for _ in range(concurrency)]
+    
+    try:
+        for completed in range(1, total + 1):
+            record = await results.get()
+            record['progress'] = {'completed': completed, 'total': total}
+            yield record
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 if __name__ == "__main__":
     # Test the verifier
     import asyncio
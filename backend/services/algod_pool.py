@@ -0,0 +1,450 @@
+"""
+Algod Client Pool
+
+One algod access layer for the whole backend:
+1. Keep-alive HTTP connections (a requests.Session per node)
+2. Several node endpoints (ALGOD_NODES), picked by lowest EWMA latency
+3. Retries with exponential backoff + jitter on transient errors
+   (connection failures, timeouts, HTTP 429/5xx), moving to another node
+4. A circuit breaker per node: after repeated failures the node is
+   skipped until a cool-down passes, then probed with one request
+5. Per-node latency and error metrics, and response sizes per
+   algod route so heavy reads (full account dumps) stand out
+
+Blocking SDK calls run on a dedicated thread pool, so async handlers
+await them instead of stalling the event loop:
+
+    info = await algod_pool.call("account_info", address)
+    txn = await algod_pool.run(transaction.wait_for_confirmation, tx_id, 4)
+
+Submissions are never retried blindly: a transient error does not say
+whether the node took the transaction, so submit()/execute() look the
+txid up first and only resend when no node knows it:
+
+    tx_ids = await algod_pool.submit(signed_txn)
+    response = await algod_pool.execute(atc, 4)
+"""
+
+import asyncio
+import functools
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from algosdk import constants, error, transaction
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    AtomicTransactionComposerStatus,
+    AtomicTransactionResponse,
+)
+from algosdk.v2client import algod
+
+DEFAULT_ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
+
+# HTTP statuses worth retrying on another node
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# Client methods that submit; run through submit() so they are not resent blindly
+SUBMIT_METHODS = frozenset({"send_transaction", "send_transactions", "send_raw_transaction"})
+
+# Collapse addresses and numeric ids so metrics group by endpoint shape
+_ADDRESS_SEGMENT = re.compile(r"/[A-Z2-7]{58}(?=/|$)")
+_NUMBER_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class TransientAlgodError(Exception):
+    """A node failed in a way another attempt may not (network, 429, 5xx)"""
+
+
+class SessionAlgodClient(algod.AlgodClient):
+    """AlgodClient that reuses pooled keep-alive connections"""
+
+    def __init__(self, algod_token: str, algod_address: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(algod_token, algod_address, headers)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # route -> [responses, bytes]
+        self.response_sizes: Dict[str, List[int]] = {}
+        self._sizes_lock = threading.Lock()
+
+    def _record_size(self, requrl: str, params: Optional[Dict], size: int) -> None:
+        route = _NUMBER_SEGMENT.sub("/{id}", _ADDRESS_SEGMENT.sub("/{address}", requrl))
+        if params and params.get("exclude"):
+            # Full vs trimmed account reads are the sizes worth comparing
+            route += f"?exclude={params['exclude']}"
+        with self._sizes_lock:
+            counts = self.response_sizes.setdefault(route, [0, 0])
+            counts[0] += 1
+            counts[1] += size
+
+    def algod_request(
+        self,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+        timeout=30,
+    ):
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.headers:
+            header.update(self.headers)
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header.update({constants.algod_auth_header: self.algod_token})
+        if requrl not in constants.unversioned_paths:
+            requrl = algod.api_version_path_prefix + requrl
+
+        try:
+            resp = self.session.request(
+                method,
+                self.algod_address + requrl,
+                params=params,
+                data=data,
+                headers=header,
+                timeout=timeout,
+            )
+        except requests.RequestException as e:
+            raise TransientAlgodError(str(e)) from e
+
+        self._record_size(requrl, params, len(resp.content))
+
+        if resp.status_code >= 400:
+            message, data = resp.text, None
+            try:
+                body = resp.json()
+                message, data = body.get("message", message), body.get("data")
+            except ValueError:
+                pass
+            if resp.status_code in RETRYABLE_STATUS:
+                raise TransientAlgodError(f"{resp.status_code}: {message}")
+            raise error.AlgodHTTPError(message, resp.status_code, data)
+
+        if response_format == "json":
+            if not resp.content:
+                return {}
+            try:
+                return resp.json()
+            except ValueError as e:
+                raise error.AlgodResponseError("Failed to parse JSON response from algod") from e
+        return resp.content
+
+
+class AlgodEndpoint:
+    """One algod node plus its health and latency bookkeeping"""
+
+    def __init__(self, address: str, token: str = "", headers: Optional[Dict[str, str]] = None):
+        self.address = address.rstrip("/")
+        self.client = SessionAlgodClient(token, self.address, headers)
+        # None until the first successful call, so new nodes get probed early
+        self.ewma_ms: Optional[float] = None
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def metrics(self) -> Dict:
+        return {
+            "address": self.address,
+            "state": self.state,
+            "ewma_ms": round(self.ewma_ms, 2) if self.ewma_ms is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+
+def _parse_nodes(spec: str) -> List[Tuple[str, str]]:
+    """'url[|token],url2[|token2]' -> [(url, token), ...]"""
+    nodes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        address, _, token = item.partition("|")
+        nodes.append((address.strip(), token.strip()))
+    return nodes
+
+
+class AlgodPool:
+    """Latency-aware, retrying, circuit-breaking access to one or more algod nodes"""
+
+    def __init__(
+        self,
+        nodes: List[Tuple[str, str]],
+        max_attempts: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        ewma_alpha: float = 0.3,
+        max_workers: int = 16
+    ):
+        if not nodes:
+            raise ValueError("AlgodPool needs at least one node")
+        self.endpoints = [AlgodEndpoint(address, token) for address, token in nodes]
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Consecutive transient failures that open a node's circuit
+        self.failure_threshold = failure_threshold
+        # Seconds an open circuit waits before letting one probe through
+        self.reset_timeout = reset_timeout
+        self.ewma_alpha = ewma_alpha
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="algod")
+
+    @classmethod
+    def from_env(cls) -> "AlgodPool":
+        spec = os.getenv("ALGOD_NODES")
+        if spec:
+            nodes = _parse_nodes(spec)
+        else:
+            address = os.getenv("ALGOD_ADDRESS") or os.getenv("ALGOD_SERVER") or DEFAULT_ALGOD_ADDRESS
+            nodes = [(address, os.getenv("ALGOD_TOKEN", ""))]
+        return cls(
+            nodes,
+            max_attempts=int(os.getenv("ALGOD_MAX_ATTEMPTS", "3")),
+            failure_threshold=int(os.getenv("ALGOD_FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("ALGOD_RESET_TIMEOUT", "30")),
+        )
+
+    @property
+    def client(self) -> algod.AlgodClient:
+        """Client of the fastest healthy node (for code that needs a raw client)"""
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.state == CLOSED] or self.endpoints
+            return min(healthy, key=self._latency_key).client
+
+    @staticmethod
+    def _latency_key(endpoint: AlgodEndpoint) -> float:
+        return -1.0 if endpoint.ewma_ms is None else endpoint.ewma_ms
+
+    def _select(self, exclude) -> AlgodEndpoint:
+        now = time.monotonic()
+        with self._lock:
+            candidates = []
+            for endpoint in self.endpoints:
+                if endpoint in exclude or endpoint.state == HALF_OPEN:
+                    # A half-open node already has its probe in flight
+                    continue
+                if endpoint.state == OPEN:
+                    if now - endpoint.opened_at < self.reset_timeout:
+                        continue
+                    # Cool-down over: this request is the probe
+                    endpoint.state = HALF_OPEN
+                    endpoint.opened_at = now
+                    return endpoint
+                candidates.append(endpoint)
+
+            if not candidates:
+                # Everything is open or already tried: use the node that opened longest ago
+                remaining = [e for e in self.endpoints if e not in exclude] or self.endpoints
+                return min(remaining, key=lambda e: e.opened_at)
+
+            return min(candidates, key=self._latency_key)
+
+    def _record_success(self, endpoint: AlgodEndpoint, elapsed_ms: float) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.consecutive_failures = 0
+            endpoint.state = CLOSED
+            if endpoint.ewma_ms is None:
+                endpoint.ewma_ms = elapsed_ms
+            else:
+                endpoint.ewma_ms += self.ewma_alpha * (elapsed_ms - endpoint.ewma_ms)
+
+    def _record_failure(self, endpoint: AlgodEndpoint, exc: Exception) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.errors += 1
+            endpoint.consecutive_failures += 1
+            endpoint.last_error = str(exc)[:200]
+            if endpoint.state == HALF_OPEN or endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.state = OPEN
+                endpoint.opened_at = time.monotonic()
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay)
+
+    def run_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call fn(client, *args, **kwargs) against the best node, retrying transient failures
+
+        fn runs again after a transient error, so it must be safe to repeat
+        (reads, simulate); submissions go through submit_sync.
+        """
+        tried: List[AlgodEndpoint] = []
+        last_exc: Optional[Exception] = None
+
+        for attempt in range(self.max_attempts):
+            endpoint = self._select(tried)
+            start = time.perf_counter()
+            try:
+                result = fn(endpoint.client, *args, **kwargs)
+            except TransientAlgodError as e:
+                self._record_failure(endpoint, e)
+                last_exc = e
+                if endpoint not in tried:
+                    tried.append(endpoint)
+                if len(tried) >= len(self.endpoints):
+                    tried = []
+                if attempt + 1 < self.max_attempts:
+                    time.sleep(self._backoff(attempt))
+                continue
+            except Exception:
+                # Application errors (4xx, bad params) say nothing about node health
+                self._record_success(endpoint, (time.perf_counter() - start) * 1000)
+                raise
+
+            self._record_success(endpoint, (time.perf_counter() - start) * 1000)
+            return result
+
+        raise last_exc
+
+    def _known_transaction(self, tx_id: str) -> bool:
+        """True if a node has the transaction pending or confirmed"""
+        try:
+            info = self.call_sync("pending_transaction_info", tx_id)
+        except error.AlgodHTTPError:
+            # 404: no node has seen it, so sending again cannot duplicate it
+            return False
+        return not info.get("pool-error")
+
+    def submit_sync(self, signed_txns) -> List[str]:
+        """
+        Send a signed transaction or group, retrying by txid
+
+        The txids are known before sending. After a transient error the
+        first one is looked up, and the group is sent again only if no
+        node has it; a lookup that fails transiently raises instead.
+        """
+        if not isinstance(signed_txns, list):
+            signed_txns = [signed_txns]
+        tx_ids = [stxn.get_txid() for stxn in signed_txns]
+        tried: List[AlgodEndpoint] = []
+        last_exc: Optional[Exception] = None
+
+        for attempt in range(self.max_attempts):
+            if attempt and self._known_transaction(tx_ids[0]):
+                return tx_ids
+            endpoint = self._select(tried)
+            start = time.perf_counter()
+            try:
+                endpoint.client.send_transactions(signed_txns)
+            except TransientAlgodError as e:
+                self._record_failure(endpoint, e)
+                last_exc = e
+                if endpoint not in tried:
+                    tried.append(endpoint)
+                if len(tried) >= len(self.endpoints):
+                    tried = []
+                if attempt + 1 < self.max_attempts:
+                    time.sleep(self._backoff(attempt))
+                continue
+            except error.AlgodHTTPError as e:
+                self._record_success(endpoint, (time.perf_counter() - start) * 1000)
+                # A resend rejected because an earlier attempt already landed
+                if attempt and "already in ledger" in str(e):
+                    return tx_ids
+                raise
+
+            self._record_success(endpoint, (time.perf_counter() - start) * 1000)
+            return tx_ids
+
+        # The last attempt may still have reached its node
+        if self._known_transaction(tx_ids[0]):
+            return tx_ids
+        raise last_exc
+
+    def execute_sync(self, atc: AtomicTransactionComposer, wait_rounds: int) -> AtomicTransactionResponse:
+        """
+        atc.execute through the pool
+
+        The group is signed and sent once with submit_sync; waiting for
+        confirmation and reading the method results are retried reads.
+        """
+        tx_ids = self.submit_sync(atc.gather_signatures())
+        atc.status = AtomicTransactionComposerStatus.SUBMITTED
+        confirmed = self.run_sync(transaction.wait_for_confirmation, tx_ids[0], wait_rounds)
+        atc.status = AtomicTransactionComposerStatus.COMMITTED
+
+        results = [
+            atc.parse_result(method, tx_ids[index], self.call_sync("pending_transaction_info", tx_ids[index]))
+            for index, method in atc.method_dict.items()
+        ]
+        return AtomicTransactionResponse(confirmed["confirmed-round"], tx_ids, results)
+
+    def call_sync(self, method: str, *args, **kwargs) -> Any:
+        """Blocking client.<method>(*args, **kwargs) through the pool"""
+        if method in SUBMIT_METHODS:
+            raise ValueError(f"{method} is not safe to retry; use submit()")
+        return self.run_sync(lambda client, *a, **kw: getattr(client, method)(*a, **kw), *args, **kwargs)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Awaitable run_sync, executed on the pool's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.run_sync, fn, *args, **kwargs)
+        )
+
+    async def submit(self, signed_txns) -> List[str]:
+        """Awaitable submit_sync"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.submit_sync, signed_txns)
+        )
+
+    async def execute(self, atc: AtomicTransactionComposer, wait_rounds: int) -> AtomicTransactionResponse:
+        """Awaitable execute_sync"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.execute_sync, atc, wait_rounds)
+        )
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """Awaitable client.<method>(*args, **kwargs) through the pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.call_sync, method, *args, **kwargs)
+        )
+
+    def response_sizes(self) -> Dict[str, Dict]:
+        """Response count, total and mean bytes per algod route, across nodes"""
+        totals: Dict[str, List[int]] = {}
+        for endpoint in self.endpoints:
+            with endpoint.client._sizes_lock:
+                for route, (count, size) in endpoint.client.response_sizes.items():
+                    entry = totals.setdefault(route, [0, 0])
+                    entry[0] += count
+                    entry[1] += size
+        return {
+            route: {"responses": count, "bytes": size, "mean_bytes": round(size / count)}
+            for route, (count, size) in sorted(totals.items())
+        }
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            endpoints = [endpoint.metrics() for endpoint in self.endpoints]
+        return {"endpoints": endpoints, "response_sizes": self.response_sizes()}
+
+
+# Shared pool for the whole process
+algod_pool = AlgodPool.from_env()
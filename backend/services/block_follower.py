@@ -0,0 +1,137 @@
+"""
+Block Follower
+
+Tails the chain through the algod pool and tells subscribers what
+changed in each new block:
+1. Waits for the next round with status_after_block (a long poll)
+2. Fetches the block as msgpack and collects every address it touches
+   (senders, receivers, close-to targets, asset and app call accounts,
+   inner transactions included)
+3. Calls each subscriber with (round, block, touched_addresses)
+
+Subscribers can be plain functions or coroutines. When the follower falls
+too far behind it skips ahead to the tip and passes touched_addresses=None,
+meaning "anything may have changed".
+"""
+
+import asyncio
+import inspect
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import msgpack
+from algosdk import encoding
+
+from services.algod_pool import AlgodPool, algod_pool
+
+# Transaction fields that hold a single address
+ADDRESS_FIELDS = ("snd", "rcv", "close", "asnd", "arcv", "aclose", "fadd", "rekey")
+# Transaction fields that hold a list of addresses
+ADDRESS_LIST_FIELDS = ("apat",)
+
+
+def _address(value: Any) -> Optional[str]:
+    if isinstance(value, (bytes, bytearray)) and len(value) == 32:
+        return encoding.encode_address(bytes(value))
+    return None
+
+
+def _collect(signed_txns: Iterable[Dict], touched: Set[str]) -> None:
+    for stxn in signed_txns:
+        txn = stxn.get("txn", {})
+        for field in ADDRESS_FIELDS:
+            address = _address(txn.get(field))
+            if address:
+                touched.add(address)
+        for field in ADDRESS_LIST_FIELDS:
+            for value in txn.get(field) or ():
+                address = _address(value)
+                if address:
+                    touched.add(address)
+        # Inner transactions (app-initiated payments, asset transfers, ...)
+        inner = (stxn.get("dt") or {}).get("itx")
+        if inner:
+            _collect(inner, touched)
+
+
+def touched_addresses(block: Dict) -> Set[str]:
+    """Every account address whose state a decoded block may have changed"""
+    touched: Set[str] = set()
+    _collect(block.get("block", {}).get("txns") or (), touched)
+    return touched
+
+
+class BlockFollower:
+    """Background task that publishes each new block to subscribers"""
+
+    def __init__(self, pool: Optional[AlgodPool] = None, max_lag: Optional[int] = None):
+        self.pool = pool or algod_pool
+        # Rounds behind the tip after which we skip ahead instead of replaying
+        self.max_lag = max_lag if max_lag is not None else int(os.getenv("BLOCK_FOLLOWER_MAX_LAG", "100"))
+        self.last_round: Optional[int] = None
+        self._subscribers: List[Callable] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: Callable) -> None:
+        """callback(round, block, touched_addresses) is called for every new block"""
+        self._subscribers.append(callback)
+
+    def start(self, from_round: Optional[int] = None) -> None:
+        if self._task is None or self._task.done():
+            if from_round is not None:
+                self.last_round = from_round
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _publish(self, round_number: int, block: Optional[Dict], touched: Optional[Set[str]]) -> None:
+        for callback in self._subscribers:
+            try:
+                result = callback(round_number, block, touched)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Warning: block subscriber failed at round {round_number}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self.last_round is None:
+                    status = await self.pool.call("status")
+                    self.last_round = status["last-round"]
+
+                status = await self.pool.call("status_after_block", self.last_round)
+                tip = status["last-round"]
+
+                if tip - self.last_round > self.max_lag:
+                    self.last_round = tip
+                    await self._publish(tip, None, None)
+                    continue
+
+                while self.last_round < tip:
+                    next_round = self.last_round + 1
+                    raw = await self.pool.call("block_info", next_round, response_format="msgpack")
+                    block = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+                    await self._publish(next_round, block, touched_addresses(block))
+                    self.last_round = next_round
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: block follower error: {e}")
+                await asyncio.sleep(5)
+
+
+# Shared follower, started with the app
+block_follower = BlockFollower()
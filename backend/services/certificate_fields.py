@@ -0,0 +1,144 @@
+"""
+Certificate Field Extraction Engine
+
+Extracts certificate fields from OCR text in a single pass:
+1. Every pattern is compiled once, when it is registered
+2. Each pattern is indexed by its anchor words (the words it can start
+   with), so one scan over the word starts of the text is enough to know
+   which patterns to try at which position
+3. Per field, the highest-priority pattern that matched wins, and the
+   scan stops early once every field has its top pattern
+
+New certificate templates are registered as data; the scan loop never
+changes. Patterns capture the field value in their first group.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Anchor used for patterns that start with a digit (dates, ids)
+DIGIT_ANCHOR = "<digit>"
+
+_WORD = re.compile(r"\w+")
+_LEADING_ALTERNATION = re.compile(r"^\(\?:([a-z |]+)\)")
+
+# Common certificate patterns, in priority order per field
+DEFAULT_PATTERNS: Dict[str, List[str]] = {
+    'student_name': [
+        r'(?:awarded to|presented to|this certifies that)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'(?:name|student):\s*([A-Za-z\s]+)',
+    ],
+    'course_name': [
+        r'(?:course|program|training):\s*([A-Za-z\s]+)',
+        r'(?:completed|finished|passed)\s+([A-Za-z\s]+(?:course|program))',
+    ],
+    'issuer_name': [
+        r'(?:issued by|from|by)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+        r'(?:university|institute|academy|school):\s*([A-Za-z\s]+)',
+    ],
+    'issue_date': [
+        r'(?:date|issued on|dated):\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})',
+    ],
+}
+
+
+def derive_anchors(pattern: str) -> Optional[List[str]]:
+    """
+    Work out which words a pattern can start with.
+
+    Understands a leading `(?:word|two words|...)` group and patterns that
+    start with a digit class. Returns None when it cannot tell, in which
+    case the pattern is tried at every word start.
+    """
+    body = pattern.lstrip("(")
+    if body.startswith(r"\d"):
+        return [DIGIT_ANCHOR]
+
+    match = _LEADING_ALTERNATION.match(pattern)
+    if match:
+        return sorted({alt.split()[0] for alt in match.group(1).split("|") if alt.strip()})
+    return None
+
+
+class FieldExtractor:
+    """Pluggable single-pass extractor for certificate fields"""
+
+    def __init__(self, patterns: Optional[Dict[str, List[str]]] = None, flags: int = re.IGNORECASE):
+        self.flags = flags
+        self.fields: List[str] = []
+        # anchor word -> [(field, priority, compiled pattern)] in registration order
+        self._anchored: Dict[str, List[Tuple[str, int, re.Pattern]]] = {}
+        # patterns without known anchors, tried at every word start
+        self._unanchored: List[Tuple[str, int, re.Pattern]] = []
+        self._priorities: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if patterns:
+            self.register_template(patterns)
+
+    def register(self, field: str, pattern: str, anchors: Optional[Iterable[str]] = None) -> None:
+        """Add a pattern for a field, after any existing ones for it"""
+        compiled = re.compile(pattern, self.flags)
+        if anchors is None:
+            anchors = derive_anchors(pattern)
+
+        with self._lock:
+            priority = self._priorities.get(field, 0)
+            self._priorities[field] = priority + 1
+            if field not in self.fields:
+                self.fields.append(field)
+
+            entry = (field, priority, compiled)
+            if anchors is None:
+                self._unanchored.append(entry)
+            else:
+                for anchor in anchors:
+                    key = anchor if anchor == DIGIT_ANCHOR else anchor.lower()
+                    self._anchored.setdefault(key, []).append(entry)
+
+    def register_template(self, patterns: Dict[str, List[str]]) -> None:
+        """Register a whole certificate template: field -> patterns"""
+        for field, field_patterns in patterns.items():
+            for pattern in field_patterns:
+                self.register(field, pattern)
+
+    def extract(self, text: str) -> Dict[str, str]:
+        """Collect every field in one pass over the word starts of the text"""
+        anchored = self._anchored
+        unanchored = self._unanchored
+        field_count = len(self.fields)
+
+        # field -> (priority, value) of the best match so far
+        best: Dict[str, Tuple[int, str]] = {}
+        resolved = 0
+
+        for word in _WORD.finditer(text):
+            token = word.group()
+            key = DIGIT_ANCHOR if token[0].isdigit() else token.lower()
+            candidates = anchored.get(key)
+            if candidates is None and not unanchored:
+                continue
+
+            pos = word.start()
+            for field, priority, compiled in (candidates or []) + unanchored:
+                current = best.get(field)
+                if current is not None and current[0] <= priority:
+                    continue
+
+                match = compiled.match(text, pos)
+                if match is None:
+                    continue
+
+                best[field] = (priority, match.group(1).strip())
+                if priority == 0:
+                    resolved += 1
+
+            if resolved == field_count:
+                break
+
+        return {field: value for field, (_, value) in best.items()}
+
+
+# Shared extractor with the built-in templates
+default_field_extractor = FieldExtractor(DEFAULT_PATTERNS)
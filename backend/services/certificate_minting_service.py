@@ -3,34 +3,85 @@ Certificate Minting Service with 3-Layer Verification
 
 This service orchestrates the complete certificate issuance flow:
 1. Verify issuer is authorized via issuer registry
-2. Validate certificate data through AI verification endpoint
+2. Validate certificate data with the AI verification rules
 3. Verify IPFS hash exists and is accessible
 4. Mint NFT certificate on Algorand
 5. Record transaction on smart contract
+
+Cohorts can instead be anchored as one Merkle root (issue_cohort_anchored),
+with per-certificate inclusion proofs verified in O(log n).
 """
 
+import asyncio
 import os
 import json
-import requests
-from typing import Dict, Optional, Tuple
-from algosdk import account, mnemonic, transaction
-from algosdk.v2client import algod
+from typing import Dict, List, Optional, Tuple
+from algosdk import account, logic, mnemonic, transaction
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+    TransactionWithSigner,
+)
 from dotenv import load_dotenv
 
+from services.account_cache import account_cache
+from services.algorand_address import decode_address, is_valid_address, validate_addresses
+from services.certificate_record import (
+    CERT_PREFIX,
+    INDEX_SLOTS,
+    NOTE_MAX_LENGTH,
+    batch_box_mbr,
+    batch_box_name,
+    cert_box_mbr,
+    cert_box_name,
+    cid_to_multihash,
+    decode_batch_record,
+    decode_certificate_record,
+    decode_issuer_record,
+    is_valid_cid,
+    issuer_box_name,
+    metadata_pointer,
+    recipient_index_insert,
+    recipient_index_page_name,
+    unified_deployment,
+)
+from services.chain_reads import read_box
+from services.merkle import (
+    LEAF_PREIMAGE_SIZE,
+    MerkleTree,
+    canonical_metadata,
+    certificate_leaf_preimage,
+    decode_proof,
+    encode_proof,
+    leaf_hash,
+    proof_store,
+    verify_proof,
+)
+from services.algod_pool import algod_pool
+from services.certificate_scoring import score_certificates
+from services.pinata import fetch_from_ipfs
+from services.contract_simulator import ContractSimulator
+from services.unified_certificate_client import UnifiedCertificateClient
+
 load_dotenv()
 
+# Extra budget for simulated proof checks (the Merkle walk costs ~50 opcodes per level)
+SIMULATE_EXTRA_OPCODE_BUDGET = 20000
+
 
 class CertificateMintingService:
     def __init__(self):
-        self.algod_token = os.getenv("ALGOD_TOKEN", "")
-        self.algod_address = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
-        self.algod_client = algod.AlgodClient(self.algod_token, self.algod_address)
+        # Shared node pool (configured via ALGOD_NODES / ALGOD_ADDRESS / ALGOD_TOKEN)
+        self.algod = algod_pool
         
         # Load contract addresses from deployed_contracts.json
         self.load_contract_addresses()
         
-        # Backend API base URL
-        self.backend_url = os.getenv("BACKEND_URL", "http://localhost:8000")
+        # Generated ARC-4 client (contracts/generate_client.py)
+        self.contract = UnifiedCertificateClient(self.unified_app_id)
+        
+        # Read-only contract calls (verify, verify_batch_proof) via algod simulate
+        self.simulator = ContractSimulator(self.contract, self.simulate_sender)
     
     def load_contract_addresses(self):
         """Load deployed contract addresses"""
@@ -41,12 +92,27 @@ class CertificateMintingService:
             )
             with open(contracts_path, "r") as f:
                 contracts = json.load(f)
-                self.unified_app_id = contracts.get("unified_certificate_app_id", 0)
+                # An outdated deployment is treated as none: its calls would all fail
+                self.unified_app_id, self.unified_error = unified_deployment(contracts)
+                if self.unified_error and contracts.get("unified_certificate_app_id"):
+                    print(f"Warning: {self.unified_error}")
                 self.issuer_registry_app_id = contracts.get("issuer_registry_app_id", 0)
+                self.simulate_sender = os.getenv("SIMULATE_SENDER") or contracts.get("deployer_address", "")
         except Exception as e:
             print(f"Warning: Could not load contract addresses: {e}")
             self.unified_app_id = 0
+            self.unified_error = "Unified certificate contract not deployed"
             self.issuer_registry_app_id = 0
+            self.simulate_sender = os.getenv("SIMULATE_SENDER", "")
+    
+    def _state_changed(self, *addresses: str) -> None:
+        """
+        Drop cached account state a confirmed transaction changed
+
+        The block follower does this for every block, but it is opt-in;
+        without it the submitting request would read its own stale state.
+        """
+        account_cache.invalidate(addresses)
     
     async def verify_issuer_authorization(
         self,
@@ -63,34 +129,82 @@ class CertificateMintingService:
         Returns:
             (is_authorized, message)
         """
+        if not app_id:
+            return False, self.unified_error
         try:
-            # Read issuer's local state from contract
-            account_info = self.algod_client.account_application_info(
-                issuer_address,
-                app_id
-            )
-            
-            # Check if opted in and authorized
-            if "app-local-state" not in account_info:
-                return False, "Issuer not opted into contract"
+            record = await self.get_issuer_record(issuer_address, app_id)
             
-            local_state = account_info["app-local-state"]["key-value"]
-            
-            # Look for 'authorized' key
-            for item in local_state:
-                key = item["key"]
-                if key == "authorized":  # Base64 decode if needed
-                    authorized = item["value"]["uint"]
-                    if authorized == 1:
-                        return True, "Issuer authorized"
-                    else:
-                        return False, "Issuer authorization revoked"
-            
-            return False, "Issuer not found in registry"
+            if record is None:
+                return False, "Issuer not found in registry"
+            if record["authorized"]:
+                return True, "Issuer authorized"
+            return False, "Issuer authorization revoked"
             
         except Exception as e:
             return False, f"Error verifying issuer: {str(e)}"
     
+    async def get_issuer_record(self, issuer_address: str, app_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Issuer registry entry kept by the unified contract
+        
+        Args:
+            issuer_address: Algorand address of issuer
+            app_id: Application ID of the unified contract (defaults to the deployed one)
+            
+        Returns:
+            Decoded issuer record, or None if the address was never registered
+        """
+        # The unified contract keeps one box per issuer: "i" + public key
+        value = await read_box(app_id or self.unified_app_id, issuer_box_name(decode_address(issuer_address)))
+        return decode_issuer_record(value) if value is not None else None
+    
+    async def get_recipient_certificates(
+        self,
+        recipient_address: str,
+        limit: int = 100
+    ) -> Tuple[int, List[Dict]]:
+        """
+        Certificates held by an address, read from the unified contract's boxes
+        
+        Walks the recipient index pages and reads the certificate box of each
+        key, stopping once limit certificates are collected.
+        
+        Args:
+            recipient_address: Algorand address of the holder
+            limit: Largest number of certificates to read
+            
+        Returns:
+            (total certificates in the index, decoded records in issue order)
+        """
+        recipient_public_key = decode_address(recipient_address)
+        first_page = await read_box(self.unified_app_id, recipient_index_page_name(recipient_public_key, 0))
+        if first_page is None:
+            return 0, []
+        count = int.from_bytes(first_page[:8], "big")
+        wanted = min(count, limit)
+        
+        # Page 0 carries the count before its keys; later pages are keys only
+        pages = [first_page[8:]]
+        extra_pages = range(1, (wanted + INDEX_SLOTS - 1) // INDEX_SLOTS)
+        pages += await asyncio.gather(*(
+            read_box(self.unified_app_id, recipient_index_page_name(recipient_public_key, page))
+            for page in extra_pages
+        ))
+        keys = b"".join(page or b"" for page in pages)
+        keys = [keys[i:i + 32] for i in range(0, 32 * wanted, 32)]
+        
+        values = await asyncio.gather(*(
+            read_box(self.unified_app_id, CERT_PREFIX + key) for key in keys
+        ))
+        certificates = []
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            record = decode_certificate_record(value).to_dict()
+            record["cert_key"] = key.hex()
+            certificates.append(record)
+        return count, certificates
+    
     async def verify_certificate_with_ai(
         self,
         cert_id: str,
@@ -100,7 +214,7 @@ class CertificateMintingService:
         metadata: Dict
     ) -> Tuple[bool, float, str]:
         """
-        LAYER 2: Verify certificate data with AI endpoint
+        LAYER 2: Verify certificate data with the AI verification rules
         
         Args:
             cert_id: Certificate ID
@@ -112,28 +226,36 @@ class CertificateMintingService:
         Returns:
             (is_valid, confidence, reason)
         """
-        try:
-            # Call AI verification endpoint
-            response = requests.post(
-                f"{self.backend_url}/ai/verifyCertificate",
-                json={
-                    "cert_id": cert_id,
-                    "recipient_address": recipient_address,
-                    "ipfs_hash": ipfs_hash,
-                    "issuer_address": issuer_address,
-                    "metadata": metadata
-                },
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                return False, 0.0, f"AI verification failed: {response.status_code}"
-            
-            data = response.json()
-            return data["valid"], data["confidence"], data["reason"]
+        [result] = await self.verify_certificates_with_ai([{
+            "cert_id": cert_id,
+            "recipient_address": recipient_address,
+            "ipfs_hash": ipfs_hash,
+            "issuer_address": issuer_address,
+            "metadata": metadata
+        }])
+        return result
+    
+    async def verify_certificates_with_ai(
+        self,
+        items: List[Dict]
+    ) -> List[Tuple[bool, float, str]]:
+        """
+        LAYER 2 for a cohort: score many certificates in one columnar pass
+        
+        Runs the rules behind /ai/verifyCertificate in-process (no HTTP
+        round trip to this server).
+        
+        Args:
+            items: Dicts with cert_id, recipient_address, ipfs_hash,
+                issuer_address and metadata
             
+        Returns:
+            (is_valid, confidence, reason) per item, in input order
+        """
+        try:
+            return score_certificates(items)
         except Exception as e:
-            return False, 0.0, f"AI verification error: {str(e)}"
+            return [(False, 0.0, f"AI verification error: {str(e)}")] * len(items)
     
     async def verify_ipfs_hash(self, ipfs_hash: str) -> Tuple[bool, str, Optional[Dict]]:
         """
@@ -145,21 +267,17 @@ class CertificateMintingService:
         Returns:
             (exists, message, data)
         """
+        # The contract stores the CID as a sha2-256 multihash
+        if not is_valid_cid(ipfs_hash):
+            return False, "IPFS hash is not a sha2-256 CID", None
+        
         try:
-            # Verify via backend endpoint
-            response = requests.get(
-                f"{self.backend_url}/verify/certificate/{ipfs_hash}",
-                timeout=10
-            )
+            # Gateway fetch runs on a worker thread so the event loop keeps serving
+            data = await asyncio.to_thread(fetch_from_ipfs, ipfs_hash)
             
-            if response.status_code != 200:
+            if data is None:
                 return False, "IPFS hash not found or inaccessible", None
-            
-            data = response.json()
-            if data.get("status") == "success":
-                return True, "IPFS hash verified", data.get("data")
-            else:
-                return False, "IPFS verification failed", None
+            return True, "IPFS hash verified", data
                 
         except Exception as e:
             return False, f"IPFS verification error: {str(e)}", None
@@ -192,7 +310,7 @@ class CertificateMintingService:
             issuer_address = account.address_from_private_key(issuer_private_key)
             
             # Get suggested params
-            params = self.algod_client.suggested_params()
+            params = await self.algod.call("suggested_params")
             
             # Create NFT asset (total=1, decimals=0 for NFT)
             txn = transaction.AssetConfigTxn(
@@ -214,17 +332,18 @@ class CertificateMintingService:
             signed_txn = txn.sign(issuer_private_key)
             
             # Send transaction
-            tx_id = self.algod_client.send_transaction(signed_txn)
+            [tx_id] = await self.algod.submit(signed_txn)
             
             # Wait for confirmation
-            confirmed_txn = transaction.wait_for_confirmation(
-                self.algod_client,
+            confirmed_txn = await self.algod.run(
+                transaction.wait_for_confirmation,
                 tx_id,
                 4
             )
             
             # Get asset ID
             asset_id = confirmed_txn["asset-index"]
+            self._state_changed(issuer_address)
             
             # Transfer NFT to recipient
             transfer_success = await self._transfer_nft_to_recipient(
@@ -250,7 +369,7 @@ class CertificateMintingService:
         """Transfer minted NFT to recipient"""
         try:
             issuer_address = account.address_from_private_key(issuer_private_key)
-            params = self.algod_client.suggested_params()
+            params = await self.algod.call("suggested_params")
             
             # Recipient must opt-in first (handled separately)
             # Transfer asset
@@ -263,10 +382,11 @@ class CertificateMintingService:
             )
             
             signed_txn = txn.sign(issuer_private_key)
-            tx_id = self.algod_client.send_transaction(signed_txn)
+            [tx_id] = await self.algod.submit(signed_txn)
             
             # Wait for confirmation
-            transaction.wait_for_confirmation(self.algod_client, tx_id, 4)
+            await self.algod.run(transaction.wait_for_confirmation, tx_id, 4)
+            self._state_changed(issuer_address, recipient_address)
             
             return True
         except Exception as e:
@@ -298,36 +418,70 @@ class CertificateMintingService:
         Returns:
             (success, message)
         """
+        if not self.unified_app_id:
+            return False, self.unified_error
         try:
             issuer_address = account.address_from_private_key(issuer_private_key)
-            params = self.algod_client.suggested_params()
-            
-            # Prepare app call arguments
-            app_args = [
-                "issue".encode(),
-                cert_id.encode(),
-                ipfs_hash.encode(),
-                recipient_address.encode(),
-                metadata_json.encode(),
-                (1 if ai_verified else 0).to_bytes(8, "big"),
-                str(nft_asset_id).encode()
-            ]
-            
-            # Create application call transaction
-            txn = transaction.ApplicationCallTxn(
-                sender=issuer_address,
-                sp=params,
-                index=self.unified_app_id,
-                on_complete=transaction.OnComplete.NoOpOC,
-                app_args=app_args
+            params = await self.algod.call("suggested_params")
+            
+            issuer_public_key = decode_address(issuer_address)
+            recipient_public_key = decode_address(recipient_address)
+            metadata_bytes = metadata_json.encode()
+            
+            # The key goes to the last index page; a full page means a new one
+            recipient_index = await read_box(
+                self.unified_app_id, recipient_index_page_name(recipient_public_key, 0)
             )
+            index_count = int.from_bytes(recipient_index[:8], "big") if recipient_index else 0
+            index_page, index_mbr = recipient_index_insert(index_count)
+            index_boxes = [recipient_index_page_name(recipient_public_key, 0)]
+            if index_page:
+                index_boxes.append(recipient_index_page_name(recipient_public_key, index_page))
             
-            # Sign and send
-            signed_txn = txn.sign(issuer_private_key)
-            tx_id = self.algod_client.send_transaction(signed_txn)
+            # The issuer funds the minimum balance of the new boxes
+            # The box keeps a pointer to the metadata; the JSON itself rides in the note
+            pointer = metadata_pointer(metadata_bytes)
+            mbr = cert_box_mbr(len(pointer)) + index_mbr
             
-            # Wait for confirmation
-            transaction.wait_for_confirmation(self.algod_client, tx_id, 4)
+            signer = AccountTransactionSigner(issuer_private_key)
+            mbr_payment = TransactionWithSigner(
+                transaction.PaymentTxn(
+                    sender=issuer_address,
+                    sp=params,
+                    receiver=logic.get_application_address(self.unified_app_id),
+                    amt=mbr
+                ),
+                signer
+            )
+            
+            atc = self.contract.issue(
+                AtomicTransactionComposer(),
+                issuer_address,
+                signer,
+                params,
+                cert_id=cert_id,
+                cid=cid_to_multihash(ipfs_hash),
+                recipient=recipient_address,
+                metadata_pointer=pointer,
+                ai_verified=ai_verified,
+                manual_verified=True,  # Issuer signature counts as manual verification
+                nft_asset_id=nft_asset_id,
+                mbr_payment=mbr_payment,
+                # Boxes the contract reads or creates
+                boxes=[
+                    issuer_box_name(issuer_public_key),
+                    cert_box_name(cert_id),
+                    *index_boxes,
+                ],
+                note=metadata_bytes if len(metadata_bytes) <= NOTE_MAX_LENGTH else None
+            )
+            
+            # Sign, send and wait for confirmation
+            response = await self.algod.execute(atc, 4)
+            tx_id = response.tx_ids[-1]
+            self._state_changed(
+                issuer_address, recipient_address, logic.get_application_address(self.unified_app_id)
+            )
             
             return True, f"Certificate recorded on-chain: {tx_id}"
             
@@ -366,6 +520,11 @@ class CertificateMintingService:
             "message": ""
         }
         
+        # Reject malformed addresses before spending any network round trips
+        if not is_valid_address(recipient_address):
+            result["message"] = "Invalid recipient address"
+            return result
+        
         # LAYER 1: Issuer Registry Verification
         issuer_authorized, issuer_msg = await self.verify_issuer_authorization(
             issuer_address,
@@ -398,6 +557,28 @@ class CertificateMintingService:
             result["message"] = f"Layer 2 failed: {ai_reason}"
             return result
         
+        return await self._complete_issuance(
+            result,
+            issuer_private_key,
+            cert_id,
+            recipient_address,
+            certificate_metadata,
+            ipfs_hash,
+            ai_valid
+        )
+    
+    async def _complete_issuance(
+        self,
+        result: Dict,
+        issuer_private_key: str,
+        cert_id: str,
+        recipient_address: str,
+        certificate_metadata: Dict,
+        ipfs_hash: str,
+        ai_valid: bool
+    ) -> Dict:
+        """Layer 3, NFT minting and on-chain recording for a certificate that passed layers 1-2"""
+        
         # LAYER 3: IPFS Verification
         ipfs_valid, ipfs_msg, ipfs_data = await self.verify_ipfs_hash(ipfs_hash)
         result["verification_layers"]["ipfs_verification"] = {
@@ -451,6 +632,437 @@ class CertificateMintingService:
         result["message"] = "Certificate issued successfully with 3-layer verification"
         
         return result
+    
+    async def issue_cohort_full_flow(
+        self,
+        issuer_private_key: str,
+        certificates: List[Dict]
+    ) -> List[Dict]:
+        """
+        Issue certificates for a whole cohort from one issuer
+        
+        The issuer is checked once and AI verification scores the whole
+        cohort in one pass; IPFS checks, minting and recording then run
+        per certificate.
+        
+        Args:
+            issuer_private_key: Issuer's private key
+            certificates: Dicts with cert_id, recipient_address,
+                certificate_metadata and ipfs_hash
+            
+        Returns:
+            One result dictionary per certificate, in input order
+        """
+        issuer_address = account.address_from_private_key(issuer_private_key)
+        
+        results = [
+            {
+                "success": False,
+                "cert_id": cert["cert_id"],
+                "verification_layers": {},
+                "nft_asset_id": None,
+                "transaction_id": None,
+                "message": ""
+            }
+            for cert in certificates
+        ]
+        
+        for i, ai_valid in await self._verify_cohort(issuer_address, certificates, results):
+            cert = certificates[i]
+            await self._complete_issuance(
+                results[i],
+                issuer_private_key,
+                cert["cert_id"],
+                cert["recipient_address"],
+                cert["certificate_metadata"],
+                cert["ipfs_hash"],
+                ai_valid
+            )
+        
+        return results
+    
+    async def _verify_cohort(
+        self,
+        issuer_address: str,
+        certificates: List[Dict],
+        results: List[Dict]
+    ) -> List[Tuple[int, bool]]:
+        """
+        Address check plus layers 1-2 for a cohort
+        
+        Fills results in place and returns (index, ai_valid) for every
+        certificate that passed.
+        """
+        # Reject malformed addresses before spending any network round trips
+        valid_recipients = validate_addresses(cert["recipient_address"] for cert in certificates)
+        for result, valid in zip(results, valid_recipients):
+            if not valid:
+                result["message"] = "Invalid recipient address"
+        
+        pending = [i for i, valid in enumerate(valid_recipients) if valid]
+        if not pending:
+            return []
+        
+        # LAYER 1: Issuer Registry Verification (same issuer for the cohort)
+        issuer_authorized, issuer_msg = await self.verify_issuer_authorization(
+            issuer_address,
+            self.unified_app_id
+        )
+        for i in pending:
+            result = results[i]
+            result["verification_layers"]["issuer_registry"] = {
+                "passed": issuer_authorized,
+                "message": issuer_msg
+            }
+            if not issuer_authorized:
+                result["message"] = f"Layer 1 failed: {issuer_msg}"
+        
+        if not issuer_authorized:
+            return []
+        
+        # LAYER 2: AI Verification, batched
+        ai_results = await self.verify_certificates_with_ai([
+            {
+                "cert_id": cert["cert_id"],
+                "recipient_address": cert["recipient_address"],
+                "ipfs_hash": cert["ipfs_hash"],
+                "issuer_address": issuer_address,
+                "metadata": cert["certificate_metadata"]
+            }
+            for cert in (certificates[i] for i in pending)
+        ])
+        
+        passed = []
+        for i, (ai_valid, ai_confidence, ai_reason) in zip(pending, ai_results):
+            result = results[i]
+            result["verification_layers"]["ai_verification"] = {
+                "passed": ai_valid,
+                "confidence": ai_confidence,
+                "reason": ai_reason
+            }
+            
+            if not ai_valid:
+                result["message"] = f"Layer 2 failed: {ai_reason}"
+                continue
+            passed.append((i, ai_valid))
+        
+        return passed
+    
+    # ==================== MERKLE BATCH ANCHORING ====================
+    
+    async def anchor_batch_on_chain(
+        self,
+        issuer_private_key: str,
+        merkle_root: bytes,
+        leaf_count: int
+    ) -> Tuple[bool, str]:
+        """
+        Anchor a batch's Merkle root with one anchor_batch call
+        
+        Returns:
+            (success, transaction id or error message)
+        """
+        if not self.unified_app_id:
+            return False, self.unified_error
+        try:
+            issuer_address = account.address_from_private_key(issuer_private_key)
+            params = await self.algod.call("suggested_params")
+            
+            # The issuer funds the minimum balance of the batch box
+            signer = AccountTransactionSigner(issuer_private_key)
+            mbr_payment = TransactionWithSigner(
+                transaction.PaymentTxn(
+                    sender=issuer_address,
+                    sp=params,
+                    receiver=logic.get_application_address(self.unified_app_id),
+                    amt=batch_box_mbr()
+                ),
+                signer
+            )
+            
+            atc = self.contract.anchor_batch(
+                AtomicTransactionComposer(),
+                issuer_address,
+                signer,
+                params,
+                root=merkle_root,
+                leaf_count=leaf_count,
+                mbr_payment=mbr_payment,
+                boxes=[
+                    issuer_box_name(decode_address(issuer_address)),
+                    batch_box_name(merkle_root),
+                ]
+            )
+            
+            response = await self.algod.execute(atc, 4)
+            tx_id = response.tx_ids[-1]
+            self._state_changed(issuer_address, logic.get_application_address(self.unified_app_id))
+            
+            return True, tx_id
+            
+        except Exception as e:
+            return False, f"Batch anchoring error: {str(e)}"
+    
+    async def issue_cohort_anchored(
+        self,
+        issuer_private_key: str,
+        certificates: List[Dict]
+    ) -> Dict:
+        """
+        Issue a cohort by anchoring one Merkle root instead of one record per certificate
+        
+        Certificates go through the same address, issuer, AI and IPFS
+        checks as issue_cohort_full_flow. Those that pass become leaves of
+        a Merkle tree whose root is anchored with a single app call; no
+        NFT is minted and no per-certificate box is created. Each anchored
+        certificate's inclusion proof is kept in the proof store.
+        
+        Args:
+            issuer_private_key: Issuer's private key
+            certificates: Dicts with cert_id, recipient_address,
+                certificate_metadata and ipfs_hash
+            
+        Returns:
+            Dictionary with merkle_root, transaction_id and one result per
+            certificate, in input order
+        """
+        issuer_address = account.address_from_private_key(issuer_private_key)
+        
+        results = [
+            {
+                "success": False,
+                "cert_id": cert["cert_id"],
+                "verification_layers": {},
+                "merkle_root": None,
+                "leaf_index": None,
+                "proof": None,
+                "transaction_id": None,
+                "message": ""
+            }
+            for cert in certificates
+        ]
+        batch = {"merkle_root": None, "transaction_id": None, "results": results}
+        
+        preimages, anchored = [], []
+        for i, _ in await self._verify_cohort(issuer_address, certificates, results):
+            cert, result = certificates[i], results[i]
+            
+            # LAYER 3: IPFS Verification
+            ipfs_valid, ipfs_msg, _ = await self.verify_ipfs_hash(cert["ipfs_hash"])
+            result["verification_layers"]["ipfs_verification"] = {
+                "passed": ipfs_valid,
+                "message": ipfs_msg
+            }
+            if not ipfs_valid:
+                result["message"] = f"Layer 3 failed: {ipfs_msg}"
+                continue
+            
+            preimages.append(certificate_leaf_preimage(
+                cert["cert_id"],
+                decode_address(cert["recipient_address"]),
+                cid_to_multihash(cert["ipfs_hash"]),
+                canonical_metadata(cert["certificate_metadata"])
+            ))
+            anchored.append(i)
+        
+        if not anchored:
+            return batch
+        
+        tree = MerkleTree([leaf_hash(preimage) for preimage in preimages])
+        anchor_success, anchor_msg = await self.anchor_batch_on_chain(
+            issuer_private_key,
+            tree.root,
+            len(tree)
+        )
+        if not anchor_success:
+            for i in anchored:
+                results[i]["message"] = f"Anchoring failed: {anchor_msg}"
+            return batch
+        
+        proof_store.save_batch(
+            tree,
+            [certificates[i]["cert_id"] for i in anchored],
+            preimages,
+            issuer_address,
+            anchor_msg
+        )
+        
+        batch["merkle_root"] = tree.root.hex()
+        batch["transaction_id"] = anchor_msg
+        for leaf_index, i in enumerate(anchored):
+            result = results[i]
+            result["success"] = True
+            result["merkle_root"] = batch["merkle_root"]
+            result["leaf_index"] = leaf_index
+            result["proof"] = encode_proof(tree.proof(leaf_index)).hex()
+            result["transaction_id"] = anchor_msg
+            result["message"] = "Certificate anchored in Merkle batch with 3-layer verification"
+        
+        return batch
+    
+    async def revoke_batch_on_chain(
+        self,
+        issuer_private_key: str,
+        merkle_root: bytes
+    ) -> Tuple[bool, str]:
+        """
+        Deactivate an anchored batch (anchoring issuer or admin only)
+        
+        Every certificate in the batch stops verifying, off-chain and
+        on-chain; the batch box is kept as a record.
+        
+        Returns:
+            (success, transaction id or error message)
+        """
+        if not self.unified_app_id:
+            return False, self.unified_error
+        try:
+            issuer_address = account.address_from_private_key(issuer_private_key)
+            params = await self.algod.call("suggested_params")
+            
+            atc = self.contract.revoke_batch(
+                AtomicTransactionComposer(),
+                issuer_address,
+                AccountTransactionSigner(issuer_private_key),
+                params,
+                root=merkle_root,
+                boxes=[batch_box_name(merkle_root)]
+            )
+            
+            response = await self.algod.execute(atc, 4)
+            self._state_changed(issuer_address, logic.get_application_address(self.unified_app_id))
+            return True, response.tx_ids[-1]
+            
+        except Exception as e:
+            return False, f"Batch revocation error: {str(e)}"
+    
+    async def verify_batch_proof_on_chain(
+        self,
+        merkle_root: bytes,
+        leaf_preimage: bytes,
+        proof: bytes
+    ) -> Tuple[bool, str]:
+        """
+        Run the contract's verify_batch_proof through algod simulate
+        
+        The contract hashes the leaf preimage itself. Nothing is signed or
+        submitted; the call is evaluated against current state with extra
+        opcode budget for deep proofs.
+        """
+        valid, error = await self.simulator.call(
+            "verify_batch_proof",
+            {"root": merkle_root, "leaf_preimage": leaf_preimage, "proof": proof},
+            boxes=[batch_box_name(merkle_root)],
+            extra_opcode_budget=SIMULATE_EXTRA_OPCODE_BUDGET
+        )
+        if error:
+            return False, f"On-chain proof check error: {error}"
+        if not valid:
+            return False, "Contract rejected proof"
+        return True, "Proof verified by contract"
+    
+    async def verify_anchored_certificate(
+        self,
+        cert_id: str,
+        recipient_address: Optional[str] = None,
+        ipfs_hash: Optional[str] = None,
+        certificate_metadata: Optional[Dict] = None,
+        merkle_root: Optional[str] = None,
+        proof: Optional[str] = None,
+        on_chain: bool = False
+    ) -> Dict:
+        """
+        Confirm a certificate's membership in an anchored batch
+        
+        The leaf preimage is recomputed from recipient, IPFS hash and
+        metadata when all three are given (so the content is checked too),
+        otherwise the stored preimage is used. Root and proof default to the stored ones.
+        The proof is checked off-chain in O(log n), then the batch box is
+        read to confirm the root is anchored and active; on_chain also runs
+        the contract's own proof check via simulate.
+        """
+        result = {
+            "valid": False,
+            "cert_id": cert_id,
+            "merkle_root": merkle_root,
+            "leaf_index": None,
+            "proof_valid": False,
+            "anchored": False,
+            "active": False,
+            "issuer": None,
+            "anchored_at": None,
+            "on_chain_valid": None,
+            "message": ""
+        }
+        
+        stored = proof_store.get(cert_id) or {}
+        root_hex = merkle_root or stored.get("merkle_root")
+        proof_hex = proof or stored.get("proof")
+        result["merkle_root"] = root_hex
+        result["leaf_index"] = stored.get("leaf_index")
+        
+        try:
+            if recipient_address and ipfs_hash and certificate_metadata is not None:
+                leaf_preimage = certificate_leaf_preimage(
+                    cert_id,
+                    decode_address(recipient_address),
+                    cid_to_multihash(ipfs_hash),
+                    canonical_metadata(certificate_metadata)
+                )
+            elif stored.get("leaf_preimage"):
+                leaf_preimage = bytes.fromhex(stored["leaf_preimage"])
+            else:
+                result["message"] = "No stored leaf preimage; provide recipient, IPFS hash and metadata"
+                return result
+            if len(leaf_preimage) != LEAF_PREIMAGE_SIZE:
+                raise ValueError(f"Leaf preimage must be {LEAF_PREIMAGE_SIZE} bytes")
+            leaf = leaf_hash(leaf_preimage)
+            
+            if root_hex is None or proof_hex is None:
+                result["message"] = "No Merkle root or proof for this certificate"
+                return result
+            
+            root = bytes.fromhex(root_hex)
+            proof_bytes = bytes.fromhex(proof_hex)
+            proof_steps = decode_proof(proof_bytes)
+        except ValueError as e:
+            result["message"] = f"Invalid proof input: {str(e)}"
+            return result
+        
+        result["proof_valid"] = verify_proof(leaf, proof_steps, root)
+        if not result["proof_valid"]:
+            result["message"] = "Certificate is not a member of this batch"
+            return result
+        
+        try:
+            value = await read_box(self.unified_app_id, batch_box_name(root))
+        except Exception as e:
+            result["message"] = f"Error reading batch: {str(e)}"
+            return result
+        
+        record = decode_batch_record(value) if value is not None else None
+        if record is None:
+            result["message"] = "Merkle root is not anchored on chain"
+            return result
+        
+        result["anchored"] = True
+        result["active"] = record["active"]
+        result["issuer"] = record["issuer"]
+        result["anchored_at"] = record["anchored_at"]
+        if not record["active"]:
+            result["message"] = "Batch is no longer active"
+            return result
+        
+        if on_chain:
+            on_chain_valid, on_chain_msg = await self.verify_batch_proof_on_chain(root, leaf_preimage, proof_bytes)
+            result["on_chain_valid"] = on_chain_valid
+            if not on_chain_valid:
+                result["message"] = on_chain_msg
+                return result
+        
+        result["valid"] = True
+        result["message"] = "Certificate is included in an anchored batch"
+        return result
 
 
 # Singleton instance
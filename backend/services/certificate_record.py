@@ -0,0 +1,241 @@
+"""
+Certificate Box Records
+
+Backend side of the unified contract's box layout. Names, offsets, MBR
+and CID helpers come from services/box_layout.py, which
+contracts/generate_client.py copies from contracts/box_layout.py:
+1. Box names: c + sha256(cert_id), r + recipient (+ index page),
+   i + issuer, b + Merkle root
+2. Minimum-balance cost of the boxes an issuance creates
+3. Packed certificate record encoder and zero-copy memoryview decoder
+4. CID <-> multihash conversion (base58btc CIDv0, base32 CIDv1)
+5. Parsing of issuer and anchored batch records read from chain
+6. Which deployments (deployed_contracts.json) use this layout
+
+Certificate record (fixed width, big-endian integers):
+
+    issuer        32   offset 0
+    recipient     32   offset 32
+    timestamp      8   offset 64
+    nft asset id   8   offset 72
+    flags          1   offset 80
+    cid multihash 34   offset 81
+    pointer len    1   offset 115
+    metadata ptr   *   offset 116
+"""
+
+import struct
+from typing import Dict, Optional, Tuple, Union
+
+from algosdk import encoding
+
+from services.box_layout import (  # noqa: F401 (re-exported)
+    BATCH_PREFIX,
+    BATCH_RECORD_SIZE,
+    CERT_PREFIX,
+    CID_LENGTH,
+    CID_OFFSET,
+    CODEC_DAG_PB,
+    CODEC_RAW,
+    FLAG_ACTIVE,
+    FLAG_AI_VERIFIED,
+    FLAG_MANUAL_VERIFIED,
+    INDEX_PAGE_SIZE,
+    INDEX_SIZE,
+    INDEX_SLOTS,
+    ISSUER_PREFIX,
+    METADATA_POINTER_MAX_LENGTH,
+    METADATA_POINTER_OFFSET,
+    MULTIHASH_SHA2_256,
+    NOTE_MAX_LENGTH,
+    RECIPIENT_PREFIX,
+    TIMESTAMP_OFFSET,
+    batch_box_mbr,
+    batch_box_name,
+    box_mbr,
+    cert_box_mbr,
+    cert_box_name,
+    cert_key,
+    cid_to_multihash,
+    is_valid_cid,
+    issuer_box_name,
+    metadata_pointer,
+    multihash_to_cid,
+    recipient_box_name,
+    recipient_index_insert,
+    recipient_index_mbr,
+    recipient_index_page_name,
+)
+
+# Fixed part of the record: issuer, recipient, timestamp, asset id, flags, multihash, pointer length
+RECORD_HEADER = struct.Struct(">32s32sQQB34sB")
+# Integer fields only (timestamp, asset id, flags at 64)
+_RECORD_INTS = struct.Struct(">QQB")
+
+# Anchored batch: issuer (32) | timestamp (8) | leaf count (8) | flags (1)
+BATCH_RECORD = struct.Struct(">32sQQB")
+
+assert RECORD_HEADER.size == METADATA_POINTER_OFFSET
+assert BATCH_RECORD.size == BATCH_RECORD_SIZE
+
+# First unified contract version with boxes and the ARC-4 interface;
+# older deployments reject every call the generated client makes
+MIN_CONTRACT_VERSION = (3, 0, 0)
+
+
+# ==================== RECORD ENCODING ====================
+
+def encode_certificate_record(
+    issuer_public_key: bytes,
+    recipient_public_key: bytes,
+    timestamp: int,
+    asset_id: int,
+    flags: int,
+    cid_multihash: bytes,
+    pointer: bytes = b""
+) -> bytes:
+    """Pack a certificate record exactly as the contract's box_put writes it"""
+    if len(pointer) > METADATA_POINTER_MAX_LENGTH:
+        raise ValueError(f"Metadata pointer exceeds {METADATA_POINTER_MAX_LENGTH} bytes")
+    if len(cid_multihash) != CID_LENGTH:
+        raise ValueError(f"Multihash must be {CID_LENGTH} bytes")
+    header = RECORD_HEADER.pack(
+        issuer_public_key,
+        recipient_public_key,
+        timestamp,
+        asset_id,
+        flags,
+        cid_multihash,
+        len(pointer)
+    )
+    return header + pointer
+
+
+class CertificateRecordView:
+    """
+    Zero-copy view over a packed certificate record
+
+    Fields are read on access from a memoryview of the box value, so
+    decoding a page of records does not copy the pointer or key bytes
+    until they are actually needed.
+    """
+
+    __slots__ = ("_buffer", "_ints", "_pointer_length")
+
+    def __init__(self, value: Union[bytes, bytearray, memoryview]):
+        self._buffer = memoryview(value)
+        if len(self._buffer) < METADATA_POINTER_OFFSET:
+            raise ValueError(f"Certificate record too short: {len(self._buffer)} bytes")
+        self._ints = _RECORD_INTS.unpack_from(self._buffer, TIMESTAMP_OFFSET)
+        self._pointer_length = self._buffer[METADATA_POINTER_OFFSET - 1]
+        if METADATA_POINTER_OFFSET + self._pointer_length > len(self._buffer):
+            raise ValueError("Certificate record metadata pointer is truncated")
+
+    @property
+    def issuer_public_key(self) -> memoryview:
+        return self._buffer[0:32]
+
+    @property
+    def recipient_public_key(self) -> memoryview:
+        return self._buffer[32:64]
+
+    @property
+    def timestamp(self) -> int:
+        return self._ints[0]
+
+    @property
+    def asset_id(self) -> int:
+        return self._ints[1]
+
+    @property
+    def flags(self) -> int:
+        return self._ints[2]
+
+    @property
+    def cid_multihash(self) -> memoryview:
+        return self._buffer[CID_OFFSET:CID_OFFSET + CID_LENGTH]
+
+    @property
+    def metadata_pointer(self) -> memoryview:
+        return self._buffer[METADATA_POINTER_OFFSET:METADATA_POINTER_OFFSET + self._pointer_length]
+
+    @property
+    def active(self) -> bool:
+        return bool(self.flags & FLAG_ACTIVE)
+
+    @property
+    def ai_verified(self) -> bool:
+        return bool(self.flags & FLAG_AI_VERIFIED)
+
+    @property
+    def manual_verified(self) -> bool:
+        return bool(self.flags & FLAG_MANUAL_VERIFIED)
+
+    def to_dict(self) -> Dict:
+        return {
+            "issuer": encoding.encode_address(bytes(self.issuer_public_key)),
+            "recipient": encoding.encode_address(bytes(self.recipient_public_key)),
+            "timestamp": self.timestamp,
+            "asset_id": self.asset_id,
+            "active": self.active,
+            "ai_verified": self.ai_verified,
+            "manual_verified": self.manual_verified,
+            "ipfs_hash": multihash_to_cid(self.cid_multihash),
+            "metadata_pointer": bytes(self.metadata_pointer).hex(),
+        }
+
+
+def decode_certificate_record(value: Union[bytes, bytearray, memoryview]) -> CertificateRecordView:
+    return CertificateRecordView(value)
+
+
+def decode_issuer_record(value: bytes) -> Optional[Dict]:
+    """flag | registered (8) | name length (2) | name | metadata"""
+    if len(value) < 11:
+        return None
+    name_length = int.from_bytes(value[9:11], "big")
+    return {
+        "authorized": value[0] == 1,
+        "registered_at": int.from_bytes(value[1:9], "big"),
+        "name": value[11:11 + name_length].decode("utf-8", errors="replace"),
+        "metadata": value[11 + name_length:].decode("utf-8", errors="replace"),
+    }
+
+
+def decode_batch_record(value: bytes) -> Optional[Dict]:
+    """issuer (32) | anchored at (8) | leaf count (8) | flags (1)"""
+    if len(value) < BATCH_RECORD.size:
+        return None
+    issuer, anchored_at, leaf_count, flags = BATCH_RECORD.unpack_from(value)
+    return {
+        "issuer": encoding.encode_address(issuer),
+        "anchored_at": anchored_at,
+        "leaf_count": leaf_count,
+        "active": bool(flags & FLAG_ACTIVE),
+    }
+
+
+# ==================== DEPLOYMENT ====================
+
+def unified_deployment(contracts: Dict) -> Tuple[int, Optional[str]]:
+    """
+    Unified app id of a deployed_contracts.json entry, if the backend can use it
+
+    Returns (app id, None), or (0, reason) when no app is deployed or it
+    predates MIN_CONTRACT_VERSION.
+    """
+    app_id = int(contracts.get("unified_certificate_app_id") or 0)
+    if not app_id:
+        return 0, "Unified certificate contract not deployed"
+    version = str(contracts.get("contract_version", "0"))
+    try:
+        current = tuple(int(part) for part in version.split("."))
+    except ValueError:
+        current = ()
+    if current < MIN_CONTRACT_VERSION:
+        required = ".".join(str(part) for part in MIN_CONTRACT_VERSION)
+        return 0, (
+            f"Unified certificate app {app_id} is contract version {version}, "
+            f"the backend needs {required} or later: redeploy with contracts/deploy_unified_contract.py"
+        )
+    return app_id, None
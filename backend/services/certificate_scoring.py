@@ -0,0 +1,47 @@
+"""
+Certificate Verification Scoring
+
+The weighted checks behind /ai/verifyCertificate, usable in-process:
+1. VERIFICATION_RULES: one rule per field; a request passes at 0.80 and
+   both addresses must be valid
+2. score_certificates() scores many plain dicts column-wise and returns
+   (valid, confidence, reason) per item, in input order
+
+The route wraps the tuples in its response models; the minting service
+calls this directly instead of posting to its own server.
+"""
+
+from typing import List, Mapping, Sequence, Tuple
+
+from services.algorand_address import is_valid_address
+from services.rule_engine import Rule, RuleSet, custom, has_keys, min_length, starts_with
+
+VERIFICATION_RULES = RuleSet(
+    [
+        Rule("cert_id", "cert_id", min_length(6), 0.20,
+             fail_reason="Invalid certificate ID format"),
+        # CIDv0 / CIDv1
+        Rule("ipfs_hash", "ipfs_hash", starts_with("Qm", "bafy"), 0.25,
+             fail_reason="Invalid IPFS hash format"),
+        # Full base32 + checksum validation; a bad address would only fail on chain
+        Rule("recipient", "recipient_address", custom(is_valid_address, "algorand_address"), 0.20,
+             fail_reason="Invalid recipient address", required=True),
+        Rule("issuer", "issuer_address", custom(is_valid_address, "algorand_address"), 0.15,
+             fail_reason="Invalid issuer address", required=True),
+        Rule("metadata", "metadata", has_keys("courseName", "studentName", "issueDate"), 0.20,
+             fail_reason="Incomplete metadata"),
+    ],
+    threshold=0.80
+)
+
+
+def score_certificates(items: Sequence[Mapping]) -> List[Tuple[bool, float, str]]:
+    """(valid, confidence, reason) for each certificate dict"""
+    scored = []
+    for result in VERIFICATION_RULES.score_batch(items):
+        if result.passed:
+            reason = "Certificate passed all AI verification checks"
+        else:
+            reason = f"Verification failed: {'; '.join(result.failed_reasons)}"
+        scored.append((result.passed, round(result.score, 2), reason))
+    return scored
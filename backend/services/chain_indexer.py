@@ -0,0 +1,668 @@
+"""
+Chain Indexer
+
+Keeps a local SQLite index of the unified certificate contract so
+per-address, per-issuer and per-course lookups never touch algod:
+1. Blocks arrive from the shared block follower; any gap (restart, lag
+   skip-ahead, missed rounds) is backfilled from algod in order
+2. ARC-4 app calls to the configured app are decoded by method selector
+   (issue, revoke, add_issuer, remove_issuer) and ASA creations with the
+   certificate unit name by a registered issuer (the minting account) are
+   recorded; certificate metadata is taken from
+   the issue call's note when it matches the pointer stored in the box
+3. Certificates, issuers, revocations and certificate assets live in
+   indexed tables; each block is applied in one SQLite transaction
+   together with the checkpoint round, so a restart resumes exactly
+   where it stopped
+4. With no checkpoint yet, the index is bootstrapped from the app's boxes
+   (the contract's current state) and then follows blocks from there
+
+Every write is an upsert, so replaying a block is harmless.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import msgpack
+from algosdk import encoding
+
+from services.algod_pool import AlgodPool, algod_pool
+from services.block_follower import BlockFollower, block_follower
+from services.certificate_record import (
+    CERT_PREFIX,
+    FLAG_ACTIVE,
+    FLAG_AI_VERIFIED,
+    FLAG_MANUAL_VERIFIED,
+    ISSUER_PREFIX,
+    decode_certificate_record,
+    decode_issuer_record,
+    metadata_pointer,
+    multihash_to_cid,
+    unified_deployment,
+)
+from services.unified_certificate_client import CONTRACT
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "data",
+    "chain_index.sqlite3"
+)
+
+CONTRACTS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "contracts",
+    "deployed_contracts.json"
+)
+
+# Unit name of certificate NFTs created by the minting service
+CERTIFICATE_UNIT_NAME = "CERT"
+
+# Metadata keys holding the course name, in order of preference
+COURSE_KEYS = ("courseName", "course_name", "course")
+
+# Blocks published by the follower that are kept for the indexer loop
+RECENT_BLOCKS = 32
+
+# Box reads in flight during bootstrap
+BOOTSTRAP_CONCURRENCY = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS certificates (
+    cert_key TEXT PRIMARY KEY,
+    cert_id TEXT,
+    issuer TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    ipfs_hash TEXT NOT NULL,
+    course TEXT,
+    metadata TEXT,
+    asset_id INTEGER,
+    flags INTEGER NOT NULL,
+    active INTEGER NOT NULL,
+    issued_round INTEGER,
+    issued_at INTEGER,
+    txid TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_certificates_recipient ON certificates (recipient, issued_at);
+CREATE INDEX IF NOT EXISTS idx_certificates_issuer ON certificates (issuer, issued_at);
+CREATE INDEX IF NOT EXISTS idx_certificates_course ON certificates (course COLLATE NOCASE, issued_at);
+CREATE INDEX IF NOT EXISTS idx_certificates_asset ON certificates (asset_id);
+CREATE TABLE IF NOT EXISTS issuers (
+    address TEXT PRIMARY KEY,
+    name TEXT,
+    metadata TEXT,
+    authorized INTEGER NOT NULL,
+    registered_at INTEGER,
+    updated_round INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_issuers_authorized ON issuers (authorized);
+CREATE TABLE IF NOT EXISTS revocations (
+    cert_key TEXT PRIMARY KEY,
+    cert_id TEXT,
+    revoked_by TEXT,
+    revoked_round INTEGER,
+    revoked_at INTEGER,
+    txid TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_revocations_round ON revocations (revoked_round);
+CREATE TABLE IF NOT EXISTS certificate_assets (
+    asset_id INTEGER PRIMARY KEY,
+    creator TEXT NOT NULL,
+    asset_name TEXT,
+    unit_name TEXT,
+    url TEXT,
+    created_round INTEGER,
+    txid TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_certificate_assets_creator ON certificate_assets (creator);
+"""
+
+# Method selector -> ABI method of the unified contract
+METHODS_BY_SELECTOR = {method.get_selector(): method for method in CONTRACT.methods}
+
+
+def _canonical(value: Any) -> Any:
+    """Sort map keys recursively (algod's canonical msgpack)"""
+    if isinstance(value, dict):
+        return {key: _canonical(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def transaction_id(txn: Dict, block_header: Dict, has_genesis_id: bool) -> str:
+    """Id of a transaction as stored in a block (genesis fields restored)"""
+    txn = dict(txn)
+    txn.setdefault("gh", block_header.get("gh"))
+    if has_genesis_id:
+        txn["gen"] = block_header.get("gen")
+    packed = msgpack.packb(_canonical(txn), use_bin_type=True)
+    digest = hashlib.new("sha512_256", b"TX" + packed).digest()
+    return base64.b32encode(digest).decode().rstrip("=")
+
+
+def decode_method_call(app_args: List[bytes]) -> Optional[Dict[str, Any]]:
+    """Method name and decoded arguments of an ARC-4 call, or None"""
+    if not app_args:
+        return None
+    method = METHODS_BY_SELECTOR.get(bytes(app_args[0]))
+    if method is None:
+        return None
+    args = {}
+    position = 1
+    for arg in method.args:
+        # Transaction arguments are group members, not app args
+        if isinstance(arg.type, str):
+            continue
+        value = arg.type.decode(bytes(app_args[position]))
+        if isinstance(value, list):
+            value = bytes(value)
+        args[arg.name] = value
+        position += 1
+    return {"method": method.name, "args": args}
+
+
+def course_of(metadata: str) -> Optional[str]:
+    try:
+        fields = json.loads(metadata)
+    except ValueError:
+        return None
+    if not isinstance(fields, dict):
+        return None
+    for key in COURSE_KEYS:
+        if isinstance(fields.get(key), str) and fields[key]:
+            return fields[key]
+    return None
+
+
+def _load_app_id() -> int:
+    try:
+        with open(CONTRACTS_FILE, "r") as f:
+            contracts = json.load(f)
+        app_id, reason = unified_deployment(contracts)
+        if reason and contracts.get("unified_certificate_app_id"):
+            print(f"Warning: chain indexer disabled: {reason}")
+        return app_id
+    except Exception as e:
+        print(f"Warning: chain indexer could not load contract addresses: {e}")
+        return 0
+
+
+class ChainIndexer:
+    """Follows the chain into a local SQLite index of certificates"""
+
+    def __init__(
+        self,
+        app_id: Optional[int] = None,
+        db_path: Optional[str] = None,
+        pool: Optional[AlgodPool] = None,
+        follower: Optional[BlockFollower] = None
+    ):
+        self.app_id = app_id if app_id is not None else _load_app_id()
+        self.db_path = db_path or os.getenv("CHAIN_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self.pool = pool or algod_pool
+        self.follower = follower or block_follower
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[int, Dict]" = OrderedDict()
+        self._new_block = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.tip: Optional[int] = None
+        # Last round written to the index (mirrors the stored checkpoint)
+        self.indexed_round: Optional[int] = None
+        self.follower.subscribe(self._on_block)
+
+    # ==================== STORAGE ====================
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            # An index built for another app is useless; start over
+            row = conn.execute("SELECT value FROM meta WHERE key = 'app_id'").fetchone()
+            if row is not None and int(row["value"]) != self.app_id:
+                with conn:
+                    for table in ("meta", "certificates", "issuers", "revocations", "certificate_assets"):
+                        conn.execute(f"DELETE FROM {table}")
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('app_id', ?)",
+                    (str(self.app_id),)
+                )
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        with self._lock:
+            return [dict(row) for row in self._connection().execute(sql, tuple(params))]
+
+    @property
+    def checkpoint(self) -> Optional[int]:
+        rows = self._query("SELECT value FROM meta WHERE key = 'round'")
+        self.indexed_round = int(rows[0]["value"]) if rows else None
+        return self.indexed_round
+
+    def _set_checkpoint(self, conn: sqlite3.Connection, round_number: int) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('round', ?)",
+            (str(round_number),)
+        )
+
+    # ==================== WRITES ====================
+
+    def _upsert_certificate(self, conn: sqlite3.Connection, row: Dict) -> None:
+        conn.execute(
+            """
+            INSERT INTO certificates (
+                cert_key, cert_id, issuer, recipient, ipfs_hash, course, metadata,
+                asset_id, flags, active, issued_round, issued_at, txid
+            ) VALUES (
+                :cert_key, :cert_id, :issuer, :recipient, :ipfs_hash, :course, :metadata,
+                :asset_id, :flags, :active, :issued_round, :issued_at, :txid
+            )
+            ON CONFLICT (cert_key) DO UPDATE SET
+                cert_id = COALESCE(excluded.cert_id, certificates.cert_id),
+                issuer = excluded.issuer,
+                recipient = excluded.recipient,
+                ipfs_hash = excluded.ipfs_hash,
+                course = COALESCE(excluded.course, certificates.course),
+                metadata = COALESCE(excluded.metadata, certificates.metadata),
+                asset_id = excluded.asset_id,
+                flags = excluded.flags,
+                -- A replayed issue never resurrects a revoked certificate
+                active = CASE
+                    WHEN EXISTS (SELECT 1 FROM revocations WHERE revocations.cert_key = excluded.cert_key) THEN 0
+                    ELSE excluded.active
+                END,
+                issued_round = COALESCE(excluded.issued_round, certificates.issued_round),
+                issued_at = excluded.issued_at,
+                txid = COALESCE(excluded.txid, certificates.txid)
+            """,
+            row
+        )
+
+    def _upsert_issuer(self, conn: sqlite3.Connection, row: Dict) -> None:
+        conn.execute(
+            """
+            INSERT INTO issuers (address, name, metadata, authorized, registered_at, updated_round)
+            VALUES (:address, :name, :metadata, :authorized, :registered_at, :updated_round)
+            ON CONFLICT (address) DO UPDATE SET
+                name = COALESCE(excluded.name, issuers.name),
+                metadata = COALESCE(excluded.metadata, issuers.metadata),
+                authorized = excluded.authorized,
+                registered_at = COALESCE(excluded.registered_at, issuers.registered_at),
+                updated_round = excluded.updated_round
+            """,
+            row
+        )
+
+    def _revoke(self, conn: sqlite3.Connection, row: Dict) -> None:
+        conn.execute(
+            """
+            INSERT INTO revocations (cert_key, cert_id, revoked_by, revoked_round, revoked_at, txid)
+            VALUES (:cert_key, :cert_id, :revoked_by, :revoked_round, :revoked_at, :txid)
+            ON CONFLICT (cert_key) DO UPDATE SET
+                cert_id = COALESCE(excluded.cert_id, revocations.cert_id),
+                revoked_by = COALESCE(excluded.revoked_by, revocations.revoked_by),
+                revoked_round = COALESCE(excluded.revoked_round, revocations.revoked_round),
+                revoked_at = COALESCE(excluded.revoked_at, revocations.revoked_at),
+                txid = COALESCE(excluded.txid, revocations.txid)
+            """,
+            row
+        )
+        conn.execute(
+            "UPDATE certificates SET active = 0, flags = flags & ~? WHERE cert_key = ?",
+            (FLAG_ACTIVE, row["cert_key"])
+        )
+
+    def _apply_app_call(self, conn: sqlite3.Connection, txn: Dict, txid: str, round_number: int, timestamp: int) -> None:
+        call = decode_method_call(txn.get("apaa") or [])
+        if call is None:
+            return
+        method, args = call["method"], call["args"]
+        sender = encoding.encode_address(bytes(txn["snd"]))
+
+        if method == "issue":
+            # The box only points at the metadata; trust a note that matches the pointer
+            note = bytes(txn.get("note") or b"")
+            metadata = None
+            if note and metadata_pointer(note) == args["metadata_pointer"]:
+                metadata = note.decode("utf-8", errors="replace")
+            self._upsert_certificate(conn, {
+                "cert_key": hashlib.sha256(args["cert_id"].encode()).hexdigest(),
+                "cert_id": args["cert_id"],
+                "issuer": sender,
+                "recipient": args["recipient"],
+                "ipfs_hash": multihash_to_cid(args["cid"]),
+                "course": course_of(metadata) if metadata else None,
+                "metadata": metadata,
+                "asset_id": args["nft_asset_id"] or None,
+                # The contract only records fully verified certificates
+                "flags": FLAG_ACTIVE | FLAG_AI_VERIFIED | FLAG_MANUAL_VERIFIED,
+                "active": 1,
+                "issued_round": round_number,
+                "issued_at": timestamp,
+                "txid": txid,
+            })
+        elif method == "revoke":
+            self._revoke(conn, {
+                "cert_key": hashlib.sha256(args["cert_id"].encode()).hexdigest(),
+                "cert_id": args["cert_id"],
+                "revoked_by": sender,
+                "revoked_round": round_number,
+                "revoked_at": timestamp,
+                "txid": txid,
+            })
+        elif method == "add_issuer":
+            self._upsert_issuer(conn, {
+                "address": args["issuer"],
+                "name": args["name"],
+                "metadata": args["metadata"],
+                "authorized": 1,
+                "registered_at": timestamp,
+                "updated_round": round_number,
+            })
+        elif method == "remove_issuer":
+            self._upsert_issuer(conn, {
+                "address": args["issuer"],
+                "name": None,
+                "metadata": None,
+                "authorized": 0,
+                "registered_at": None,
+                "updated_round": round_number,
+            })
+
+    def _apply_asset_creation(self, conn: sqlite3.Connection, stxn: Dict, txid: str, round_number: int) -> None:
+        params = stxn["txn"].get("apar") or {}
+        if params.get("un") != CERTIFICATE_UNIT_NAME or not stxn.get("caid"):
+            return
+        # Anyone can create a "CERT" asset; only keep those minted by an issuer we index
+        creator = encoding.encode_address(bytes(stxn["txn"]["snd"]))
+        if conn.execute("SELECT 1 FROM issuers WHERE address = ?", (creator,)).fetchone() is None:
+            return
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO certificate_assets
+                (asset_id, creator, asset_name, unit_name, url, created_round, txid)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                stxn["caid"],
+                creator,
+                params.get("an"),
+                params.get("un"),
+                params.get("au"),
+                round_number,
+                txid,
+            )
+        )
+
+    def _apply_transactions(self, conn: sqlite3.Connection, signed_txns: Iterable[Dict], header: Dict, round_number: int) -> None:
+        for stxn in signed_txns:
+            txn = stxn.get("txn", {})
+            txn_type = txn.get("type")
+            if txn_type == "appl" and txn.get("apid") == self.app_id:
+                txid = transaction_id(txn, header, bool(stxn.get("hgi")))
+                self._apply_app_call(conn, txn, txid, round_number, header.get("ts", 0))
+            elif txn_type == "acfg" and not txn.get("caid"):
+                txid = transaction_id(txn, header, bool(stxn.get("hgi")))
+                self._apply_asset_creation(conn, stxn, txid, round_number)
+            # Calls made by other apps
+            inner = (stxn.get("dt") or {}).get("itx")
+            if inner:
+                self._apply_transactions(conn, inner, header, round_number)
+
+    def apply_block(self, round_number: int, block: Dict) -> None:
+        """Index one decoded block and advance the checkpoint to its round"""
+        header = block.get("block", {})
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                self._apply_transactions(conn, header.get("txns") or (), header, round_number)
+                self._set_checkpoint(conn, round_number)
+            self.indexed_round = round_number
+
+    # ==================== BOOTSTRAP ====================
+
+    async def _bootstrap(self) -> int:
+        """Index the app's current boxes; returns the round they were read at"""
+        status = await self.pool.call("status")
+        start_round = status["last-round"]
+        response = await self.pool.call("application_boxes", self.app_id, 0)
+        names = [base64.b64decode(box["name"]) for box in response.get("boxes", [])]
+        names = [name for name in names if name[:1] in (CERT_PREFIX, ISSUER_PREFIX)]
+
+        semaphore = asyncio.Semaphore(BOOTSTRAP_CONCURRENCY)
+
+        async def read(name: bytes):
+            async with semaphore:
+                box = await self.pool.call("application_box_by_name", self.app_id, name)
+                return name, base64.b64decode(box["value"])
+
+        values = await asyncio.gather(*(read(name) for name in names))
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for name, value in values:
+                    if name[:1] == CERT_PREFIX:
+                        self._bootstrap_certificate(conn, name[1:].hex(), value)
+                    else:
+                        record = decode_issuer_record(value)
+                        if record is None:
+                            continue
+                        self._upsert_issuer(conn, {
+                            "address": encoding.encode_address(name[1:]),
+                            "name": record["name"],
+                            "metadata": record["metadata"],
+                            "authorized": int(record["authorized"]),
+                            "registered_at": record["registered_at"],
+                            "updated_round": start_round,
+                        })
+                self._set_checkpoint(conn, start_round)
+            self.indexed_round = start_round
+        print(f"Chain indexer bootstrapped {len(values)} boxes at round {start_round}")
+        return start_round
+
+    def _bootstrap_certificate(self, conn: sqlite3.Connection, key_hex: str, value: bytes) -> None:
+        # Boxes hold the certificate key only; the id is learned from later calls
+        record = decode_certificate_record(value).to_dict()
+        flags = (
+            (FLAG_ACTIVE if record["active"] else 0)
+            | (FLAG_AI_VERIFIED if record["ai_verified"] else 0)
+            | (FLAG_MANUAL_VERIFIED if record["manual_verified"] else 0)
+        )
+        self._upsert_certificate(conn, {
+            "cert_key": key_hex,
+            "cert_id": None,
+            "issuer": record["issuer"],
+            "recipient": record["recipient"],
+            "ipfs_hash": record["ipfs_hash"],
+            # Boxes only hold a metadata pointer; the issue call fills these in
+            "course": None,
+            "metadata": None,
+            "asset_id": record["asset_id"] or None,
+            "flags": flags,
+            "active": int(record["active"]),
+            "issued_round": None,
+            "issued_at": record["timestamp"],
+            "txid": None,
+        })
+        if not record["active"]:
+            self._revoke(conn, {
+                "cert_key": key_hex,
+                "cert_id": None,
+                "revoked_by": None,
+                "revoked_round": None,
+                "revoked_at": None,
+                "txid": None,
+            })
+
+    # ==================== FOLLOWING ====================
+
+    def _on_block(self, round_number: int, block: Optional[Dict], touched) -> None:
+        self.tip = round_number
+        if block is not None:
+            self._recent[round_number] = block
+            while len(self._recent) > RECENT_BLOCKS:
+                self._recent.popitem(last=False)
+        self._new_block.set()
+
+    def start(self) -> None:
+        if not self.app_id:
+            print("Warning: chain indexer disabled, no unified contract app id")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _fetch_block(self, round_number: int) -> Dict:
+        block = self._recent.pop(round_number, None)
+        if block is None:
+            raw = await self.pool.call("block_info", round_number, response_format="msgpack")
+            block = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+        return block
+
+    async def _wait_for_tip(self, checkpoint: int) -> int:
+        if self.follower.running:
+            self._new_block.clear()
+            if self.tip is None or self.tip <= checkpoint:
+                await self._new_block.wait()
+            return self.tip
+        # No follower: long-poll algod directly
+        status = await self.pool.call("status_after_block", checkpoint)
+        return status["last-round"]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                checkpoint = await loop.run_in_executor(None, lambda: self.checkpoint)
+                if checkpoint is None:
+                    checkpoint = await self._bootstrap()
+
+                tip = await self._wait_for_tip(checkpoint)
+                while checkpoint < tip:
+                    next_round = checkpoint + 1
+                    block = await self._fetch_block(next_round)
+                    await loop.run_in_executor(None, self.apply_block, next_round, block)
+                    checkpoint = next_round
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: chain indexer error: {e}")
+                await asyncio.sleep(5)
+
+    # ==================== QUERIES ====================
+
+    def certificates_by_recipient(self, address: str, limit: int = 100, offset: int = 0) -> List[Dict]:
+        return self._query(
+            "SELECT * FROM certificates WHERE recipient = ? ORDER BY issued_at DESC LIMIT ? OFFSET ?",
+            (address, limit, offset)
+        )
+
+    def certificates_by_issuer(self, address: str, limit: int = 100, offset: int = 0) -> List[Dict]:
+        return self._query(
+            "SELECT * FROM certificates WHERE issuer = ? ORDER BY issued_at DESC LIMIT ? OFFSET ?",
+            (address, limit, offset)
+        )
+
+    def certificates_by_course(self, course: str, limit: int = 100, offset: int = 0) -> List[Dict]:
+        return self._query(
+            "SELECT * FROM certificates WHERE course = ? COLLATE NOCASE ORDER BY issued_at DESC LIMIT ? OFFSET ?",
+            (course, limit, offset)
+        )
+
+    def count_by_recipient(self, address: str) -> int:
+        return self._query(
+            "SELECT COUNT(*) AS total FROM certificates WHERE recipient = ?", (address,)
+        )[0]["total"]
+
+    def count_by_issuer(self, address: str) -> int:
+        return self._query(
+            "SELECT COUNT(*) AS total FROM certificates WHERE issuer = ?", (address,)
+        )[0]["total"]
+
+    def count_by_course(self, course: str) -> int:
+        return self._query(
+            "SELECT COUNT(*) AS total FROM certificates WHERE course = ? COLLATE NOCASE", (course,)
+        )[0]["total"]
+
+    def active_courses(self) -> List[Dict]:
+        """(recipient, course) of every active certificate with a known course"""
+        return self._query(
+            "SELECT recipient, course FROM certificates WHERE active = 1 AND course IS NOT NULL"
+        )
+
+    def get_certificate(self, cert_id: str) -> Optional[Dict]:
+        rows = self._query(
+            "SELECT * FROM certificates WHERE cert_key = ?",
+            (hashlib.sha256(cert_id.encode()).hexdigest(),)
+        )
+        return rows[0] if rows else None
+
+    def get_issuer(self, address: str) -> Optional[Dict]:
+        rows = self._query("SELECT * FROM issuers WHERE address = ?", (address,))
+        return rows[0] if rows else None
+
+    def revocations_since(self, round_number: int = 0, limit: int = 1000) -> List[Dict]:
+        return self._query(
+            "SELECT * FROM revocations WHERE COALESCE(revoked_round, 0) >= ? ORDER BY revoked_round LIMIT ?",
+            (round_number, limit)
+        )
+
+    def revocations_after(self, seq: int = 0, limit: int = 10000) -> List[Dict]:
+        """Revocations in insertion order; seq is the position to resume after"""
+        return self._query(
+            "SELECT rowid AS seq, cert_key, revoked_round FROM revocations WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (seq, limit)
+        )
+
+    def status(self) -> Dict:
+        counts = self._query(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM certificates) AS certificates,
+                (SELECT COUNT(*) FROM issuers) AS issuers,
+                (SELECT COUNT(*) FROM revocations) AS revocations,
+                (SELECT COUNT(*) FROM certificate_assets) AS certificate_assets
+            """
+        )[0]
+        return {
+            "app_id": self.app_id,
+            "running": self.running,
+            "checkpoint_round": self.checkpoint,
+            "tip_round": self.tip,
+            **counts,
+        }
+
+
+# Shared indexer, started with the app
+chain_indexer = ChainIndexer()
@@ -0,0 +1,113 @@
+"""
+Targeted Chain Reads
+
+Reads exactly the state a route needs instead of a full account dump:
+1. Local state of one app: account_application_info(address, app_id)
+2. Global state (or one global key) of one app: application_info(app_id)
+3. A single box: application_box_by_name(app_id, name)
+4. Balance only: account_info(address, exclude="all")
+
+Account-scoped reads go through the round-aware account cache. The full
+account_info dump is only used as a fallback when a node does not serve
+the per-application endpoint.
+"""
+
+import base64
+from typing import Dict, List, Optional, Union
+
+from algosdk import error
+
+from services.account_cache import account_cache
+from services.algod_pool import algod_pool
+
+
+def decode_state(key_values: List[Dict], raw_bytes: bool = False) -> Dict[str, Union[int, str, bytes]]:
+    """
+    Turn algod's TEAL key-value list into a plain dict
+
+    Byte values are decoded as UTF-8 when possible and otherwise kept as
+    base64 (or as raw bytes with raw_bytes=True).
+    """
+    state = {}
+    for kv in key_values or []:
+        key = base64.b64decode(kv["key"]).decode("utf-8", errors="replace")
+        value = kv["value"]
+        if value["type"] == 1:  # bytes
+            data = base64.b64decode(value.get("bytes", ""))
+            if raw_bytes:
+                state[key] = data
+            else:
+                try:
+                    state[key] = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    state[key] = value.get("bytes", "")
+        else:  # uint
+            state[key] = value.get("uint", 0)
+    return state
+
+
+async def read_local_state(address: str, app_id: int, raw_bytes: bool = False) -> Optional[Dict]:
+    """Decoded local state of app_id for address, or None if not opted in"""
+    try:
+        info = await account_cache.fetch("account_application_info", address, app_id)
+    except error.AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        if e.code not in (400, 405, 501):
+            raise
+        # Node without the per-application endpoint: fall back to the full dump
+        info = await account_cache.account_info(address)
+        for app in info.get("apps-local-state", []):
+            if app["id"] == app_id:
+                return decode_state(app.get("key-value", []), raw_bytes)
+        return None
+
+    local_state = info.get("app-local-state")
+    if local_state is None:
+        return None
+    return decode_state(local_state.get("key-value", []), raw_bytes)
+
+
+async def read_global_state(app_id: int, raw_bytes: bool = False) -> Optional[Dict]:
+    """Decoded global state of app_id, or None if the app does not exist"""
+    try:
+        info = await algod_pool.call("application_info", app_id)
+    except error.AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    return decode_state(info.get("params", {}).get("global-state", []), raw_bytes)
+
+
+async def read_global_value(app_id: int, key: bytes) -> Optional[Union[int, bytes]]:
+    """One global-state value (uint or raw bytes) by its raw key, or None if unset"""
+    try:
+        info = await algod_pool.call("application_info", app_id)
+    except error.AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    encoded_key = base64.b64encode(key).decode()
+    for kv in info.get("params", {}).get("global-state", []):
+        if kv["key"] == encoded_key:
+            value = kv["value"]
+            if value["type"] == 1:
+                return base64.b64decode(value.get("bytes", ""))
+            return value.get("uint", 0)
+    return None
+
+
+async def read_box(app_id: int, name: bytes) -> Optional[bytes]:
+    """Value of one box, or None if it does not exist"""
+    try:
+        box = await algod_pool.call("application_box_by_name", app_id, name)
+    except error.AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    return base64.b64decode(box["value"])
+
+
+async def read_balance(address: str) -> Dict:
+    """Account summary without assets, apps or local state (amount, round, ...)"""
+    return await account_cache.account_info(address, exclude="all")
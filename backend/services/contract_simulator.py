@@ -0,0 +1,241 @@
+"""
+Read-only Contract Calls via Simulate
+
+Runs the unified contract's read-only ARC-4 methods (verify,
+verify_holder, verify_batch_proof, ...) through algod's simulate
+endpoint, so answers come from the contract's own logic instead of
+state decoded in Python:
+1. Nothing is signed or submitted, so calls cost no fees
+2. Calls are packed into atomic groups of up to 16 (the group limit),
+   one simulate request per group, groups sent concurrently
+3. allow_unnamed_resources lets a method read boxes only known on chain
+   (e.g. the certificates listed in a holder's index)
+4. A call that fails is isolated and the rest of its group re-simulated,
+   so one bad item never fails the whole batch
+5. Suggested params are cached briefly, so a batch adds no extra round trip
+6. Calls whose cost grows with chain state (verify_holder walks the
+   holder's whole recipient index) get an extra opcode budget sized
+   from that state, per group
+"""
+
+import asyncio
+import base64
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from algosdk import error, transaction
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer, EmptySigner
+from algosdk.v2client.models import SimulateRequest
+
+from services.algod_pool import algod_pool
+from services.algorand_address import decode_address, is_valid_address
+from services.certificate_record import cert_box_name, cid_to_multihash, recipient_box_name
+from services.unified_certificate_client import READ_ONLY_METHODS, UnifiedCertificateClient
+
+# Atomic group limit
+MAX_GROUP_SIZE = AtomicTransactionComposer.MAX_GROUP_SIZE
+
+# Suggested params stay valid for ~1000 rounds; refresh well before that
+PARAMS_TTL_SECONDS = 60
+
+# Simulate requests in flight at once for one batch
+SIMULATE_MAX_CONCURRENCY = int(os.getenv("SIMULATE_MAX_CONCURRENCY", "4"))
+
+# Opcode budget each app call adds to its group's pool, and the most
+# simulate will add on top of it for one group
+APP_CALL_BUDGET = 700
+MAX_EXTRA_OPCODE_BUDGET = 320_000
+
+# verify_holder cost: fixed part plus one step per index slot scanned
+# (a miss scans them all). Measured ~73 + 62 per slot on the unified
+# contract with contracts/profile_contracts.py --engine jig; rounded up
+VERIFY_HOLDER_BASE_COST = 80
+VERIFY_HOLDER_SLOT_COST = 64
+
+# (return value, error); value is None when the call could not be evaluated
+CallResult = Tuple[Any, Optional[str]]
+
+
+class ContractSimulator:
+    """Batched read-only calls to one unified contract deployment"""
+
+    def __init__(self, client: UnifiedCertificateClient, sender: str, pool=algod_pool):
+        self.client = client
+        self.sender = sender
+        self.algod = pool
+        self._params: Optional[transaction.SuggestedParams] = None
+        self._params_at = 0.0
+        self._semaphore = asyncio.Semaphore(SIMULATE_MAX_CONCURRENCY)
+
+    async def suggested_params(self) -> transaction.SuggestedParams:
+        if self._params is None or time.monotonic() - self._params_at > PARAMS_TTL_SECONDS:
+            self._params = await self.algod.call("suggested_params")
+            self._params_at = time.monotonic()
+        return self._params
+
+    async def call(
+        self,
+        method_name: str,
+        args: Dict[str, Any],
+        boxes: Sequence[bytes] = (),
+        extra_opcode_budget: int = 0
+    ) -> CallResult:
+        """Simulate one read-only call"""
+        return (await self.call_many(method_name, [(args, boxes)], extra_opcode_budget))[0]
+
+    async def call_many(
+        self,
+        method_name: str,
+        calls: Sequence[Tuple[Dict[str, Any], Sequence[bytes]]],
+        extra_opcode_budget: int = 0,
+        costs: Optional[Sequence[int]] = None
+    ) -> List[CallResult]:
+        """
+        Simulate many calls of one read-only method
+
+        Each call is (method args, box names). Results come back in call
+        order; calls are grouped MAX_GROUP_SIZE at a time. costs, when
+        given, estimates each call's opcode cost; a group whose calls need
+        more than their pooled budget asks simulate for the difference.
+        """
+        if method_name not in READ_ONLY_METHODS:
+            raise ValueError(f"{method_name} is not a read-only method")
+        if not self.client.app_id or not self.sender:
+            return [(None, "Unified contract or simulate sender not configured")] * len(calls)
+
+        results: List[CallResult] = [(None, None)] * len(calls)
+
+        async def run_group(indexes: List[int]) -> None:
+            async with self._semaphore:
+                await self._simulate_group(method_name, calls, indexes, results, extra_opcode_budget, costs)
+
+        await asyncio.gather(*(
+            run_group(list(range(start, min(start + MAX_GROUP_SIZE, len(calls)))))
+            for start in range(0, len(calls), MAX_GROUP_SIZE)
+        ))
+        return results
+
+    async def _simulate_group(
+        self,
+        method_name: str,
+        calls: Sequence[Tuple[Dict[str, Any], Sequence[bytes]]],
+        indexes: List[int],
+        results: List[CallResult],
+        extra_opcode_budget: int,
+        costs: Optional[Sequence[int]]
+    ) -> None:
+        while indexes:
+            try:
+                params = await self.suggested_params()
+                atc = AtomicTransactionComposer()
+                add_call = getattr(self.client, method_name)
+                for position, index in enumerate(indexes):
+                    args, boxes = calls[index]
+                    # Distinct notes so identical calls still get distinct transaction ids
+                    add_call(
+                        atc, self.sender, EmptySigner(), params,
+                        **args, boxes=boxes, note=position.to_bytes(1, "big")
+                    )
+                request = SimulateRequest(
+                    txn_groups=[],
+                    allow_empty_signatures=True,
+                    allow_unnamed_resources=True,
+                    extra_opcode_budget=group_opcode_budget(indexes, extra_opcode_budget, costs)
+                )
+                response = await self.algod.run(atc.simulate, request)
+            except Exception as e:
+                for index in indexes:
+                    results[index] = (None, f"Simulate error: {str(e)}")
+                return
+
+            if not response.failure_message:
+                for position, index in enumerate(indexes):
+                    results[index] = (response.abi_results[position].return_value, None)
+                return
+
+            # Record the failing call, then retry the others without it
+            failed = (response.failed_at or [0])[0]
+            if not 0 <= failed < len(indexes):
+                failed = 0
+            results[indexes[failed]] = (None, f"Contract rejected call: {response.failure_message}")
+            indexes = indexes[:failed] + indexes[failed + 1:]
+
+    async def verify_certificates(self, items: Sequence[Tuple[str, str]]) -> List[CallResult]:
+        """verify(cert_id, cid) for each (certificate id, IPFS hash)"""
+        def build(cert_id: str, ipfs_hash: str):
+            return (
+                {"cert_id": cert_id, "cid": cid_to_multihash(ipfs_hash)},
+                [cert_box_name(cert_id)]
+            )
+        return await self._call_encoded("verify", items, build)
+
+    async def verify_holders(self, items: Sequence[Tuple[str, str]]) -> List[CallResult]:
+        """
+        verify_holder(holder, cid) for each (holder address, IPFS hash)
+
+        The contract walks the holder's recipient index, so each holder's
+        index length is read first and the call budgeted for all of it.
+        """
+        holders = list(dict.fromkeys(holder for holder, _ in items if is_valid_address(holder)))
+        lengths = dict(zip(holders, await asyncio.gather(
+            *(self.index_length(holder) for holder in holders),
+            return_exceptions=True
+        )))
+
+        def build(holder: str, ipfs_hash: str):
+            if not is_valid_address(holder):
+                raise ValueError("Invalid certificate holder address")
+            if isinstance(lengths[holder], Exception):
+                raise ValueError(f"Could not read the holder's certificate index: {lengths[holder]}")
+            return (
+                {"holder": holder, "cid": cid_to_multihash(ipfs_hash)},
+                [recipient_box_name(decode_address(holder))]
+            )
+
+        def cost(holder: str, ipfs_hash: str) -> int:
+            return VERIFY_HOLDER_BASE_COST + VERIFY_HOLDER_SLOT_COST * lengths[holder]
+
+        return await self._call_encoded("verify_holder", items, build, cost)
+
+    async def index_length(self, holder: str) -> int:
+        """Certificates in a holder's recipient index (count at the start of its first page)"""
+        try:
+            box = await self.algod.call(
+                "application_box_by_name", self.client.app_id, recipient_box_name(decode_address(holder))
+            )
+        except error.AlgodHTTPError as e:
+            if e.code == 404:
+                return 0
+            raise
+        return int.from_bytes(base64.b64decode(box["value"])[:8], "big")
+
+    async def _call_encoded(
+        self,
+        method_name: str,
+        items: Sequence[Tuple[str, str]],
+        build: Callable[[str, str], Tuple[Dict[str, Any], Sequence[bytes]]],
+        cost: Optional[Callable[[str, str], int]] = None
+    ) -> List[CallResult]:
+        """Encode each item's call; items that fail to encode are reported, not sent"""
+        results: List[CallResult] = [(None, None)] * len(items)
+        calls, costs, positions = [], [], []
+        for position, item in enumerate(items):
+            try:
+                calls.append(build(*item))
+                costs.append(cost(*item) if cost else 0)
+                positions.append(position)
+            except ValueError as e:
+                results[position] = (None, str(e))
+        outcomes = await self.call_many(method_name, calls, costs=costs if cost else None)
+        for position, result in zip(positions, outcomes):
+            results[position] = result
+        return results
+
+
+def group_opcode_budget(indexes: Sequence[int], extra_opcode_budget: int, costs: Optional[Sequence[int]]) -> int:
+    """Extra budget for one group: what its calls' estimated costs need beyond the pooled budget"""
+    if costs is not None:
+        needed = sum(costs[index] for index in indexes) - APP_CALL_BUDGET * len(indexes)
+        extra_opcode_budget = max(extra_opcode_budget, needed)
+    return min(extra_opcode_budget, MAX_EXTRA_OPCODE_BUDGET)
@@ -0,0 +1,221 @@
+"""
+Merkle Batch Anchoring
+
+Lets a cohort of certificates be anchored on chain with a single
+anchor_batch call instead of one issue call (and one box) per certificate:
+1. Leaves commit to cert id, recipient, CID multihash and metadata; the
+   130-byte leaf preimage is what the contract hashes on-chain
+2. MerkleTree builds the tree and O(log n) inclusion proofs
+3. Proofs encode to the contract's format (33 bytes per level), so the
+   same bytes verify off-chain here and on-chain in verify_batch_proof
+4. ProofStore keeps each certificate's proof on disk (one JSON file per
+   certificate plus one per batch)
+
+Hashing is domain separated (0x00 for leaves, 0x01 for nodes) and an
+unpaired node is promoted to the next level unchanged, so no leaf is ever
+duplicated and a proof can never be replayed one level up. The on-chain
+check takes the leaf preimage, not the leaf hash, and applies the leaf
+prefix itself, so the separation also holds there.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.certificate_record import cert_key
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+# Proof step: side byte + 32-byte sibling
+SIBLING_LEFT = 0
+SIBLING_RIGHT = 1
+PROOF_STEP_SIZE = 33
+
+# cert key (32) | recipient (32) | CID multihash (34) | metadata hash (32)
+LEAF_PREIMAGE_SIZE = 130
+
+DEFAULT_PROOF_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "data",
+    "merkle_proofs"
+)
+
+ProofStep = Tuple[int, bytes]
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def canonical_metadata(metadata: Dict) -> bytes:
+    """Byte form of certificate metadata that leaves commit to"""
+    return json.dumps(metadata, sort_keys=True, separators=(",", ":")).encode()
+
+
+def certificate_leaf_preimage(
+    cert_id: str,
+    recipient_public_key: bytes,
+    cid_multihash: bytes,
+    metadata: bytes
+) -> bytes:
+    """What a leaf hashes, and what the contract's verify_batch_proof takes"""
+    return (
+        cert_key(cert_id)
+        + recipient_public_key
+        + cid_multihash
+        + hashlib.sha256(metadata).digest()
+    )
+
+
+def certificate_leaf(
+    cert_id: str,
+    recipient_public_key: bytes,
+    cid_multihash: bytes,
+    metadata: bytes
+) -> bytes:
+    """Leaf hash binding a certificate's id, holder, content and metadata"""
+    return leaf_hash(certificate_leaf_preimage(cert_id, recipient_public_key, cid_multihash, metadata))
+
+
+class MerkleTree:
+    """Binary Merkle tree over precomputed leaf hashes"""
+
+    def __init__(self, leaves: Sequence[bytes]):
+        if not leaves:
+            raise ValueError("Merkle tree needs at least one leaf")
+        self.levels: List[List[bytes]] = [list(leaves)]
+        level = self.levels[0]
+        while len(level) > 1:
+            parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+            level = parents
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[ProofStep]:
+        """Sibling path from leaf `index` to the root"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Leaf index {index} out of range")
+        steps = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                side = SIBLING_LEFT if sibling < index else SIBLING_RIGHT
+                steps.append((side, level[sibling]))
+            index //= 2
+        return steps
+
+
+def verify_proof(leaf: bytes, proof: Sequence[ProofStep], root: bytes) -> bool:
+    """Recompute the root from a leaf and its proof"""
+    current = leaf
+    for side, sibling in proof:
+        if side == SIBLING_LEFT:
+            current = node_hash(sibling, current)
+        else:
+            current = node_hash(current, sibling)
+    return current == root
+
+
+def encode_proof(proof: Sequence[ProofStep]) -> bytes:
+    """Contract argument format: side byte + sibling, per level"""
+    return b"".join(bytes([side]) + sibling for side, sibling in proof)
+
+
+def decode_proof(data: bytes) -> List[ProofStep]:
+    if len(data) % PROOF_STEP_SIZE:
+        raise ValueError(f"Proof length must be a multiple of {PROOF_STEP_SIZE}")
+    view = memoryview(data)
+    steps = []
+    for offset in range(0, len(data), PROOF_STEP_SIZE):
+        side = view[offset]
+        if side not in (SIBLING_LEFT, SIBLING_RIGHT):
+            raise ValueError(f"Invalid proof side byte: {side}")
+        steps.append((side, bytes(view[offset + 1:offset + PROOF_STEP_SIZE])))
+    return steps
+
+
+class ProofStore:
+    """On-disk inclusion proofs, one JSON file per certificate and per batch"""
+
+    def __init__(self, proof_dir: Optional[str] = None):
+        self.proof_dir = proof_dir or os.getenv("MERKLE_PROOF_DIR", DEFAULT_PROOF_DIR)
+        self._lock = threading.Lock()
+
+    def _cert_path(self, cert_id: str) -> str:
+        digest = cert_key(cert_id).hex()
+        return os.path.join(self.proof_dir, "certs", digest[:2], f"{digest}.json")
+
+    def _batch_path(self, root_hex: str) -> str:
+        return os.path.join(self.proof_dir, "batches", f"{root_hex}.json")
+
+    def _write(self, path: str, entry: Dict) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        # Atomic so concurrent readers never see a partial file
+        os.replace(tmp_path, path)
+
+    def _read(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_batch(
+        self,
+        tree: MerkleTree,
+        cert_ids: Sequence[str],
+        leaf_preimages: Sequence[bytes],
+        issuer_address: str,
+        transaction_id: Optional[str]
+    ) -> Dict:
+        """Persist the batch summary and every certificate's proof (leaf i hashes preimage i)"""
+        root_hex = tree.root.hex()
+        with self._lock:
+            for index, cert_id in enumerate(cert_ids):
+                self._write(self._cert_path(cert_id), {
+                    "cert_id": cert_id,
+                    "merkle_root": root_hex,
+                    "leaf_index": index,
+                    "leaf": tree.levels[0][index].hex(),
+                    "leaf_preimage": leaf_preimages[index].hex(),
+                    "proof": encode_proof(tree.proof(index)).hex(),
+                    "issuer_address": issuer_address,
+                    "transaction_id": transaction_id,
+                })
+            batch = {
+                "merkle_root": root_hex,
+                "leaf_count": len(tree),
+                "cert_ids": list(cert_ids),
+                "issuer_address": issuer_address,
+                "transaction_id": transaction_id,
+            }
+            self._write(self._batch_path(root_hex), batch)
+        return batch
+
+    def get(self, cert_id: str) -> Optional[Dict]:
+        return self._read(self._cert_path(cert_id))
+
+    def get_batch(self, root_hex: str) -> Optional[Dict]:
+        return self._read(self._batch_path(root_hex.lower()))
+
+
+# Shared proof store for the minting service and routes
+proof_store = ProofStore()
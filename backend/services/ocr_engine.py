@@ -0,0 +1,137 @@
+"""
+OCR Execution Engine
+
+Runs certificate OCR off the event loop:
+1. PDF pages are rendered and OCR'd inside a bounded process pool
+   (tesseract is CPU-bound, so threads would serialize on the GIL)
+2. Each worker renders only the page it was given, so no process holds
+   the whole document in memory
+3. Results are reassembled in page order
+4. Streaming mode yields pages one at a time with a bounded number in
+   flight, so memory stays flat in page count and callers can stop early
+5. Every page/image goes through the preprocessing stage (downscale,
+   grayscale, binarize, crop) inside the worker before tesseract
+"""
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional
+
+try:
+    import pytesseract
+    from PIL import Image
+    import pdf2image
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+from services.ocr_preprocess import PreprocessConfig, preprocess_image
+
+
+# ----- Worker functions (module level so they can be pickled) -----
+
+def _ocr_pdf_page(file_path: str, page_number: int, dpi: int, config: PreprocessConfig) -> str:
+    """Render a single PDF page, preprocess it and OCR it"""
+    images = pdf2image.convert_from_path(
+        file_path,
+        dpi=dpi,
+        first_page=page_number,
+        last_page=page_number
+    )
+    if not images:
+        return ""
+    return pytesseract.image_to_string(preprocess_image(images[0], config))
+
+
+def _ocr_image(file_path: str, config: PreprocessConfig) -> str:
+    """Preprocess and OCR an image file"""
+    with Image.open(file_path) as image:
+        return pytesseract.image_to_string(preprocess_image(image, config))
+
+
+def _pdf_page_count(file_path: str) -> int:
+    """Read the page count without rendering anything"""
+    return int(pdf2image.pdfinfo_from_path(file_path)["Pages"])
+
+
+class OCREngine:
+    """Parallel, page-order-preserving OCR backed by a process pool"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        dpi: int = 200,
+        preprocess: Optional[PreprocessConfig] = None
+    ):
+        self.max_workers = max_workers or int(
+            os.getenv("OCR_MAX_WORKERS", os.cpu_count() or 1)
+        )
+        self.dpi = dpi
+        self.preprocess = preprocess or PreprocessConfig.from_env()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created lazily so importing the service does not fork workers
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def fingerprint(self) -> str:
+        """Render DPI plus preprocessing settings: what OCR output depends on besides the file"""
+        return f"{self.dpi}dpi-{self.preprocess.fingerprint()}"
+
+    async def extract_pdf(self, file_path: str) -> str:
+        """OCR every page of a PDF in parallel, preserving page order"""
+        loop = asyncio.get_running_loop()
+        page_count = await loop.run_in_executor(None, _pdf_page_count, file_path)
+
+        pool = self._get_pool()
+        pages: List[str] = await asyncio.gather(*[
+            loop.run_in_executor(pool, _ocr_pdf_page, file_path, page, self.dpi, self.preprocess)
+            for page in range(1, page_count + 1)
+        ])
+        return "".join(pages)
+
+    async def iter_pdf_pages(self, file_path: str, window: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Yield OCR text page by page, in order.
+
+        At most `window` pages are rendered at once; pages that were
+        queued but not started are cancelled when the caller stops early.
+        """
+        loop = asyncio.get_running_loop()
+        page_count = await loop.run_in_executor(None, _pdf_page_count, file_path)
+
+        pool = self._get_pool()
+        window = window or self.max_workers
+        pending = deque()
+        next_page = 1
+        try:
+            while next_page <= page_count or pending:
+                while next_page <= page_count and len(pending) < window:
+                    pending.append(
+                        loop.run_in_executor(
+                            pool, _ocr_pdf_page, file_path, next_page, self.dpi, self.preprocess
+                        )
+                    )
+                    next_page += 1
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def extract_image(self, file_path: str) -> str:
+        """OCR a single image in the pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), _ocr_image, file_path, self.preprocess)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Singleton instance
+ocr_engine = OCREngine()
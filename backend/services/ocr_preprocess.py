@@ -0,0 +1,224 @@
+"""
+OCR Image Preprocessing
+
+Cleans up certificate images before tesseract sees them:
+1. Convert to grayscale
+2. Downscale to a target DPI (phone photos are often 12+ MP)
+3. Binarize with an Otsu threshold computed from the histogram
+4. Crop to the text area, found with a connected-components pass over a
+   small thumbnail so the cost does not depend on the photo size
+
+Every stage can be toggled and tuned through PreprocessConfig.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from typing import List, Optional, Tuple
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class PreprocessConfig:
+    """Tunable parameters for the preprocessing stage (picklable for OCR workers)"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        target_dpi: int = 300,
+        max_dimension: int = 3508,
+        grayscale: bool = True,
+        binarize: bool = True,
+        crop: bool = True,
+        crop_thumbnail: int = 160,
+        crop_margin: float = 0.02,
+        ink_threshold: int = 200,
+        min_component_pixels: int = 3
+    ):
+        self.enabled = enabled
+        # Images above this resolution are scaled down to it
+        self.target_dpi = target_dpi
+        # Longest side cap in pixels (A4 at 300 DPI)
+        self.max_dimension = max_dimension
+        self.grayscale = grayscale
+        self.binarize = binarize
+        self.crop = crop
+        # Longest side of the thumbnail used for the connected-components pass
+        self.crop_thumbnail = crop_thumbnail
+        # Margin kept around the detected text area, as a fraction of the size
+        self.crop_margin = crop_margin
+        # Thumbnail pixels darker than this count as ink (downsampling greys out thin strokes)
+        self.ink_threshold = ink_threshold
+        # Components smaller than this (in thumbnail pixels) are treated as noise
+        self.min_component_pixels = min_component_pixels
+
+    @classmethod
+    def from_env(cls) -> "PreprocessConfig":
+        return cls(
+            enabled=_env_flag("OCR_PREPROCESS", True),
+            target_dpi=int(os.getenv("OCR_TARGET_DPI", "300")),
+            max_dimension=int(os.getenv("OCR_MAX_DIMENSION", "3508")),
+            grayscale=_env_flag("OCR_GRAYSCALE", True),
+            binarize=_env_flag("OCR_BINARIZE", True),
+            crop=_env_flag("OCR_CROP", True),
+        )
+
+    def fingerprint(self) -> str:
+        """Short hash of every parameter (cached OCR output depends on all of them)"""
+        settings = json.dumps(vars(self), sort_keys=True)
+        return hashlib.sha256(settings.encode()).hexdigest()[:12]
+
+
+def downscale(image: "Image.Image", config: PreprocessConfig) -> "Image.Image":
+    """Shrink the image to the target DPI and size cap; never upscales"""
+    dpi = image.info.get("dpi")
+    source_dpi = float(dpi[0]) if dpi and dpi[0] else None
+
+    scale = 1.0
+    if source_dpi and source_dpi > config.target_dpi:
+        scale = config.target_dpi / source_dpi
+    # Phone photos often claim 72 DPI, so the size cap applies regardless
+    if max(image.size) * scale > config.max_dimension:
+        scale = config.max_dimension / max(image.size)
+    if scale >= 1.0:
+        return image
+
+    size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    # reducing_gap does a cheap integer reduce first, then LANCZOS on the rest
+    return image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+def otsu_threshold(histogram: List[int]) -> int:
+    """Threshold that best separates ink from paper in a 256-bin histogram"""
+    total = sum(histogram)
+    if total == 0:
+        return 127
+
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+    sum_background = 0.0
+    weight_background = 0
+    best_threshold, best_variance = 127, -1.0
+
+    for level, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+
+        sum_background += level * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_variance, best_threshold = variance, level
+
+    return best_threshold
+
+
+def binarize(image: "Image.Image") -> "Image.Image":
+    """Black text on white paper, using an Otsu threshold"""
+    threshold = otsu_threshold(image.histogram())
+    return image.point(lambda p: 255 if p > threshold else 0)
+
+
+def text_bounding_box(image: "Image.Image", config: PreprocessConfig) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Bounding box of the text area in a binarized grayscale image
+
+    Works on a thumbnail: dark pixels are grouped into 8-connected
+    components, specks below min_component_pixels are ignored as noise,
+    and components spanning almost the whole page (borders, frames) are
+    ignored too. Returns None when nothing text-like is found.
+    """
+    thumb = image.copy()
+    thumb.thumbnail((config.crop_thumbnail, config.crop_thumbnail))
+    width, height = thumb.size
+    pixels = thumb.load()
+
+    ink = [[pixels[x, y] < config.ink_threshold for x in range(width)] for y in range(height)]
+    seen = [[False] * width for _ in range(height)]
+    left, top, right, bottom = width, height, -1, -1
+
+    for y in range(height):
+        for x in range(width):
+            if not ink[y][x] or seen[y][x]:
+                continue
+
+            # Flood-fill one component
+            queue = deque([(x, y)])
+            seen[y][x] = True
+            size = 0
+            cx0, cy0, cx1, cy1 = x, y, x, y
+            while queue:
+                px, py = queue.popleft()
+                size += 1
+                cx0, cy0 = min(cx0, px), min(cy0, py)
+                cx1, cy1 = max(cx1, px), max(cy1, py)
+                for ny in (py - 1, py, py + 1):
+                    if ny < 0 or ny >= height:
+                        continue
+                    for nx in (px - 1, px, px + 1):
+                        if 0 <= nx < width and ink[ny][nx] and not seen[ny][nx]:
+                            seen[ny][nx] = True
+                            queue.append((nx, ny))
+
+            if size < config.min_component_pixels:
+                continue
+            if (cx1 - cx0) >= 0.9 * width and (cy1 - cy0) >= 0.9 * height:
+                continue
+
+            left, top = min(left, cx0), min(top, cy0)
+            right, bottom = max(right, cx1), max(bottom, cy1)
+
+    if right < 0:
+        return None
+
+    scale_x = image.width / width
+    scale_y = image.height / height
+    margin_x = int(image.width * config.crop_margin)
+    margin_y = int(image.height * config.crop_margin)
+    return (
+        max(0, int(left * scale_x) - margin_x),
+        max(0, int(top * scale_y) - margin_y),
+        min(image.width, int((right + 1) * scale_x) + margin_x),
+        min(image.height, int((bottom + 1) * scale_y) + margin_y),
+    )
+
+
+def _luminance(image: "Image.Image") -> "Image.Image":
+    return image if image.mode == "L" else image.convert("L")
+
+
+def preprocess_image(image: "Image.Image", config: Optional[PreprocessConfig] = None) -> "Image.Image":
+    """Run the configured preprocessing stages on a PIL image"""
+    config = config or PreprocessConfig()
+    if not config.enabled:
+        return image
+
+    # Grayscale first so the resize only has one channel to filter
+    if config.grayscale:
+        image = image.convert("L")
+    image = downscale(image, config)
+    if config.binarize:
+        # Otsu works on one channel, so a binarized image is grayscale either way
+        image = binarize(_luminance(image))
+    if config.crop:
+        # The box is found on a grayscale view; the crop keeps the image's mode
+        box = text_bounding_box(_luminance(image), config)
+        if box:
+            image = image.crop(box)
+    return image
@@ -5,6 +5,7 @@ PINATA_API_KEY = "ea4c8fdad5bc8f231e49"
 PINATA_SECRET_API_KEY = (
     "f24a66e6ea330adb4df4b6fd7c6b839e92e89cdd362260202b76f74762a0d386"
 )
+PINATA_GATEWAY = "https://gateway.pinata.cloud/ipfs"
 
 
 def upload_to_ipfs(data: dict) -> str:
@@ -25,3 +26,16 @@ def upload_to_ipfs(data: dict) -> str:
 
     ipfs_hash = response.json()["IpfsHash"]
     return ipfs_hash
+
+
+def fetch_from_ipfs(ipfs_hash: str, timeout: float = 10):
+    """Fetches pinned JSON content from the Pinata gateway.
+    Parameters:
+        - ipfs_hash (str): CID of the content.
+        - timeout (float): Seconds to wait for the gateway.
+    Returns:
+        - The decoded JSON content, or None if the gateway does not have it."""
+    response = requests.get(f"{PINATA_GATEWAY}/{ipfs_hash}", timeout=timeout)
+    if response.status_code != 200:
+        return None
+    return response.json()
@@ -0,0 +1,241 @@
+"""
+Revocation List
+
+Answers "is this certificate revoked?" from memory instead of the chain:
+1. Revocations come from the chain indexer (revoke calls to the unified
+   contract, plus inactive records found at bootstrap), read
+   incrementally by insertion sequence whenever the index advances
+2. A counting Bloom filter gives the common "not revoked" answer with no
+   set lookup at all; only filter hits are confirmed in the exact set
+3. The list exports as a compact, versioned snapshot (Bloom bits sized to
+   the current count + sorted 32-byte certificate keys) that offline
+   verifiers download once and query with RevocationSnapshot; the version
+   only moves when a revocation is added, and the round in the header is
+   the one the snapshot was complete at when built
+
+Snapshot layout (big-endian):
+    magic "SKRL" | format 1 | app id (8) | round (8) | count (4)
+    | bloom bits m (4) | hashes k (1) | bloom bitset ceil(m / 8)
+    | count x 32-byte sorted certificate keys
+"""
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Union
+
+from services.chain_indexer import ChainIndexer, chain_indexer
+
+SNAPSHOT_MAGIC = b"SKRL"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_HEADER = struct.Struct(">4sBQQIIB")
+KEY_SIZE = 32
+
+# In-memory filter sizing; grows (rebuilt from the exact set) when exceeded
+DEFAULT_CAPACITY = int(os.getenv("REVOCATION_CAPACITY", "100000"))
+DEFAULT_ERROR_RATE = 0.001
+
+# Counters saturate here and are never decremented again
+COUNTER_MAX = 255
+
+
+def _cert_key(cert_id_or_key: Union[str, bytes]) -> bytes:
+    """Certificate key (sha256 of the id); 32-byte keys pass through"""
+    if isinstance(cert_id_or_key, bytes) and len(cert_id_or_key) == KEY_SIZE:
+        return cert_id_or_key
+    if isinstance(cert_id_or_key, str):
+        cert_id_or_key = cert_id_or_key.encode()
+    return hashlib.sha256(cert_id_or_key).digest()
+
+
+def bloom_parameters(capacity: int, error_rate: float):
+    """(bits, hashes) for a Bloom filter of this capacity and false-positive rate"""
+    capacity = max(capacity, 1)
+    bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def bloom_positions(key: bytes, bits: int, hashes: int) -> List[int]:
+    """Double hashing over the (already uniform) sha256 certificate key"""
+    h1 = int.from_bytes(key[:8], "big")
+    h2 = int.from_bytes(key[8:16], "big") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+class CountingBloomFilter:
+    """Bloom filter with 8-bit counters, so entries can also be removed"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits, self.hashes = bloom_parameters(capacity, error_rate)
+        self.counters = bytearray(self.bits)
+
+    def add(self, key: bytes) -> None:
+        for position in bloom_positions(key, self.bits, self.hashes):
+            if self.counters[position] < COUNTER_MAX:
+                self.counters[position] += 1
+
+    def remove(self, key: bytes) -> None:
+        for position in bloom_positions(key, self.bits, self.hashes):
+            if 0 < self.counters[position] < COUNTER_MAX:
+                self.counters[position] -= 1
+
+    def might_contain(self, key: bytes) -> bool:
+        counters = self.counters
+        return all(counters[position] for position in bloom_positions(key, self.bits, self.hashes))
+
+
+class RevocationSnapshot:
+    """Read-only view of an exported snapshot (what offline verifiers use)"""
+
+    def __init__(self, data: bytes):
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError("Revocation snapshot too short")
+        magic, fmt, self.app_id, self.round, self.count, self.bits, self.hashes = (
+            SNAPSHOT_HEADER.unpack_from(data)
+        )
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a revocation snapshot")
+        if fmt != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported revocation snapshot format {fmt}")
+        bloom_length = (self.bits + 7) // 8
+        self._view = memoryview(data)
+        self._bloom = self._view[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + bloom_length]
+        self._keys = self._view[SNAPSHOT_HEADER.size + bloom_length:]
+        if len(self._keys) != self.count * KEY_SIZE:
+            raise ValueError("Revocation snapshot length does not match its count")
+
+    def _key(self, index: int) -> bytes:
+        return bytes(self._keys[index * KEY_SIZE:(index + 1) * KEY_SIZE])
+
+    def is_revoked(self, cert_id_or_key: Union[str, bytes]) -> bool:
+        key = _cert_key(cert_id_or_key)
+        bloom = self._bloom
+        for position in bloom_positions(key, self.bits, self.hashes):
+            if not bloom[position >> 3] & (0x80 >> (position & 7)):
+                return False
+        # Binary search the sorted keys
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self.count and self._key(low) == key
+
+
+class RevocationList:
+    """In-memory revocation set fed by the chain indexer"""
+
+    def __init__(
+        self,
+        indexer: Optional[ChainIndexer] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE
+    ):
+        self.indexer = indexer or chain_indexer
+        self.error_rate = error_rate
+        self.filter = CountingBloomFilter(capacity, error_rate)
+        self.revoked = set()
+        # Indexer position and round the list reflects
+        self._seq = 0
+        self.round: Optional[int] = None
+        self._snapshot: Optional[bytes] = None
+        self._lock = threading.Lock()
+        self.bloom_negatives = 0
+        self.exact_checks = 0
+
+    @property
+    def available(self) -> bool:
+        """True once the indexer is running and has a checkpoint to answer from"""
+        return self.indexer.running and self.indexer.indexed_round is not None
+
+    @property
+    def stale(self) -> bool:
+        return self.round is None or self.indexer.indexed_round != self.round
+
+    def refresh(self) -> None:
+        """Pull revocations the indexer wrote since the last refresh"""
+        # Without a running indexer the list would claim "nothing revoked"
+        if not self.available or not self.stale:
+            return
+        with self._lock:
+            indexed_round = self.indexer.indexed_round
+            while True:
+                rows = self.indexer.revocations_after(self._seq)
+                if not rows:
+                    break
+                for row in rows:
+                    self._add(bytes.fromhex(row["cert_key"]))
+                    self._seq = row["seq"]
+            self.round = indexed_round
+
+    def _add(self, key: bytes) -> None:
+        if key in self.revoked:
+            return
+        self.revoked.add(key)
+        self.filter.add(key)
+        self._snapshot = None
+        if len(self.revoked) > self.filter.capacity:
+            # Keep the false-positive rate: rebuild at twice the capacity
+            self.filter = CountingBloomFilter(self.filter.capacity * 2, self.error_rate)
+            for revoked_key in self.revoked:
+                self.filter.add(revoked_key)
+
+    def is_revoked(self, cert_id_or_key: Union[str, bytes]) -> bool:
+        """Memory-only check; call refresh() first to pick up new revocations"""
+        key = _cert_key(cert_id_or_key)
+        if not self.filter.might_contain(key):
+            self.bloom_negatives += 1
+            return False
+        self.exact_checks += 1
+        return key in self.revoked
+
+    def snapshot(self) -> bytes:
+        """Compact versioned export (cached until the list changes)"""
+        with self._lock:
+            if self._snapshot is None:
+                keys = sorted(self.revoked)
+                bits, hashes = bloom_parameters(len(keys), self.error_rate)
+                bloom = bytearray((bits + 7) // 8)
+                for key in keys:
+                    for position in bloom_positions(key, bits, hashes):
+                        bloom[position >> 3] |= 0x80 >> (position & 7)
+                self._snapshot = b"".join([
+                    SNAPSHOT_HEADER.pack(
+                        SNAPSHOT_MAGIC,
+                        SNAPSHOT_FORMAT,
+                        self.indexer.app_id,
+                        self.round or 0,
+                        len(keys),
+                        bits,
+                        hashes
+                    ),
+                    bytes(bloom),
+                    *keys,
+                ])
+            return self._snapshot
+
+    @property
+    def version(self) -> str:
+        """Changes only when a revocation is added (the snapshot is rebuilt then)"""
+        return f"{self.indexer.app_id}-{self._seq}"
+
+    def metrics(self) -> Dict:
+        return {
+            "round": self.round,
+            "revoked": len(self.revoked),
+            "filter_bits": self.filter.bits,
+            "filter_hashes": self.filter.hashes,
+            "bloom_negatives": self.bloom_negatives,
+            "exact_checks": self.exact_checks,
+        }
+
+
+# Shared revocation list for routes and services
+revocation_list = RevocationList()
@@ -0,0 +1,132 @@
+"""
+String Similarity
+
+Fuzzy matching for extracted certificate fields:
+1. Banded Damerau-Levenshtein (optimal string alignment) distance that
+   gives up as soon as the distance is guaranteed to exceed a bound
+2. Token-set normalization so reordered or repeated name parts
+   ("Doe, John" vs "John Doe") compare equal
+3. A threshold check that turns a similarity ratio into a distance
+   budget, so dissimilar strings are rejected after a few rows
+"""
+
+import math
+import re
+from typing import Optional
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def bounded_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Damerau-Levenshtein (OSA) distance between a and b, capped.
+
+    Only cells within `max_distance` of the diagonal are computed, and
+    the scan exits early once every cell in a row exceeds the bound.
+    Returns max_distance + 1 when the real distance is larger.
+    """
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+
+    len_a, len_b = len(a), len(b)
+    over = max_distance + 1
+    if len_b - len_a > max_distance:
+        return over
+    if len_a == 0:
+        return len_b
+
+    # Rows are indexed by position in b; cells outside the band stay at `over`
+    prev_prev = None
+    prev = [j if j <= max_distance else over for j in range(len_b + 1)]
+
+    for i in range(1, len_a + 1):
+        lo = max(1, i - max_distance)
+        hi = min(len_b, i + max_distance)
+
+        current = [over] * (len_b + 1)
+        current[0] = i if i <= max_distance else over
+        ca = a[i - 1]
+        row_min = current[0]
+
+        for j in range(lo, hi + 1):
+            cb = b[j - 1]
+            cost = 0 if ca == cb else 1
+            value = min(
+                prev[j] + 1,          # deletion
+                current[j - 1] + 1,   # insertion
+                prev[j - 1] + cost,   # substitution
+            )
+            # Transposition of two adjacent characters
+            if (
+                prev_prev is not None
+                and j > 1
+                and ca == b[j - 2]
+                and a[i - 2] == cb
+            ):
+                value = min(value, prev_prev[j - 2] + 1)
+
+            if value > over:
+                value = over
+            current[j] = value
+            if value < row_min:
+                row_min = value
+
+        if row_min > max_distance:
+            return over
+
+        prev_prev, prev = prev, current
+
+    return min(prev[len_b], over)
+
+
+def normalize_tokens(value: str) -> str:
+    """Lowercase, drop punctuation and sort the unique tokens"""
+    tokens = _NON_WORD.sub(" ", value.lower()).split()
+    return " ".join(sorted(set(tokens)))
+
+
+def similarity(a: str, b: str, min_ratio: Optional[float] = None) -> float:
+    """
+    Similarity ratio in [0, 1] based on edit distance.
+
+    With `min_ratio`, comparisons that cannot reach it stop early and
+    return 0.0.
+    """
+    max_len = max(len(a), len(b))
+    if max_len == 0:
+        return 1.0
+
+    if min_ratio is None:
+        budget = max_len
+    else:
+        # Largest distance whose ratio still reaches min_ratio; (1 - r) * n
+        # in floating point can land just under an integer and lose one edit
+        budget = max_len - math.ceil(min_ratio * max_len - 1e-9)
+
+    distance = bounded_distance(a, b, budget)
+    if distance > budget:
+        return 0.0
+    return 1.0 - distance / max_len
+
+
+def is_similar(str1: str, str2: str, threshold: float = 0.8) -> bool:
+    """Fuzzy equality for certificate fields (names, courses, issuers)"""
+    if str1 == str2:
+        return True
+
+    # Check if one is contained in the other
+    if str1 in str2 or str2 in str1:
+        return True
+
+    # Compare as token sets so word order and punctuation do not matter
+    norm1 = normalize_tokens(str1)
+    norm2 = normalize_tokens(str2)
+    if norm1 == norm2:
+        return True
+
+    return (
+        similarity(str1, str2, threshold) >= threshold
+        or similarity(norm1, norm2, threshold) >= threshold
+    )
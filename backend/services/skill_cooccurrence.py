@@ -0,0 +1,80 @@
+"""
+Skill Co-occurrence Signal
+
+Learns which skills actually appear together in issued certificates.
+Every certificate adds its skills to the holder's skill set, and the
+pair counts are updated incrementally, so scoring never has to recompute
+the matrix from the stored certificates. The counts are seeded once at
+startup from the certificates in the chain index.
+"""
+
+import threading
+from typing import Dict, Iterable, Set
+
+
+class SkillCooccurrence:
+    """Incrementally updated skill co-occurrence count matrix"""
+
+    def __init__(self):
+        # skill -> number of learners holding it
+        self.skill_counts: Dict[str, int] = {}
+        # skill -> {other_skill -> number of learners holding both}
+        self.pair_counts: Dict[str, Dict[str, int]] = {}
+        # learner id -> skills seen in their certificates
+        self.learner_skills: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, learner_id: str, skills: Iterable[str]) -> None:
+        """
+        Record the skills of a newly issued certificate.
+
+        Only the pairs introduced by the new skills are touched, so the
+        cost is O(new_skills * held_skills) regardless of history size.
+        """
+        new_skills = {s.strip().lower() for s in skills if s and s.strip()}
+
+        with self._lock:
+            held = self.learner_skills.setdefault(learner_id, set())
+            new_skills -= held
+            if not new_skills:
+                return
+
+            for skill in new_skills:
+                self.skill_counts[skill] = self.skill_counts.get(skill, 0) + 1
+
+            # Pair every new skill with everything already held and with
+            # each other new skill, in both directions.
+            for skill in new_skills:
+                row = self.pair_counts.setdefault(skill, {})
+                for other in held | new_skills:
+                    if other == skill:
+                        continue
+                    row[other] = row.get(other, 0) + 1
+                    if other in held:
+                        other_row = self.pair_counts.setdefault(other, {})
+                        other_row[skill] = other_row.get(skill, 0) + 1
+
+            held |= new_skills
+
+    def scores(self, have: Set[str]) -> Dict[str, float]:
+        """
+        Score candidate skills by P(candidate | skill) summed over the
+        skills the learner already has.
+        """
+        scores: Dict[str, float] = {}
+        # observe() mutates the rows in place; read them under the same lock
+        with self._lock:
+            for skill in have:
+                row = self.pair_counts.get(skill)
+                if not row:
+                    continue
+                total = self.skill_counts.get(skill, 0) or 1
+                for other, count in row.items():
+                    if other in have:
+                        continue
+                    scores[other] = scores.get(other, 0.0) + count / total
+        return scores
+
+
+# Singleton instance
+skill_cooccurrence = SkillCooccurrence()
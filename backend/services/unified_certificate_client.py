@@ -0,0 +1,544 @@
+"""
+Unified Certificate Contract Client
+
+GENERATED by contracts/generate_client.py from unified_certificate_abi.json.
+Do not edit by hand; change the contract and regenerate.
+
+Each method adds one ARC-4 call to an AtomicTransactionComposer:
+1. Arguments are encoded by the ABI types of the deployed contract
+2. Transaction arguments (pay) are placed in the group automatically
+3. Read-only methods (READ_ONLY_METHODS) can run through atc.simulate
+"""
+
+from typing import Optional, Sequence
+
+from algosdk import abi, transaction
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+
+ABI_JSON = r'''{
+  "name": "UnifiedCertificate",
+  "methods": [
+    {
+      "name": "verify",
+      "args": [
+        {
+          "type": "string",
+          "name": "cert_id"
+        },
+        {
+          "type": "byte[34]",
+          "name": "cid"
+        }
+      ],
+      "returns": {
+        "type": "bool"
+      },
+      "desc": "True if the certificate exists, is active and AI verified, and its IPFS multihash matches",
+      "readonly": true
+    },
+    {
+      "name": "verify_holder",
+      "args": [
+        {
+          "type": "address",
+          "name": "holder"
+        },
+        {
+          "type": "byte[34]",
+          "name": "cid"
+        }
+      ],
+      "returns": {
+        "type": "bool"
+      },
+      "desc": "True if any active, AI verified certificate held by the address has this IPFS multihash",
+      "readonly": true
+    },
+    {
+      "name": "get_info",
+      "args": [
+        {
+          "type": "string",
+          "name": "cert_id"
+        }
+      ],
+      "returns": {
+        "type": "byte[]"
+      },
+      "desc": "Raw packed certificate record (see box_layout.py)",
+      "readonly": true
+    },
+    {
+      "name": "verify_batch_proof",
+      "args": [
+        {
+          "type": "byte[32]",
+          "name": "root"
+        },
+        {
+          "type": "byte[130]",
+          "name": "leaf_preimage"
+        },
+        {
+          "type": "byte[]",
+          "name": "proof"
+        }
+      ],
+      "returns": {
+        "type": "bool"
+      },
+      "desc": "True if the leaf with this preimage is included under an anchored, active Merkle root",
+      "readonly": true
+    },
+    {
+      "name": "check_issuer",
+      "args": [
+        {
+          "type": "address",
+          "name": "issuer"
+        }
+      ],
+      "returns": {
+        "type": "bool"
+      },
+      "desc": "True if the address is an authorized issuer",
+      "readonly": true
+    },
+    {
+      "name": "issue",
+      "args": [
+        {
+          "type": "string",
+          "name": "cert_id"
+        },
+        {
+          "type": "byte[34]",
+          "name": "cid"
+        },
+        {
+          "type": "address",
+          "name": "recipient"
+        },
+        {
+          "type": "byte[]",
+          "name": "metadata_pointer"
+        },
+        {
+          "type": "bool",
+          "name": "ai_verified"
+        },
+        {
+          "type": "bool",
+          "name": "manual_verified"
+        },
+        {
+          "type": "uint64",
+          "name": "nft_asset_id"
+        },
+        {
+          "type": "pay",
+          "name": "mbr_payment"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Record a certificate with a pointer to its metadata (e.g. sha2-256 multihash); mbr_payment funds its boxes"
+    },
+    {
+      "name": "anchor_batch",
+      "args": [
+        {
+          "type": "byte[32]",
+          "name": "root"
+        },
+        {
+          "type": "uint64",
+          "name": "leaf_count"
+        },
+        {
+          "type": "pay",
+          "name": "mbr_payment"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Anchor the Merkle root of a cohort; mbr_payment funds the batch box"
+    },
+    {
+      "name": "revoke",
+      "args": [
+        {
+          "type": "string",
+          "name": "cert_id"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Mark a certificate inactive (original issuer or admin only)"
+    },
+    {
+      "name": "revoke_batch",
+      "args": [
+        {
+          "type": "byte[32]",
+          "name": "root"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Mark an anchored batch inactive (anchoring issuer or admin only)"
+    },
+    {
+      "name": "add_issuer",
+      "args": [
+        {
+          "type": "address",
+          "name": "issuer"
+        },
+        {
+          "type": "string",
+          "name": "name"
+        },
+        {
+          "type": "string",
+          "name": "metadata"
+        },
+        {
+          "type": "pay",
+          "name": "mbr_payment"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Authorize an issuer (admin only); mbr_payment funds the issuer box"
+    },
+    {
+      "name": "remove_issuer",
+      "args": [
+        {
+          "type": "address",
+          "name": "issuer"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Revoke an issuer's authorization (admin only, record kept for history)"
+    },
+    {
+      "name": "transfer_admin",
+      "args": [
+        {
+          "type": "address",
+          "name": "new_admin"
+        }
+      ],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Hand the admin role to another account"
+    },
+    {
+      "name": "toggle_ai",
+      "args": [],
+      "returns": {
+        "type": "void"
+      },
+      "desc": "Toggle the AI verification requirement"
+    }
+  ],
+  "networks": {},
+  "desc": "SkillDCX unified certificate registry with 3-layer verification"
+}'''
+
+CONTRACT = abi.Contract.from_json(ABI_JSON)
+
+READ_ONLY_METHODS = frozenset({"check_issuer", "get_info", "verify", "verify_batch_proof", "verify_holder"})
+
+
+class UnifiedCertificateClient:
+    """Typed ARC-4 calls to one deployment of the unified certificate contract"""
+
+    def __init__(self, app_id: int):
+        self.app_id = app_id
+
+    def _add_call(
+        self,
+        atc: AtomicTransactionComposer,
+        method_name: str,
+        method_args: list,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        boxes: Sequence[bytes],
+        note: Optional[bytes]
+    ) -> AtomicTransactionComposer:
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=CONTRACT.get_method_by_name(method_name),
+            sender=sender,
+            sp=sp,
+            signer=signer,
+            method_args=method_args,
+            boxes=[(self.app_id, name) for name in boxes],
+            note=note
+        )
+        return atc
+
+    def verify(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        cert_id: str,
+        cid: bytes,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        verify(string,byte[34])bool  [read-only]
+
+        True if the certificate exists, is active and AI verified, and its IPFS multihash matches
+        """
+        return self._add_call(atc, "verify", [cert_id, cid], sender, signer, sp, boxes, note)
+
+    def verify_holder(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        holder: str,
+        cid: bytes,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        verify_holder(address,byte[34])bool  [read-only]
+
+        True if any active, AI verified certificate held by the address has this IPFS multihash
+        """
+        return self._add_call(atc, "verify_holder", [holder, cid], sender, signer, sp, boxes, note)
+
+    def get_info(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        cert_id: str,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        get_info(string)byte[]  [read-only]
+
+        Raw packed certificate record (see box_layout.py)
+        """
+        return self._add_call(atc, "get_info", [cert_id], sender, signer, sp, boxes, note)
+
+    def verify_batch_proof(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        root: bytes,
+        leaf_preimage: bytes,
+        proof: bytes,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        verify_batch_proof(byte[32],byte[130],byte[])bool  [read-only]
+
+        True if the leaf with this preimage is included under an anchored, active Merkle root
+        """
+        return self._add_call(atc, "verify_batch_proof", [root, leaf_preimage, proof], sender, signer, sp, boxes, note)
+
+    def check_issuer(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        issuer: str,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        check_issuer(address)bool  [read-only]
+
+        True if the address is an authorized issuer
+        """
+        return self._add_call(atc, "check_issuer", [issuer], sender, signer, sp, boxes, note)
+
+    def issue(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        cert_id: str,
+        cid: bytes,
+        recipient: str,
+        metadata_pointer: bytes,
+        ai_verified: bool,
+        manual_verified: bool,
+        nft_asset_id: int,
+        mbr_payment: TransactionWithSigner,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        issue(string,byte[34],address,byte[],bool,bool,uint64,pay)void
+
+        Record a certificate with a pointer to its metadata (e.g. sha2-256 multihash); mbr_payment funds its boxes
+        """
+        return self._add_call(atc, "issue", [cert_id, cid, recipient, metadata_pointer, ai_verified, manual_verified, nft_asset_id, mbr_payment], sender, signer, sp, boxes, note)
+
+    def anchor_batch(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        root: bytes,
+        leaf_count: int,
+        mbr_payment: TransactionWithSigner,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        anchor_batch(byte[32],uint64,pay)void
+
+        Anchor the Merkle root of a cohort; mbr_payment funds the batch box
+        """
+        return self._add_call(atc, "anchor_batch", [root, leaf_count, mbr_payment], sender, signer, sp, boxes, note)
+
+    def revoke(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        cert_id: str,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        revoke(string)void
+
+        Mark a certificate inactive (original issuer or admin only)
+        """
+        return self._add_call(atc, "revoke", [cert_id], sender, signer, sp, boxes, note)
+
+    def revoke_batch(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        root: bytes,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        revoke_batch(byte[32])void
+
+        Mark an anchored batch inactive (anchoring issuer or admin only)
+        """
+        return self._add_call(atc, "revoke_batch", [root], sender, signer, sp, boxes, note)
+
+    def add_issuer(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        issuer: str,
+        name: str,
+        metadata: str,
+        mbr_payment: TransactionWithSigner,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        add_issuer(address,string,string,pay)void
+
+        Authorize an issuer (admin only); mbr_payment funds the issuer box
+        """
+        return self._add_call(atc, "add_issuer", [issuer, name, metadata, mbr_payment], sender, signer, sp, boxes, note)
+
+    def remove_issuer(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        issuer: str,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        remove_issuer(address)void
+
+        Revoke an issuer's authorization (admin only, record kept for history)
+        """
+        return self._add_call(atc, "remove_issuer", [issuer], sender, signer, sp, boxes, note)
+
+    def transfer_admin(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        new_admin: str,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        transfer_admin(address)void
+
+        Hand the admin role to another account
+        """
+        return self._add_call(atc, "transfer_admin", [new_admin], sender, signer, sp, boxes, note)
+
+    def toggle_ai(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        toggle_ai()void
+
+        Toggle the AI verification requirement
+        """
+        return self._add_call(atc, "toggle_ai", [], sender, signer, sp, boxes, note)
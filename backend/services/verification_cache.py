@@ -0,0 +1,106 @@
+"""
+Verification Result Cache
+
+Caches the expensive part of certificate verification (OCR text and
+parsed fields), keyed on the file's SHA-256 within a version namespace
+(verifier version plus OCR settings):
+1. In-memory LRU tier for hot files
+2. On-disk tier (one JSON file per entry) that survives restarts
+
+Entries live under a per-version directory, so bumping VERIFIER_VERSION
+or changing the OCR settings never serves results of another pipeline.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    ".cache",
+    "verification"
+)
+
+
+def file_sha256(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Hash a file in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VerificationCache:
+    """Two-tier (memory LRU + disk) cache of OCR text and parsed fields"""
+
+    def __init__(self, version: str, cache_dir: Optional[str] = None, max_entries: int = 1024):
+        self.version = version
+        self.cache_dir = cache_dir or os.getenv("VERIFICATION_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, self.version, digest[:2], f"{digest}.json")
+
+    def _remember(self, digest: str, entry: Dict) -> None:
+        with self._lock:
+            self._memory[digest] = entry
+            self._memory.move_to_end(digest)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Return {'text', 'fields'} for a digest, or None on a miss"""
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+                return entry
+
+        try:
+            with open(self._entry_path(digest), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        self._remember(digest, entry)
+        return entry
+
+    def put(self, digest: str, text: str, fields: Dict) -> None:
+        """Store an entry in both tiers"""
+        entry = {"text": text, "fields": fields}
+        self._remember(digest, entry)
+
+        path = self._entry_path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            # Atomic so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write verification cache entry: {e}")
+
+    def lookup(self, file_path: str, digest: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict]]:
+        """Hash a file (unless already hashed) and look it up; returns (digest, entry)"""
+        if digest is None:
+            try:
+                digest = file_sha256(file_path)
+            except OSError:
+                return None, None
+        return digest, self.get(digest)
+
+    def purge_stale_versions(self) -> None:
+        """Delete on-disk entries written by other verifier versions"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name != self.version:
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
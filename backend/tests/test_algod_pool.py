@@ -0,0 +1,68 @@
+"""
+Tests for services/algod_pool.py submissions
+
+A transient error while sending must not resend a transaction a node
+already accepted.
+"""
+
+import pytest
+from algosdk import account, error, transaction
+
+from services.algod_pool import AlgodPool, TransientAlgodError
+
+
+class FlakyNode:
+    """Accepts every send, but reports a transient error for the first few"""
+
+    def __init__(self, failures: int, accepted_on_failure: bool):
+        self.failures = failures
+        self.accepted_on_failure = accepted_on_failure
+        self.sends = 0
+        self.pool = set()
+
+    def send_transactions(self, signed_txns):
+        self.sends += 1
+        if self.failures:
+            self.failures -= 1
+            if self.accepted_on_failure:
+                self.pool.add(signed_txns[0].get_txid())
+            raise TransientAlgodError("503: timeout after accept")
+        self.pool.add(signed_txns[0].get_txid())
+        return signed_txns[0].get_txid()
+
+    def pending_transaction_info(self, tx_id):
+        if tx_id not in self.pool:
+            raise error.AlgodHTTPError("txn not found", 404)
+        return {"pool-error": "", "confirmed-round": 0}
+
+
+def make_pool(node: FlakyNode) -> AlgodPool:
+    pool = AlgodPool([("http://localhost:4001", "")], backoff_base=0.0)
+    pool.endpoints[0].client = node
+    return pool
+
+
+def signed_payment():
+    private_key, address = account.generate_account()
+    params = transaction.SuggestedParams(1000, 1, 1000, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", flat_fee=True)
+    return transaction.PaymentTxn(address, params, address, 0).sign(private_key)
+
+
+def test_submit_does_not_resend_an_accepted_transaction():
+    node = FlakyNode(failures=1, accepted_on_failure=True)
+    stxn = signed_payment()
+    assert make_pool(node).submit_sync(stxn) == [stxn.get_txid()]
+    assert node.sends == 1
+
+
+def test_submit_resends_when_no_node_has_the_transaction():
+    node = FlakyNode(failures=1, accepted_on_failure=False)
+    stxn = signed_payment()
+    assert make_pool(node).submit_sync(stxn) == [stxn.get_txid()]
+    assert node.sends == 2
+
+
+def test_call_refuses_submit_methods():
+    pool = make_pool(FlakyNode(failures=0, accepted_on_failure=False))
+    with pytest.raises(ValueError):
+        pool.call_sync("send_transaction", signed_payment())
@@ -0,0 +1,82 @@
+"""
+Tests for services/certificate_minting_service.py account cache upkeep
+
+The block follower that invalidates cached account state is opt-in, so
+the minting service drops the state its own confirmed calls changed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from algosdk import account, logic, transaction
+
+from services import certificate_minting_service
+from services.account_cache import AccountCache
+from services.certificate_minting_service import CertificateMintingService
+from services.unified_certificate_client import UnifiedCertificateClient
+
+APP_ID = 1001
+
+
+class ConfirmingNode:
+    """Confirms every group and counts account reads"""
+
+    def __init__(self):
+        self.account_reads = 0
+
+    async def call(self, method, *args, **kwargs):
+        if method == "suggested_params":
+            return transaction.SuggestedParams(1000, 1, 1000, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", flat_fee=True)
+        self.account_reads += 1
+        return {"round": 1, "amount": self.account_reads}
+
+    async def execute(self, atc, wait_rounds):
+        return SimpleNamespace(tx_ids=[txn.txn.get_txid() for txn in atc.build_group()])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    node = ConfirmingNode()
+    cache = AccountCache(pool=node)
+    monkeypatch.setattr(certificate_minting_service, "account_cache", cache)
+    minting = CertificateMintingService()
+    minting.algod = node
+    minting.unified_app_id = APP_ID
+    minting.contract = UnifiedCertificateClient(APP_ID)
+    return minting, cache, node
+
+
+def test_confirmed_anchor_invalidates_issuer_and_app_state(service):
+    minting, cache, node = service
+    issuer_key, issuer = account.generate_account()
+    app_address = logic.get_application_address(APP_ID)
+
+    async def scenario():
+        for address in (issuer, app_address):
+            await cache.account_info(address)
+        assert (await minting.anchor_batch_on_chain(issuer_key, bytes(32), 8))[0]
+        for address in (issuer, app_address):
+            await cache.account_info(address)
+
+    asyncio.run(scenario())
+    assert node.account_reads == 4
+    assert cache.invalidations == 2
+
+
+def test_failed_submit_keeps_cached_state(service):
+    minting, cache, node = service
+    issuer_key, issuer = account.generate_account()
+
+    async def fail(atc, wait_rounds):
+        raise RuntimeError("rejected")
+
+    node.execute = fail
+
+    async def scenario():
+        await cache.account_info(issuer)
+        assert not (await minting.revoke_batch_on_chain(issuer_key, bytes(32)))[0]
+        await cache.account_info(issuer)
+
+    asyncio.run(scenario())
+    assert node.account_reads == 1
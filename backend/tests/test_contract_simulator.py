@@ -0,0 +1,83 @@
+"""
+Tests for services/contract_simulator.py opcode budgets
+
+verify_holder walks the holder's whole recipient index, so a holder with
+more than a page or two of certificates needs more than the 700 opcodes
+a single app call brings.
+"""
+
+import asyncio
+import base64
+from types import SimpleNamespace
+
+from algosdk import account, error, transaction
+
+from services.algorand_address import decode_address
+from services.certificate_record import INDEX_SIZE, recipient_box_name
+from services.contract_simulator import (
+    APP_CALL_BUDGET,
+    VERIFY_HOLDER_BASE_COST,
+    VERIFY_HOLDER_SLOT_COST,
+    ContractSimulator,
+)
+from services.unified_certificate_client import UnifiedCertificateClient
+
+CID = "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+
+
+class IndexNode:
+    """Serves recipient index boxes and records each simulate request"""
+
+    def __init__(self, index_lengths):
+        self.boxes = {
+            recipient_box_name(decode_address(holder)): length.to_bytes(8, "big") + bytes(INDEX_SIZE - 8)
+            for holder, length in index_lengths.items()
+        }
+        self.budgets = []
+
+    async def call(self, method, *args):
+        if method == "suggested_params":
+            return transaction.SuggestedParams(1000, 1, 1000, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", flat_fee=True)
+        _, name = args
+        if name not in self.boxes:
+            raise error.AlgodHTTPError("box not found", 404)
+        return {"name": base64.b64encode(name).decode(), "value": base64.b64encode(self.boxes[name]).decode()}
+
+    async def run(self, simulate, request):
+        self.budgets.append(request.extra_opcode_budget)
+        calls = len(simulate.__self__.build_group())
+        return SimpleNamespace(
+            failure_message="",
+            failed_at=None,
+            abi_results=[SimpleNamespace(return_value=True)] * calls
+        )
+
+
+def simulator(node: IndexNode) -> ContractSimulator:
+    _, sender = account.generate_account()
+    return ContractSimulator(UnifiedCertificateClient(1001), sender, pool=node)
+
+
+def test_multi_page_index_gets_budget_for_every_slot():
+    _, holder = account.generate_account()
+    # Three index pages: 16 + 16 + 8 certificates
+    node = IndexNode({holder: 40})
+    [(verified, error_message)] = asyncio.run(simulator(node).verify_holders([(holder, CID)]))
+    assert verified and error_message is None
+    assert node.budgets == [VERIFY_HOLDER_BASE_COST + 40 * VERIFY_HOLDER_SLOT_COST - APP_CALL_BUDGET]
+
+
+def test_small_indexes_fit_the_pooled_budget():
+    holders = [account.generate_account()[1] for _ in range(3)]
+    node = IndexNode({holders[0]: 2, holders[1]: 1})
+    results = asyncio.run(simulator(node).verify_holders([(holder, CID) for holder in holders]))
+    assert [error_message for _, error_message in results] == [None] * 3
+    assert node.budgets == [0]
+
+
+def test_each_group_is_budgeted_for_its_own_calls():
+    holders = [account.generate_account()[1] for _ in range(17)]
+    node = IndexNode({holders[-1]: 100})
+    asyncio.run(simulator(node).verify_holders([(holder, CID) for holder in holders]))
+    # 16 calls with empty indexes, then the large index alone
+    assert sorted(node.budgets) == [0, VERIFY_HOLDER_BASE_COST + 100 * VERIFY_HOLDER_SLOT_COST - APP_CALL_BUDGET]
@@ -0,0 +1,54 @@
+"""
+Tests for the revocation list when the chain indexer is not serving
+
+With CHAIN_INDEXER off the list is empty, and answering from it would
+report every certificate as not revoked.
+"""
+
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from routes import contracts
+from services.chain_indexer import ChainIndexer
+from services.revocation_list import RevocationList
+
+
+@pytest.fixture
+def stopped_list(tmp_path, monkeypatch):
+    indexer = ChainIndexer(app_id=1, db_path=str(tmp_path / "index.sqlite3"))
+    revocations = RevocationList(indexer)
+    monkeypatch.setattr(contracts, "revocation_list", revocations)
+    return indexer, revocations
+
+
+def test_refresh_does_not_touch_the_index_without_an_indexer(stopped_list):
+    indexer, revocations = stopped_list
+    assert not revocations.available
+    revocations.refresh()
+    assert revocations.round is None
+    assert not os.path.exists(indexer.db_path)
+
+
+@pytest.mark.parametrize("route, args", [
+    (contracts.get_revocation_status, ("cert-1",)),
+    (contracts.get_revocation_snapshot, (None,)),
+])
+def test_revocation_routes_are_unavailable_without_an_indexer(stopped_list, route, args):
+    indexer, _ = stopped_list
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(route(*args))
+    assert raised.value.status_code == 503
+    assert not os.path.exists(indexer.db_path)
+
+
+def test_revocation_list_answers_once_the_indexer_has_a_checkpoint(stopped_list, monkeypatch):
+    indexer, revocations = stopped_list
+    indexer.apply_block(5, {"block": {"txns": []}})
+    monkeypatch.setattr(ChainIndexer, "running", property(lambda self: True))
+    assert revocations.available
+    assert asyncio.run(contracts.refresh_revocations())
+    assert revocations.round == 5
+    assert not revocations.is_revoked("cert-1")
@@ -0,0 +1,58 @@
+"""
+Tests for services/similarity.py
+
+The banded, early-exit similarity must accept exactly the pairs the
+unbounded edit-distance ratio accepts, including ratios that land on
+the threshold.
+"""
+
+import random
+
+import pytest
+
+from services.similarity import bounded_distance, is_similar, similarity
+
+
+def reference_ratio(a: str, b: str) -> float:
+    """Similarity from the full (unbounded) distance"""
+    max_len = max(len(a), len(b))
+    if max_len == 0:
+        return 1.0
+    return 1.0 - bounded_distance(a, b, max_len) / max_len
+
+
+@pytest.mark.parametrize("a, b, ratio", [
+    ("smith", "smyth", 0.8),
+    ("abcdefghij", "abXdefgYij", 0.8),
+    ("abcdefghij", "abXdefghij", 0.9),
+    ("abcd", "abXd", 0.75),
+    ("abcdefg", "abXdeYg", 5 / 7),
+])
+def test_boundary_ratio_is_accepted(a, b, ratio):
+    assert reference_ratio(a, b) >= ratio
+    assert similarity(a, b, ratio) >= ratio
+    assert similarity(a, b, ratio) == pytest.approx(reference_ratio(a, b))
+
+
+@pytest.mark.parametrize("a, b, ratio", [
+    ("smith", "smXYh", 0.8),
+    ("abcdefghij", "XbcXefXhij", 0.8),
+])
+def test_below_threshold_is_rejected(a, b, ratio):
+    assert similarity(a, b, ratio) < ratio
+
+
+def test_threshold_agrees_with_unbounded_ratio():
+    rng = random.Random(32)
+    ratios = [0.5, 0.6, 2 / 3, 0.7, 0.75, 0.8, 0.85, 0.9]
+    for _ in range(2000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+        expected = reference_ratio(a, b)
+        for ratio in ratios:
+            assert (similarity(a, b, ratio) >= ratio) == (expected >= ratio), (a, b, ratio)
+
+
+def test_is_similar_accepts_single_typo_in_short_name():
+    assert is_similar("smith", "smyth")
+    assert not is_similar("smith", "jones")
@@ -0,0 +1,27 @@
+"""
+Tests for the deployed_contracts.json version check
+
+Deployments older than the box-based ARC-4 contract reject every call
+the generated client makes, so they must read as unavailable.
+"""
+
+import pytest
+
+from services.certificate_record import unified_deployment
+
+
+def test_pre_abi_deployment_is_unavailable():
+    app_id, reason = unified_deployment({"unified_certificate_app_id": 748842503, "contract_version": "1.0.0"})
+    assert app_id == 0
+    assert "748842503" in reason and "deploy_unified_contract.py" in reason
+
+
+@pytest.mark.parametrize("version", ["3.0.0", "3.1", "10.0.0"])
+def test_current_deployment_is_used(version):
+    assert unified_deployment({"unified_certificate_app_id": 42, "contract_version": version}) == (42, None)
+
+
+@pytest.mark.parametrize("contracts", [{}, {"unified_certificate_app_id": 42}, {"unified_certificate_app_id": 42, "contract_version": "dev"}])
+def test_missing_app_or_version_is_unavailable(contracts):
+    app_id, reason = unified_deployment(contracts)
+    assert app_id == 0 and reason
@@ -0,0 +1,34 @@
+"""
+Tests for the verification cache namespace
+
+Cached OCR text depends on the preprocessing settings, so a change to
+them (e.g. OCR_GRAYSCALE=0) must not serve text OCR'd under the old ones.
+"""
+
+from services.ai_certificate_verifier import AICertificateVerifier, cache_namespace
+from services.ocr_engine import OCREngine
+from services.ocr_preprocess import PreprocessConfig
+
+
+def test_preprocessing_env_changes_the_namespace(monkeypatch):
+    default = cache_namespace(OCREngine(max_workers=1))
+    monkeypatch.setenv("OCR_GRAYSCALE", "0")
+    assert cache_namespace(OCREngine(max_workers=1)) != default
+    monkeypatch.setenv("OCR_GRAYSCALE", "1")
+    assert cache_namespace(OCREngine(max_workers=1)) == default
+
+
+def test_render_dpi_changes_the_namespace():
+    config = PreprocessConfig()
+    assert cache_namespace(OCREngine(max_workers=1, dpi=200, preprocess=config)) != cache_namespace(
+        OCREngine(max_workers=1, dpi=300, preprocess=config)
+    )
+
+
+def test_engines_with_other_settings_do_not_share_a_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("VERIFICATION_CACHE_DIR", str(tmp_path))
+    default = AICertificateVerifier(engine=OCREngine(max_workers=1))
+    no_crop = AICertificateVerifier(engine=OCREngine(max_workers=1, preprocess=PreprocessConfig(crop=False)))
+    default.cache.put("ab" * 32, "text", {"course_name": "Profiling 101"})
+    assert no_crop.cache.get("ab" * 32) is None
+    assert default.cache.version != no_crop.cache.version
@@ -6,15 +6,26 @@ This script adds the deployer as an authorized issuer in the contract.
 
 import os
 import sys
-from algosdk import account, mnemonic, transaction
+from algosdk import abi, account, logic, mnemonic, transaction
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+    TransactionWithSigner,
+)
 from algosdk.v2client import algod
 from algosdk.encoding import decode_address
 
+from box_layout import issuer_box_name, issuer_box_mbr
+
 # Contract details
 APP_ID = 748842503
 ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
 ALGOD_TOKEN = ""
 
+# ARC-4 interface written by deploy_unified_contract.py
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "unified_certificate_abi.json")) as f:
+    CONTRACT = abi.Contract.from_json(f.read())
+
 def add_issuer(private_key, issuer_address, issuer_name, issuer_metadata="SkillDCX Official Issuer"):
     """Add an authorized issuer to the contract"""
     
@@ -30,26 +41,34 @@ def add_issuer(private_key, issuer_address, issuer_name, issuer_metadata="SkillD
     
     # Encode issuer address as bytes
     issuer_addr_bytes = decode_address(issuer_address)
+    box_name = issuer_box_name(issuer_addr_bytes)
+    
+    # Pay for the issuer box (minimum balance of the app account)
+    signer = AccountTransactionSigner(private_key)
+    pay_txn = TransactionWithSigner(
+        transaction.PaymentTxn(
+            sender=sender,
+            sp=params,
+            receiver=logic.get_application_address(APP_ID),
+            amt=issuer_box_mbr(len(issuer_name.encode()), len(issuer_metadata.encode()))
+        ),
+        signer
+    )
     
-    # Create application call transaction
-    # Args: [method, issuer_address, name, metadata]
-    txn = transaction.ApplicationNoOpTxn(
+    # add_issuer(address,string,string,pay)void
+    atc = AtomicTransactionComposer()
+    atc.add_method_call(
+        app_id=APP_ID,
+        method=CONTRACT.get_method_by_name("add_issuer"),
         sender=sender,
         sp=params,
-        index=APP_ID,
-        app_args=[
-            b"add_issuer",
-            issuer_addr_bytes,
-            issuer_name.encode(),
-            issuer_metadata.encode()
-        ]
+        signer=signer,
+        method_args=[issuer_address, issuer_name, issuer_metadata, pay_txn],
+        boxes=[(APP_ID, box_name)]
     )
     
-    # Sign transaction
-    signed_txn = txn.sign(private_key)
-    
-    # Send transaction
-    tx_id = client.send_transaction(signed_txn)
+    # Send transaction group
+    tx_id = atc.submit(client)[-1]
     print(f"Transaction sent: {tx_id}")
     
     # Wait for confirmation
@@ -0,0 +1,226 @@
+"""
+Unified Certificate Contract - Box Layout
+
+Box names and record offsets shared by the contract and the scripts that
+call it. Everything is keyed by raw bytes:
+
+    c + sha256(cert_id)   certificate record (one box per certificate)
+    r + recipient (32)    recipient index: 8-byte count + 32-byte cert keys
+    r + recipient + page  further index pages (8-byte page number >= 1)
+    i + issuer (32)       issuer record: flag | registered | name_len | name | meta
+    b + merkle root (32)  anchored batch: issuer | anchored at | leaf count | flags
+
+Certificate record (fixed width, big-endian integers):
+
+    issuer        32   offset 0
+    recipient     32   offset 32
+    timestamp      8   offset 64
+    nft asset id   8   offset 72
+    flags          1   offset 80    (active, ai verified, manual verified)
+    cid multihash 34   offset 81    (0x12 0x20 + sha2-256 digest)
+    pointer len    1   offset 115
+    metadata ptr   *   offset 116   (<= 64 bytes, e.g. sha2-256 multihash of the metadata)
+
+The metadata itself is not stored in the box: the record keeps a pointer
+to it, and the issue transaction carries the JSON in its note when it
+fits, so indexers can read it and check it against the pointer.
+
+This module is the single source of the layout: generate_client.py copies
+it to backend/services/box_layout.py.
+"""
+
+import base64
+import hashlib
+from typing import Tuple
+
+CERT_PREFIX = b"c"
+RECIPIENT_PREFIX = b"r"
+ISSUER_PREFIX = b"i"
+BATCH_PREFIX = b"b"
+
+# Certificate record offsets
+ISSUER_OFFSET = 0
+RECIPIENT_OFFSET = 32
+TIMESTAMP_OFFSET = 64
+ASSET_ID_OFFSET = 72
+FLAGS_OFFSET = 80
+CID_OFFSET = 81
+CID_LENGTH = 34
+METADATA_POINTER_LENGTH_OFFSET = CID_OFFSET + CID_LENGTH
+METADATA_POINTER_OFFSET = METADATA_POINTER_LENGTH_OFFSET + 1
+METADATA_POINTER_MAX_LENGTH = 64
+# Keeps a whole record inside the 1KB of box I/O one box reference grants
+CERT_RECORD_MAX_SIZE = METADATA_POINTER_OFFSET + METADATA_POINTER_MAX_LENGTH
+
+# Multihash header of a sha2-256 digest (what CIDv0 and default CIDv1 use)
+MULTIHASH_SHA2_256 = b"\x12\x20"
+
+# CIDv1 codecs
+CODEC_DAG_PB = 0x70
+CODEC_RAW = 0x55
+
+# Largest transaction note; metadata above this is only reachable by pointer
+NOTE_MAX_LENGTH = 1024
+
+FLAG_ACTIVE = 0x01
+FLAG_AI_VERIFIED = 0x02
+FLAG_MANUAL_VERIFIED = 0x04
+
+# Anchored batch record: issuer (32) | timestamp (8) | leaf count (8) | flags (1)
+BATCH_RECORD_SIZE = 32 + 8 + 8 + 1
+BATCH_FLAGS_OFFSET = 48
+
+# Merkle tree hashing (domain-separated leaves and nodes) and proof steps:
+# one side byte (0 = sibling on the left, 1 = on the right) + 32-byte sibling
+MERKLE_LEAF_PREFIX = b"\x00"
+MERKLE_NODE_PREFIX = b"\x01"
+PROOF_STEP_SIZE = 33
+
+# Leaf preimage: cert key (32) | recipient (32) | cid multihash (34) | sha256(metadata) (32);
+# the contract hashes it with MERKLE_LEAF_PREFIX itself
+LEAF_PREIMAGE_SIZE = 32 + 32 + CID_LENGTH + 32
+
+# Recipient index: page 0 holds the total count + INDEX_SLOTS certificate
+# keys; a new page of INDEX_SLOTS keys is created each time one fills up
+INDEX_SLOTS = 16
+INDEX_SIZE = 8 + 32 * INDEX_SLOTS
+INDEX_PAGE_SIZE = 32 * INDEX_SLOTS
+
+# Minimum-balance cost of a box, in microAlgos
+BOX_FLAT_MBR = 2500
+BOX_BYTE_MBR = 400
+
+
+def cert_key(cert_id) -> bytes:
+    if isinstance(cert_id, str):
+        cert_id = cert_id.encode()
+    return hashlib.sha256(cert_id).digest()
+
+
+def cert_box_name(cert_id) -> bytes:
+    return CERT_PREFIX + cert_key(cert_id)
+
+
+def recipient_box_name(recipient_public_key: bytes) -> bytes:
+    return RECIPIENT_PREFIX + recipient_public_key
+
+
+def recipient_index_page_name(recipient_public_key: bytes, page: int) -> bytes:
+    name = recipient_box_name(recipient_public_key)
+    return name if page == 0 else name + page.to_bytes(8, "big")
+
+
+def issuer_box_name(issuer_public_key: bytes) -> bytes:
+    return ISSUER_PREFIX + issuer_public_key
+
+
+def batch_box_name(merkle_root: bytes) -> bytes:
+    return BATCH_PREFIX + merkle_root
+
+
+def box_mbr(name_length: int, value_length: int) -> int:
+    """Minimum balance the app account needs for one box"""
+    return BOX_FLAT_MBR + BOX_BYTE_MBR * (name_length + value_length)
+
+
+def cert_box_mbr(pointer_length: int) -> int:
+    return box_mbr(1 + 32, METADATA_POINTER_OFFSET + pointer_length)
+
+
+def recipient_index_mbr(page: int = 0) -> int:
+    if page == 0:
+        return box_mbr(1 + 32, INDEX_SIZE)
+    return box_mbr(1 + 32 + 8, INDEX_PAGE_SIZE)
+
+
+def recipient_index_insert(count: int) -> Tuple[int, int]:
+    """Index page the next certificate key goes to, and the MBR of creating it (0 if it exists)"""
+    page = count // INDEX_SLOTS
+    return page, recipient_index_mbr(page) if count % INDEX_SLOTS == 0 else 0
+
+
+def batch_box_mbr() -> int:
+    return box_mbr(1 + 32, BATCH_RECORD_SIZE)
+
+
+def issuer_box_mbr(name_length: int, metadata_length: int) -> int:
+    return box_mbr(1 + 32, 1 + 8 + 2 + name_length + metadata_length)
+
+
+def metadata_pointer(metadata) -> bytes:
+    """sha2-256 multihash of the metadata (also the multihash of its raw-codec CIDv1)"""
+    if isinstance(metadata, str):
+        metadata = metadata.encode()
+    return MULTIHASH_SHA2_256 + hashlib.sha256(metadata).digest()
+
+
+# ==================== CID <-> MULTIHASH ====================
+
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_INDEX = {char: i for i, char in enumerate(_BASE58_ALPHABET)}
+
+
+def _b58decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        if char not in _BASE58_INDEX:
+            raise ValueError(f"Invalid base58 character: {char!r}")
+        number = number * 58 + _BASE58_INDEX[char]
+    leading = len(text) - len(text.lstrip("1"))
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\x00" * leading + body
+
+
+def _b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    chars = []
+    while number:
+        number, remainder = divmod(number, 58)
+        chars.append(_BASE58_ALPHABET[remainder])
+    leading = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * leading + "".join(reversed(chars))
+
+
+def cid_to_multihash(cid: str) -> bytes:
+    """
+    34-byte sha2-256 multihash of a CID
+
+    Accepts CIDv0 (base58btc "Qm...") and CIDv1 in base32 ("b...") with a
+    one-byte codec. Both versions of the same content share the multihash,
+    which is what the contract stores and compares.
+    """
+    if cid.startswith("Qm"):
+        multihash = _b58decode(cid)
+    elif cid.startswith("b"):
+        body = cid[1:].upper()
+        try:
+            raw = base64.b32decode(body + "=" * (-len(body) % 8))
+        except Exception:
+            raise ValueError(f"Invalid base32 CID: {cid}")
+        # version 1, one-byte codec varint (dag-pb 0x70 / raw 0x55), multihash
+        if len(raw) < 2 or raw[0] != 0x01 or raw[1] & 0x80:
+            raise ValueError(f"Unsupported CID: {cid}")
+        multihash = raw[2:]
+    else:
+        raise ValueError(f"Unsupported CID: {cid}")
+
+    if len(multihash) != CID_LENGTH or multihash[:2] != MULTIHASH_SHA2_256:
+        raise ValueError(f"CID is not a sha2-256 multihash: {cid}")
+    return multihash
+
+
+def multihash_to_cid(multihash, version: int = 0, codec: int = CODEC_DAG_PB) -> str:
+    """Render a stored multihash as CIDv0 (default) or base32 CIDv1"""
+    multihash = bytes(multihash)
+    if version == 0:
+        return _b58encode(multihash)
+    raw = bytes([0x01, codec]) + multihash
+    return "b" + base64.b32encode(raw).decode().rstrip("=").lower()
+
+
+def is_valid_cid(cid: str) -> bool:
+    try:
+        cid_to_multihash(cid)
+        return True
+    except ValueError:
+        return False
@@ -92,7 +92,7 @@ def certification_contract():
     # Main application logic
     program = Cond(
         [Txn.application_id() == Int(0), on_creation],
-        [Txn.on_completion() == OnCall.NoOp, 
+        [Txn.on_completion() == OnComplete.NoOp, 
          Cond(
              [Txn.application_args[0] == Bytes("issue"), issue_certificate],
              [Txn.application_args[0] == Bytes("verify"), verify_certificate],
@@ -100,10 +100,10 @@ def certification_contract():
              [Txn.application_args[0] == Bytes("get_info"), get_certificate_info],
              [Int(1), Reject()]
          )],
-        [Txn.on_completion() == OnCall.OptIn, Approve()],  # Allow users to opt-in
-        [Txn.on_completion() == OnCall.CloseOut, Approve()],
-        [Txn.on_completion() == OnCall.UpdateApplication, Reject()],  # No updates allowed
-        [Txn.on_completion() == OnCall.DeleteApplication, Reject()]   # No deletion allowed
+        [Txn.on_completion() == OnComplete.OptIn, Approve()],  # Allow users to opt-in
+        [Txn.on_completion() == OnComplete.CloseOut, Approve()],
+        [Txn.on_completion() == OnComplete.UpdateApplication, Reject()],  # No updates allowed
+        [Txn.on_completion() == OnComplete.DeleteApplication, Reject()]   # No deletion allowed
     )
     
     return program
@@ -4,17 +4,20 @@ SkillDCX Smart Contract Deployment Script for Algorand TestNet
 
 This script deploys both the Issuer Registry and Certification contracts
 to Algorand TestNet and saves the application IDs for use in the backend.
+
+Deployment order:
+- The certification contract is created with the issuer registry's app id
+  as an argument, so the two app creates run one after the other
+- Only TEAL generation and compilation happen up front, with the algod
+  compiles running concurrently (TealCache.compile_contracts)
 """
 
-import base64
 import json
 from algosdk.v2client import algod
-from algosdk import account, mnemonic
-from algosdk.future import transaction
+from algosdk import account, mnemonic, transaction
 from algosdk.encoding import decode_address
-from certification_contract import certification_contract, clear_state_program as cert_clear
-from issuer_registry_contract import issuer_registry_contract, clear_state_program as registry_clear
-from pyteal import compileTeal, Mode
+from deploy_contracts import CONTRACTS
+from teal_cache import TealCache
 
 # TestNet configuration
 ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
@@ -41,17 +44,15 @@ class AlgorandContractDeployer:
             print(f"Mnemonic: {mnemonic.from_private_key(self.private_key)}")
             print("⚠️  Fund this account on TestNet: https://testnet.algoexplorer.io/dispenser")
             
-    def compile_program(self, source_code):
-        """Compile PyTeal to TEAL"""
-        compile_response = self.algod_client.compile(source_code)
-        return base64.b64decode(compile_response['result'])
+    def compile_programs(self):
+        """Bytecode for both contracts (cached; algod compiles run in parallel)"""
+        cache = TealCache()
+        programs = cache.compile_contracts(self.algod_client, CONTRACTS)
+        print(cache.summary())
+        return programs
         
-    def deploy_contract(self, approval_program, clear_program, app_args=None):
+    def deploy_contract(self, programs, app_args=None):
         """Deploy a smart contract to Algorand"""
-        # Compile programs
-        approval_binary = self.compile_program(approval_program)
-        clear_binary = self.compile_program(clear_program)
-        
         # Get network params
         params = self.algod_client.suggested_params()
         
@@ -60,8 +61,8 @@ class AlgorandContractDeployer:
             sender=self.address,
             sp=params,
             on_complete=transaction.OnComplete.NoOpOC,
-            approval_program=approval_binary,
-            clear_program=clear_binary,
+            approval_program=programs["approval"].bytecode,
+            clear_program=programs["clear"].bytecode,
             global_schema=GLOBAL_SCHEMA,
             local_schema=LOCAL_SCHEMA,
             app_args=app_args or []
@@ -92,21 +93,19 @@ class AlgorandContractDeployer:
             return None, None
             
         try:
+            # Compile both up front; creation is ordered (certification needs the registry ID)
+            programs = self.compile_programs()
+            
             # 1. Deploy Issuer Registry Contract
             print("\n📋 Deploying Issuer Registry Contract...")
-            registry_approval = compileTeal(issuer_registry_contract(), Mode.Application, version=6)
-            registry_clear = compileTeal(registry_clear(), Mode.Application, version=6)
-            
-            registry_app_id = self.deploy_contract(registry_approval, registry_clear)
+            registry_app_id = self.deploy_contract(programs["issuer_registry"])
             
             # 2. Deploy Certification Contract (with registry app ID)
             print("\n🎓 Deploying Certification Contract...")
-            cert_approval = compileTeal(certification_contract(), Mode.Application, version=6)
-            cert_clear_prog = compileTeal(cert_clear(), Mode.Application, version=6)
             
             # Pass registry app ID to certification contract
             cert_app_args = [registry_app_id.to_bytes(8, 'big')]
-            cert_app_id = self.deploy_contract(cert_approval, cert_clear_prog, cert_app_args)
+            cert_app_id = self.deploy_contract(programs["certification"], cert_app_args)
             
             # Save contract information
             contract_info = {
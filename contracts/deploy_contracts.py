@@ -4,6 +4,12 @@ SkillDCX Smart Contract Deployment Script
 This script deploys both the Issuer Registry and Certification contracts
 to Algorand TestNet and saves the deployed app IDs.
 
+Deployment order:
+- The certification contract is created with the issuer registry's app id
+  as an argument, so the two app creates run one after the other
+- Only TEAL generation and compilation happen up front, with the algod
+  compiles running concurrently (TealCache.compile_contracts)
+
 Usage:
     python deploy_contracts.py --mnemonic "your 24 word mnemonic"
     
@@ -17,11 +23,8 @@ import json
 import argparse
 from algosdk import account, mnemonic as mn, transaction
 from algosdk.v2client import algod
-from pyteal import compileTeal, Mode
 
-# Import contract modules
-from certification_contract import certification_contract, clear_state_program
-from issuer_registry_contract import issuer_registry_contract, clear_state_program as issuer_clear_state
+from teal_cache import TealCache
 
 
 # Algorand TestNet configuration
@@ -32,10 +35,31 @@ ALGOD_TOKEN = ""
 OUTPUT_FILE = "deployed_contracts.json"
 
 
-def compile_program(client, source_code):
-    """Compile PyTeal program to TEAL bytecode"""
-    compile_response = client.compile(source_code)
-    return compile_response['result'], compile_response['hash']
+def issuer_registry_teal():
+    """Generate the issuer registry TEAL (only run on a cache miss)"""
+    from pyteal import compileTeal, Mode
+    from issuer_registry_contract import issuer_registry_contract, clear_state_program
+    return {
+        "approval": compileTeal(issuer_registry_contract(), Mode.Application, version=6),
+        "clear": compileTeal(clear_state_program(), Mode.Application, version=6),
+    }
+
+
+def certification_teal():
+    """Generate the certification TEAL (only run on a cache miss)"""
+    from pyteal import compileTeal, Mode
+    from certification_contract import certification_contract, clear_state_program
+    return {
+        "approval": compileTeal(certification_contract(), Mode.Application, version=6),
+        "clear": compileTeal(clear_state_program(), Mode.Application, version=6),
+    }
+
+
+# name -> (source files, TEAL version, generator)
+CONTRACTS = {
+    "issuer_registry": (["issuer_registry_contract.py"], 6, issuer_registry_teal),
+    "certification": (["certification_contract.py"], 6, certification_teal),
+}
 
 
 def wait_for_confirmation(client, txid, timeout=10):
@@ -64,17 +88,13 @@ def deploy_contract(client, sender_address, sender_private_key, approval_program
     # Get network params
     params = client.suggested_params()
     
-    # Compile programs
-    approval_program_compiled, _ = compile_program(client, approval_program)
-    clear_program_compiled, _ = compile_program(client, clear_program)
-    
     # Create application transaction
     txn = transaction.ApplicationCreateTxn(
         sender=sender_address,
         sp=params,
         on_complete=transaction.OnComplete.NoOpOC,
-        approval_program=approval_program_compiled,
-        clear_program=clear_program_compiled,
+        approval_program=approval_program,
+        clear_program=clear_program,
         global_schema=global_schema,
         local_schema=local_schema,
         app_args=app_args or []
@@ -132,14 +152,18 @@ def deploy_all_contracts(deployer_mnemonic):
     print()
     deployed_apps = {}
     
+    # Both contracts are generated/compiled up front (cached, algod calls in
+    # parallel); creation stays ordered since certification needs the registry id
+    cache = TealCache()
+    programs = cache.compile_contracts(algod_client, CONTRACTS)
+    print(cache.summary())
+    print()
+    
     # 1. Deploy Issuer Registry Contract
     print("-" * 60)
     print("1. Deploying Issuer Registry Contract...")
     print("-" * 60)
     
-    issuer_approval = compileTeal(issuer_registry_contract(), Mode.Application, version=6)
-    issuer_clear = compileTeal(issuer_clear_state(), Mode.Application, version=6)
-    
     # Global schema: admin (bytes), total_issuers (uint)
     issuer_global_schema = transaction.StateSchema(num_uints=1, num_byte_slices=1)
     # Local schema: authorized (uint), name (bytes), metadata (bytes), reg_timestamp (uint)
@@ -149,8 +173,8 @@ def deploy_all_contracts(deployer_mnemonic):
         algod_client,
         deployer_address,
         deployer_private_key,
-        issuer_approval,
-        issuer_clear,
+        programs["issuer_registry"]["approval"].bytecode,
+        programs["issuer_registry"]["clear"].bytecode,
         issuer_global_schema,
         issuer_local_schema
     )
@@ -165,9 +189,6 @@ def deploy_all_contracts(deployer_mnemonic):
     print("2. Deploying Certification Contract...")
     print("-" * 60)
     
-    cert_approval = compileTeal(certification_contract(), Mode.Application, version=6)
-    cert_clear = compileTeal(clear_state_program(), Mode.Application, version=6)
-    
     # Global schema: total_certs (uint), issuer_registry (uint)
     cert_global_schema = transaction.StateSchema(num_uints=2, num_byte_slices=0)
     # Local schema: ipfs_hash (bytes), issuer (bytes), timestamp (uint), active (uint), metadata (bytes)
@@ -178,8 +199,8 @@ def deploy_all_contracts(deployer_mnemonic):
         algod_client,
         deployer_address,
         deployer_private_key,
-        cert_approval,
-        cert_clear,
+        programs["certification"]["approval"].bytecode,
+        programs["certification"]["clear"].bytecode,
         cert_global_schema,
         cert_local_schema,
         app_args=[issuer_app_id.to_bytes(8, 'big')]
@@ -8,36 +8,43 @@ to Algorand TestNet and updates deployed_contracts.json
 import os
 import json
 import sys
-import base64
-from algosdk import account, mnemonic, transaction
+from algosdk import account, logic, mnemonic, transaction
 from algosdk.v2client import algod
-from pyteal import compileTeal, Mode
-from unified_certificate_contract import unified_certificate_contract, clear_state_program
 
+from teal_cache import TealCache
 
-def compile_contract():
-    """Compile the unified certificate contract"""
-    print("Compiling unified certificate contract...")
-    
-    approval_teal = compileTeal(
-        unified_certificate_contract(),
-        Mode.Application,
-        version=6
-    )
+# Account minimum balance; each box adds to it when created (see box_layout.py)
+APP_BASE_FUNDING = 100_000
+
+# Longest approval + clear program one app page holds
+APP_PAGE_SIZE = 2048
+
+
+# Contract entry module; the TEAL cache fingerprint also covers the local
+# modules it imports (box_layout.py)
+CONTRACT_SOURCES = ["unified_certificate_contract.py"]
+
+
+def unified_teal():
+    """Generate the contract TEAL and export its ABI (only run on a cache miss)"""
+    from unified_certificate_contract import compile_contract as compile_router, write_contract_json
     
-    clear_teal = compileTeal(
-        clear_state_program(),
-        Mode.Application,
-        version=6
-    )
+    print("Generating unified certificate contract TEAL...")
+    approval_teal, clear_teal, contract = compile_router(version=8)
+    
+    # Clients (contracts scripts, backend) are built from this file
+    abi_path = write_contract_json(contract)
+    print(f"ABI written to {abi_path}")
     
-    return approval_teal, clear_teal
+    return {"approval": approval_teal, "clear": clear_teal}
 
 
-def compile_program(client, teal_source):
-    """Compile TEAL source code to binary"""
-    compile_response = client.compile(teal_source)
-    return base64.b64decode(compile_response["result"]), compile_response["hash"]
+def compile_contract(client):
+    """Approval and clear programs, regenerated and recompiled only when the contract changed"""
+    cache = TealCache()
+    programs = cache.compile_contracts(client, {"unified": (CONTRACT_SOURCES, 8, unified_teal)})["unified"]
+    print(cache.summary())
+    return programs["approval"], programs["clear"]
 
 
 def deploy_contract(
@@ -53,6 +60,9 @@ def deploy_contract(
     sender = account.address_from_private_key(private_key)
     params = client.suggested_params()
     
+    # The box-based approval program no longer fits one page
+    extra_pages = (len(approval_program) + len(clear_program) - 1) // APP_PAGE_SIZE
+    
     # Create application transaction
     txn = transaction.ApplicationCreateTxn(
         sender=sender,
@@ -62,7 +72,7 @@ def deploy_contract(
         clear_program=clear_program,
         global_schema=global_schema,
         local_schema=local_schema,
-        extra_pages=0
+        extra_pages=extra_pages
     )
     
     # Sign transaction
@@ -81,11 +91,32 @@ def deploy_contract(
     print(f"Application deployed with ID: {app_id}")
     
     # Get application address
-    app_address = f"app_{app_id}"
+    app_address = logic.get_application_address(app_id)
     
     return app_id, app_address, tx_id
 
 
+def fund_app_account(client, private_key, app_id, amount=APP_BASE_FUNDING):
+    """Send the app account its base minimum balance so it can hold boxes"""
+    
+    sender = account.address_from_private_key(private_key)
+    params = client.suggested_params()
+    
+    txn = transaction.PaymentTxn(
+        sender=sender,
+        sp=params,
+        receiver=logic.get_application_address(app_id),
+        amt=amount
+    )
+    
+    signed_txn = txn.sign(private_key)
+    tx_id = client.send_transaction(signed_txn)
+    transaction.wait_for_confirmation(client, tx_id, 4)
+    print(f"Funded app account with {amount / 1_000_000} ALGO")
+    
+    return tx_id
+
+
 def update_deployed_contracts(
     app_id,
     app_address,
@@ -114,13 +145,15 @@ def update_deployed_contracts(
         "network": network,
         "algod_address": algod_address,
         "deployer_address": deployer_address,
-        "contract_version": "1.0.0",
+        "contract_version": "3.0.0",
         "features": [
             "3-layer verification",
             "Issuer registry",
             "AI verification",
             "IPFS verification",
-            "NFT minting"
+            "NFT minting",
+            "Box storage",
+            "ARC-4 ABI"
         ],
         "note": "Unified certificate contract with integrated verification layers"
     })
@@ -183,26 +216,22 @@ def main():
     except Exception as e:
         print(f"WARNING: Could not check balance - {e}")
     
-    # Compile contract
+    # Compile contract (cached: unchanged sources skip PyTeal and algod)
     print("\n" + "=" * 60)
-    approval_teal, clear_teal = compile_contract()
-    
-    # Compile to bytecode
-    print("Compiling to bytecode...")
-    approval_program, approval_hash = compile_program(algod_client, approval_teal)
-    clear_program, clear_hash = compile_program(algod_client, clear_teal)
+    approval, clear = compile_contract(algod_client)
+    approval_program, clear_program = approval.bytecode, clear.bytecode
     
-    print(f"Approval Program Hash: {approval_hash}")
-    print(f"Clear Program Hash: {clear_hash}")
+    print(f"Approval Program Hash: {approval.hash}")
+    print(f"Clear Program Hash: {clear.hash}")
     
     # Define state schema
-    # Global state: Using dynamic keys for issuers and certificates
-    # Fixed keys: admin_address, total_issuers, total_certificates, registry_enabled, ai_required
-    # Dynamic keys: issuer_{addr}, name_{addr}, meta_{addr}, cert_*_{addr}
-    # Max is 64 total keys, allocate 16 uint + 48 bytes for flexibility
-    global_schema = transaction.StateSchema(num_uints=16, num_byte_slices=48)
+    # Global state: only the fixed keys
+    #   uints: total_issuers, total_certs, registry_enabled, ai_required
+    #   bytes: admin
+    # Issuers and certificates live in boxes (see box_layout.py)
+    global_schema = transaction.StateSchema(num_uints=4, num_byte_slices=1)
     
-    # Local state: Not used in this version (all data in global state)
+    # Local state: Not used
     local_schema = transaction.StateSchema(num_uints=0, num_byte_slices=0)
     
     print(f"\nGlobal Schema: {global_schema.num_uints} uints, {global_schema.num_byte_slices} bytes")
@@ -223,6 +252,9 @@ def main():
             local_schema
         )
         
+        # Boxes are paid for from the app account's balance
+        fund_app_account(algod_client, private_key, app_id)
+        
         print("\n" + "=" * 60)
         print("DEPLOYMENT SUCCESSFUL!")
         print("=" * 60)
@@ -243,8 +275,8 @@ def main():
         
         print("\n✓ Deployment complete!")
         print("\nNext steps:")
-        print("1. Add authorized issuers using the 'add_issuer' method")
-        print("2. Configure your backend with the app_id")
+        print("1. Add authorized issuers using the 'add_issuer' method (add_issuer.py)")
+        print("2. Regenerate the backend client: python generate_client.py")
         print("3. Test certificate issuance with 3-layer verification")
         
     except Exception as e:
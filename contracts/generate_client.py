@@ -0,0 +1,178 @@
+"""
+Generate the Python Client for the Unified Certificate Contract
+
+Reads the ARC-4 description (unified_certificate_abi.json, written by
+deploy_unified_contract.py / unified_certificate_contract.py) and writes
+backend/services/unified_certificate_client.py with one typed method per
+ABI method, so argument encodings always match the deployed contract.
+
+Also copies box_layout.py to backend/services/box_layout.py, so the
+backend decodes boxes with the same names, offsets and CID helpers the
+contract was built with.
+
+Usage:
+    python generate_client.py            # compile the contract, then generate
+    python generate_client.py --no-compile
+"""
+
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ABI_PATH = os.path.join(HERE, "unified_certificate_abi.json")
+OUTPUT_PATH = os.path.join(HERE, "..", "backend", "services", "unified_certificate_client.py")
+LAYOUT_PATH = os.path.join(HERE, "box_layout.py")
+LAYOUT_OUTPUT_PATH = os.path.join(HERE, "..", "backend", "services", "box_layout.py")
+
+LAYOUT_HEADER = "# GENERATED by contracts/generate_client.py from contracts/box_layout.py; do not edit.\n"
+
+# ABI type -> Python annotation used in the generated signatures
+PYTHON_TYPES = {
+    "string": "str",
+    "address": "str",
+    "bool": "bool",
+    "uint64": "int",
+    "byte[]": "bytes",
+    "pay": "TransactionWithSigner",
+}
+
+HEADER = '''"""
+Unified Certificate Contract Client
+
+GENERATED by contracts/generate_client.py from unified_certificate_abi.json.
+Do not edit by hand; change the contract and regenerate.
+
+Each method adds one ARC-4 call to an AtomicTransactionComposer:
+1. Arguments are encoded by the ABI types of the deployed contract
+2. Transaction arguments (pay) are placed in the group automatically
+3. Read-only methods (READ_ONLY_METHODS) can run through atc.simulate
+"""
+
+from typing import Optional, Sequence
+
+from algosdk import abi, transaction
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+
+ABI_JSON = r\'\'\'{abi_json}\'\'\'
+
+CONTRACT = abi.Contract.from_json(ABI_JSON)
+
+READ_ONLY_METHODS = frozenset({{{read_only}}})
+
+
+class UnifiedCertificateClient:
+    """Typed ARC-4 calls to one deployment of the unified certificate contract"""
+
+    def __init__(self, app_id: int):
+        self.app_id = app_id
+
+    def _add_call(
+        self,
+        atc: AtomicTransactionComposer,
+        method_name: str,
+        method_args: list,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        boxes: Sequence[bytes],
+        note: Optional[bytes]
+    ) -> AtomicTransactionComposer:
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=CONTRACT.get_method_by_name(method_name),
+            sender=sender,
+            sp=sp,
+            signer=signer,
+            method_args=method_args,
+            boxes=[(self.app_id, name) for name in boxes],
+            note=note
+        )
+        return atc
+'''
+
+METHOD_TEMPLATE = '''
+    def {name}(
+        self,
+        atc: AtomicTransactionComposer,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        *,
+{params}        boxes: Sequence[bytes] = (),
+        note: Optional[bytes] = None
+    ) -> AtomicTransactionComposer:
+        """
+        {signature}{read_only}
+
+        {desc}
+        """
+        return self._add_call(atc, "{name}", [{args}], sender, signer, sp, boxes, note)
+'''
+
+
+def python_type(abi_type: str) -> str:
+    if abi_type in PYTHON_TYPES:
+        return PYTHON_TYPES[abi_type]
+    if abi_type.startswith("byte["):
+        return "bytes"
+    if abi_type.startswith("uint"):
+        return "int"
+    raise ValueError(f"No Python type for ABI type {abi_type}")
+
+
+def signature(method: dict) -> str:
+    args = ",".join(arg["type"] for arg in method["args"])
+    return f"{method['name']}({args}){method['returns']['type']}"
+
+
+def generate(description: dict) -> str:
+    read_only = sorted(m["name"] for m in description["methods"] if m.get("readonly"))
+    source = HEADER.format(
+        abi_json=json.dumps(description, indent=2),
+        read_only=", ".join(f'"{name}"' for name in read_only) or "",
+    )
+    for method in description["methods"]:
+        params = "".join(
+            f"        {arg['name']}: {python_type(arg['type'])},\n"
+            for arg in method["args"]
+        )
+        source += METHOD_TEMPLATE.format(
+            name=method["name"],
+            params=params,
+            signature=signature(method),
+            read_only="  [read-only]" if method.get("readonly") else "",
+            desc=method.get("desc") or method["name"],
+            args=", ".join(arg["name"] for arg in method["args"]),
+        )
+    return source
+
+
+def main():
+    if "--no-compile" not in sys.argv:
+        from unified_certificate_contract import compile_contract, write_contract_json
+        _, _, contract = compile_contract()
+        write_contract_json(contract, ABI_PATH)
+
+    with open(ABI_PATH, "r") as f:
+        description = json.load(f)
+
+    with open(OUTPUT_PATH, "w") as f:
+        f.write(generate(description))
+
+    print(f"✓ Generated {os.path.normpath(OUTPUT_PATH)} ({len(description['methods'])} methods)")
+
+    with open(LAYOUT_PATH, "r") as f:
+        layout = f.read()
+    with open(LAYOUT_OUTPUT_PATH, "w") as f:
+        f.write(LAYOUT_HEADER + layout)
+
+    print(f"✓ Copied box layout to {os.path.normpath(LAYOUT_OUTPUT_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,7 +34,7 @@ def instant_verification_payment_contract():
         return Txn.sender() == App.globalGet(admin_address)
     
     @Subroutine(TealType.none)
-    def split_payment(amount: TealType.uint64):
+    def split_payment(amount: Expr):
         """Split payment between verifier and platform"""
         verifier_amount = amount * VERIFIER_PERCENTAGE / Int(100)
         platform_amount = amount * PLATFORM_PERCENTAGE / Int(100)
@@ -93,7 +93,7 @@ def issuer_registry_contract():
     # Main application logic
     program = Cond(
         [Txn.application_id() == Int(0), on_creation],
-        [Txn.on_completion() == OnCall.NoOp,
+        [Txn.on_completion() == OnComplete.NoOp,
          Cond(
              [Txn.application_args[0] == Bytes("add_issuer"), add_issuer],
              [Txn.application_args[0] == Bytes("remove_issuer"), remove_issuer],
@@ -101,10 +101,10 @@ def issuer_registry_contract():
              [Txn.application_args[0] == Bytes("transfer_admin"), transfer_admin],
              [Int(1), Reject()]
          )],
-        [Txn.on_completion() == OnCall.OptIn, Approve()],  # Allow issuers to opt-in
-        [Txn.on_completion() == OnCall.CloseOut, Approve()],
-        [Txn.on_completion() == OnCall.UpdateApplication, Reject()],  # No updates allowed
-        [Txn.on_completion() == OnCall.DeleteApplication, 
+        [Txn.on_completion() == OnComplete.OptIn, Approve()],  # Allow issuers to opt-in
+        [Txn.on_completion() == OnComplete.CloseOut, Approve()],
+        [Txn.on_completion() == OnComplete.UpdateApplication, Reject()],  # No updates allowed
+        [Txn.on_completion() == OnComplete.DeleteApplication, 
          # Only admin can delete
          If(Txn.sender() == App.globalGet(admin_address)).Then(Approve()).Else(Reject())
         ]
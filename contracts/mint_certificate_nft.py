@@ -5,18 +5,39 @@ This script creates an Algorand Standard Asset (NFT) for a certificate
 and calls the unified contract's issue method with 3-layer verification.
 """
 
+import base64
 import os
 import sys
 import json
-from algosdk import account, mnemonic, transaction
+from algosdk import abi, account, logic, mnemonic, transaction
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+    TransactionWithSigner,
+)
 from algosdk.v2client import algod
 from algosdk.encoding import decode_address
+from algosdk.error import AlgodHTTPError
+
+from box_layout import (
+    cert_box_name,
+    cert_box_mbr,
+    cid_to_multihash,
+    issuer_box_name,
+    metadata_pointer,
+    recipient_index_insert,
+    recipient_index_page_name,
+)
 
 # Contract details
 APP_ID = 748842503
 ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
 ALGOD_TOKEN = ""
 
+# ARC-4 interface written by deploy_unified_contract.py
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "unified_certificate_abi.json")) as f:
+    CONTRACT = abi.Contract.from_json(f.read())
+
 
 def create_nft(client, private_key, cert_data):
     """Create an Algorand ASA (NFT) for the certificate"""
@@ -83,31 +104,70 @@ def issue_certificate_on_contract(client, private_key, cert_data, nft_asset_id,
     
     # Encode recipient address
     recipient_addr_bytes = decode_address(cert_data['recipient_address'])
+    metadata = json.dumps({
+        "student_name": cert_data['student_name'],
+        "course_name": cert_data['course_name'],
+        "timestamp": cert_data['timestamp']
+    }).encode()
+    
+    # The recipient index count says which page the new key goes to
+    recipient_box = recipient_index_page_name(recipient_addr_bytes, 0)
+    try:
+        index = base64.b64decode(client.application_box_by_name(APP_ID, recipient_box)["value"])
+        index_count = int.from_bytes(index[:8], "big")
+    except AlgodHTTPError:
+        index_count = 0
+    index_page, index_mbr = recipient_index_insert(index_count)
     
-    # Create application call
-    # Args: [method, cert_id, ipfs_hash, recipient_address, metadata, ai_verified_flag, nft_asset_id]
-    txn = transaction.ApplicationNoOpTxn(
+    # Boxes touched: issuer record (read), certificate record and recipient index (write)
+    boxes = [
+        (APP_ID, issuer_box_name(decode_address(sender))),
+        (APP_ID, cert_box_name(cert_data['cert_id'])),
+        (APP_ID, recipient_box),
+    ]
+    if index_page:
+        boxes.append((APP_ID, recipient_index_page_name(recipient_addr_bytes, index_page)))
+    
+    # The app account must cover the new boxes' minimum balance
+    pointer = metadata_pointer(metadata)
+    box_funding = cert_box_mbr(len(pointer)) + index_mbr
+    
+    signer = AccountTransactionSigner(private_key)
+    pay_txn = TransactionWithSigner(
+        transaction.PaymentTxn(
+            sender=sender,
+            sp=params,
+            receiver=logic.get_application_address(APP_ID),
+            amt=box_funding
+        ),
+        signer
+    )
+    
+    # issue(string,byte[34],address,byte[],bool,bool,uint64,pay)void
+    atc = AtomicTransactionComposer()
+    atc.add_method_call(
+        app_id=APP_ID,
+        method=CONTRACT.get_method_by_name("issue"),
         sender=sender,
         sp=params,
-        index=APP_ID,
-        app_args=[
-            b"issue",
-            cert_data['cert_id'].encode(),
-            cert_data['ipfs_hash'].encode(),
-            recipient_addr_bytes,
-            json.dumps({
-                "student_name": cert_data['student_name'],
-                "course_name": cert_data['course_name'],
-                "timestamp": cert_data['timestamp']
-            }).encode(),
-            (1 if ai_verified else 0).to_bytes(1, 'big'),
-            str(nft_asset_id).encode()
-        ]
+        signer=signer,
+        method_args=[
+            cert_data['cert_id'],
+            cid_to_multihash(cert_data['ipfs_hash']),
+            cert_data['recipient_address'],
+            pointer,
+            ai_verified,
+            True,
+            nft_asset_id,
+            pay_txn
+        ],
+        boxes=boxes,
+        # The box only keeps the metadata pointer; indexers read the JSON from the note
+        note=metadata
     )
     
-    # Sign and send
-    signed_txn = txn.sign(private_key)
-    tx_id = client.send_transaction(signed_txn)
+    # Sign and send as one group
+    tx_id = atc.submit(client)[-1]
     
     print(f"Certificate issuance transaction sent: {tx_id}")
     
@@ -205,7 +265,7 @@ if __name__ == "__main__":
     # Example usage
     example_cert = {
         "cert_id": "CERT-2025-001",
-        "ipfs_hash": "QmExample123456789",
+        "ipfs_hash": "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG",
         "student_name": "Alice Johnson",
         "course_name": "Blockchain Development",
         "issuer_address": "HNTEOSL5NPTVES7GWQ3TXE3FFCTNT337H7ZNEIBO2EAYMZWKN2ZGUL742Q",
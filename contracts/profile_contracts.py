@@ -0,0 +1,939 @@
+"""
+Opcode Cost and State Footprint Profiler
+
+Deploys every contract in this directory to a throwaway sandbox network
+(AlgoKit localnet by default) and runs each branch through algod's
+simulate endpoint with state-change tracing:
+1. Opcode cost: app budget consumed by the profiled call
+2. Bytes written: key + final value of every global, local and box key
+   the call writes (a key written twice counts once)
+3. Min-balance impact: boxes created / resized / deleted (app account),
+   plus the schema cost of creation and opt-in
+4. Program size: compiled approval and clear bytecode
+
+Branches run in order against the same deployment; setup calls (adding
+an issuer, issuing a certificate, opting in) are committed so later
+branches see realistic state, everything else is only simulated.
+
+Without a node, --engine jig runs the same branches through go-algorand's
+ledger evaluator (the algojig package) instead: each approval program
+logs the budget left before it returns, and state changes come from the
+evaluator's deltas. Both engines run the same AVM, so their results
+compare against one baseline.
+
+Results are compared with profile_baseline.json: a branch whose cost,
+bytes written or min-balance impact grew (beyond --tolerance), or that
+now fails where it passed, fails the run with exit code 1. A missing
+baseline (file or contract entry) is an error too; record it explicitly
+with --update-baseline.
+
+Usage:
+    python profile_contracts.py                      # profile and compare
+    python profile_contracts.py --update-baseline    # record the baseline
+    python profile_contracts.py --contract unified   # one contract only
+    python profile_contracts.py --engine jig         # no node: algojig evaluator
+
+Environment:
+    PROFILE_ALGOD_ADDRESS / PROFILE_ALGOD_TOKEN   (default localnet :4001)
+    PROFILE_KMD_ADDRESS / PROFILE_KMD_TOKEN       (default localnet :4002)
+    PROFILE_MNEMONIC   funded account to use instead of the KMD wallet
+
+Exit codes: 0 ok, 1 regression, 2 no usable sandbox, 3 no baseline.
+"""
+
+import argparse
+import base64
+import copy
+import hashlib
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+from algosdk import account, error, logic, mnemonic, transaction
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+    TransactionWithSigner,
+)
+from algosdk.encoding import msgpack
+from algosdk.kmd import KMDClient
+from algosdk.v2client import algod
+from algosdk.v2client.models import SimulateRequest, SimulateTraceConfig
+from pyteal import compileTeal, Mode
+
+try:
+    import algojig
+    from algojig.ledger import JigLedger
+    ALGOJIG_AVAILABLE = True
+except ImportError:
+    JigLedger = object
+    ALGOJIG_AVAILABLE = False
+
+from box_layout import (
+    LEAF_PREIMAGE_SIZE,
+    MERKLE_LEAF_PREFIX,
+    MERKLE_NODE_PREFIX,
+    batch_box_mbr,
+    batch_box_name,
+    box_mbr,
+    cert_box_mbr,
+    cert_box_name,
+    cid_to_multihash,
+    issuer_box_mbr,
+    issuer_box_name,
+    metadata_pointer,
+    recipient_box_name,
+    recipient_index_mbr,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "profile_baseline.json")
+
+LOCALNET_ALGOD = ("http://localhost:4001", "a" * 64)
+LOCALNET_KMD = ("http://localhost:4002", "a" * 64)
+LOCALNET_WALLET = "unencrypted-default-wallet"
+
+# Profiling deploys apps and sends transactions: never on a public network
+PUBLIC_GENESIS_IDS = ("mainnet-v1.0", "testnet-v1.0", "betanet-v1.0")
+
+# algojig's binary keeps its ledger database here
+JIG_WORKDIR = "/tmp/jig"
+
+# Opcode budget each app call adds to its group's pool
+APP_CALL_BUDGET = 700
+
+# Longest approval + clear program one app page holds
+APP_PAGE_SIZE = 2048
+
+# Protocol minimum-balance costs, in microAlgos
+ACCOUNT_MIN_BALANCE = 100_000
+APP_PAGE_MBR = 100_000
+SCHEMA_UINT_MBR = 28_500
+SCHEMA_BYTES_MBR = 50_000
+
+PROFILE_CID = "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+PROFILE_METADATA = json.dumps({
+    "courseName": "Profiling 101",
+    "studentName": "Profile Recipient",
+    "issueDate": "2025-01-01",
+    "grade": "A",
+}).encode()
+
+Measurement = Dict[str, object]
+
+
+def extra_pages(approval: bytes, clear: bytes) -> int:
+    """Extra program pages an app with these programs must be created with"""
+    return (len(approval) + len(clear) - 1) // APP_PAGE_SIZE
+
+
+def schema_mbr(schema: transaction.StateSchema) -> int:
+    return SCHEMA_UINT_MBR * schema.num_uints + SCHEMA_BYTES_MBR * schema.num_byte_slices
+
+
+# ==================== SANDBOX ====================
+
+class Sandbox:
+    """Algod client plus a funded account on a throwaway network"""
+
+    def __init__(self):
+        address = os.getenv("PROFILE_ALGOD_ADDRESS", LOCALNET_ALGOD[0])
+        token = os.getenv("PROFILE_ALGOD_TOKEN", LOCALNET_ALGOD[1])
+        self.client = algod.AlgodClient(token, address)
+        self.address = address
+
+        params = self.client.suggested_params()
+        if params.gen in PUBLIC_GENESIS_IDS:
+            raise RuntimeError(f"{address} is {params.gen}; profiling needs a sandbox network")
+
+        self.private_key = self._funded_key()
+        self.sender = account.address_from_private_key(self.private_key)
+        self.signer = AccountTransactionSigner(self.private_key)
+
+    def _funded_key(self) -> str:
+        phrase = os.getenv("PROFILE_MNEMONIC")
+        if phrase:
+            return mnemonic.to_private_key(phrase)
+        kmd = KMDClient(
+            os.getenv("PROFILE_KMD_TOKEN", LOCALNET_KMD[1]),
+            os.getenv("PROFILE_KMD_ADDRESS", LOCALNET_KMD[0])
+        )
+        wallet = next(w for w in kmd.list_wallets() if w["name"] == LOCALNET_WALLET)
+        handle = kmd.init_wallet_handle(wallet["id"], "")
+        try:
+            keys = kmd.list_keys(handle)
+            richest = max(keys, key=lambda a: self.client.account_info(a, exclude="all")["amount"])
+            return kmd.export_key(handle, "", richest)
+        finally:
+            kmd.release_wallet_handle(handle)
+
+    def params(self) -> transaction.SuggestedParams:
+        return self.client.suggested_params()
+
+    def new_account(self, amount: int = 2_000_000) -> Tuple[str, str]:
+        private_key, address = account.generate_account()
+        self.send([transaction.PaymentTxn(self.sender, self.params(), address, amount)], [self.private_key])
+        return private_key, address
+
+    def send(self, txns: List[transaction.Transaction], keys: List[str]) -> Dict:
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        signed = [txn.sign(key) for txn, key in zip(txns, keys)]
+        self.client.send_transactions(signed)
+        return transaction.wait_for_confirmation(self.client, signed[-1].get_txid(), 4)
+
+    def compile(self, teal: str) -> bytes:
+        return base64.b64decode(self.client.compile(teal)["result"])
+
+    def box_length(self, app_id: int, name: bytes) -> Optional[int]:
+        try:
+            box = self.client.application_box_by_name(app_id, name)
+        except error.AlgodHTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        return len(base64.b64decode(box["value"]))
+
+    def simulate(self, atc: AtomicTransactionComposer) -> Dict:
+        request = SimulateRequest(
+            txn_groups=[],
+            exec_trace_config=SimulateTraceConfig(enable=True, state_change=True)
+        )
+        return atc.simulate(self.client, request).simulate_response
+
+    def execute(self, atc: AtomicTransactionComposer) -> None:
+        atc.execute(self.client, 4)
+
+
+class SandboxLedger(JigLedger):
+    """algojig ledger that behaves like a fresh localnet
+
+    - App ids start at FIRST_APP_ID: the AVM refuses state lookups for
+      ids below 1000 (they are read as foreign-array offsets)
+    - An app's creator can also opt in to it: algojig writes the app
+      params and the local state as two resource rows, which the ledger
+      database rejects; go-algorand keeps them in one row flagged as
+      owner + holder
+    """
+
+    FIRST_APP_ID = 1001
+
+    # go-algorand resource flags
+    OWNER_HOLDING = 2
+    EMPTY_APP_LOCAL_STATE = 8
+
+    def write_apps(self):
+        held = {}
+        for app_id, app in self.apps.items():
+            addrid = self.accounts[app["creator"]]["rowid"]
+            row = self.db.execute("SELECT data FROM resources WHERE addrid = ? AND aidx = ?", [addrid, app_id]).fetchone()
+            if row is not None:
+                held[(addrid, app_id)] = msgpack.unpackb(row[0])
+                self.db.execute("DELETE FROM resources WHERE addrid = ? AND aidx = ?", [addrid, app_id])
+        super().write_apps()
+        for (addrid, app_id), local in held.items():
+            row = self.db.execute("SELECT data FROM resources WHERE addrid = ? AND aidx = ?", [addrid, app_id]).fetchone()
+            data = msgpack.unpackb(row[0])
+            data.update({key: local[key] for key in ("n", "o", "p") if key in local})
+            data["y"] = self.OWNER_HOLDING | (local.get("y", 0) & self.EMPTY_APP_LOCAL_STATE)
+            self.db.execute(
+                "UPDATE resources SET data = ? WHERE addrid = ? AND aidx = ?",
+                [msgpack.packb(data), addrid, app_id]
+            )
+
+    def write_block(self):
+        super().write_block()
+        header = msgpack.unpackb(
+            self.block_db.execute("SELECT hdrdata FROM blocks WHERE rnd = 1").fetchone()[0],
+            strict_map_key=False
+        )
+        if header["tc"] < self.FIRST_APP_ID:
+            header["tc"] = self.FIRST_APP_ID
+            self.block_db.execute("UPDATE blocks SET hdrdata = ? WHERE rnd = 1", [msgpack.packb(header)])
+
+
+class JigSandbox:
+    """Sandbox on go-algorand's ledger evaluator (algojig), for hosts without a node
+
+    The evaluator reports no opcode cost, so every approval program is
+    deployed with a budget log in front of each `return` (BUDGET_LOG).
+    Reports still use the uninstrumented bytecode.
+    """
+
+    # algojig's genesis totals overflow much above this
+    FUNDING = 100_000_000
+    BUDGET_LOG = ["global OpcodeBudget", "itob", "log"]
+
+    def __init__(self):
+        if not ALGOJIG_AVAILABLE:
+            raise RuntimeError("algojig is not installed (pip install algojig)")
+        os.makedirs(JIG_WORKDIR, exist_ok=True)
+        self.ledger = SandboxLedger()
+        self.address = "algojig (go-algorand ledger evaluator)"
+        self.private_key, self.sender = account.generate_account()
+        self.signer = AccountTransactionSigner(self.private_key)
+        self.ledger.set_account_balance(self.sender, self.FUNDING)
+        # Instrumented bytecode by real bytecode, and the compiled
+        # instrumented programs by bytecode (evaluator errors map to TEAL lines)
+        self.instrumented: Dict[bytes, bytes] = {}
+        self.programs: Dict[bytes, "algojig.TealProgram"] = {}
+
+    def params(self) -> transaction.SuggestedParams:
+        return algojig.get_suggested_params()
+
+    def new_account(self, amount: int = 2_000_000) -> Tuple[str, str]:
+        private_key, address = account.generate_account()
+        self.send([transaction.PaymentTxn(self.sender, self.params(), address, amount)], [self.private_key])
+        return private_key, address
+
+    def send(self, txns: List[transaction.Transaction], keys: List[str]) -> Dict:
+        txns = [self._instrument(txn) for txn in txns]
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        block = self._eval([txn.sign(key) for txn, key in zip(txns, keys)])
+        last = block[b"txns"][-1]
+        return {"application-index": last.get(b"apid", 0)}
+
+    def compile(self, teal: str) -> bytes:
+        real = algojig.TealProgram(teal=teal)
+        # Instrumented line -> line of the source (budget logs map to their return)
+        lines, origin = [], []
+        for number, line in enumerate(teal.split("\n")):
+            if line.split("//")[0].strip() == "return":
+                lines.extend(self.BUDGET_LOG)
+                origin.extend([number] * len(self.BUDGET_LOG))
+            lines.append(line)
+            origin.append(number)
+        program = algojig.TealProgram(teal="\n".join(lines))
+        program.source_map.pc_to_line = {pc: origin[line] for pc, line in program.source_map.pc_to_line.items()}
+        program.teal = teal
+        self.instrumented[real.bytecode] = program.bytecode
+        self.programs[program.bytecode] = program
+        return real.bytecode
+
+    def box_length(self, app_id: int, name: bytes) -> Optional[int]:
+        value = self.ledger.boxes.get(app_id, {}).get(name)
+        return None if value is None else len(value)
+
+    def execute(self, atc: AtomicTransactionComposer) -> None:
+        self._eval(self._sign(atc)[1])
+
+    def simulate(self, atc: AtomicTransactionComposer) -> Dict:
+        """Evaluate the group, then discard its state"""
+        group, signed = self._sign(atc)
+        saved = self._save()
+        try:
+            block = self._eval(signed)
+            boxes_after = copy.deepcopy(self.ledger.boxes)
+        except RuntimeError as e:
+            return {"txn-groups": [{"failure-message": str(e), "txn-results": [{} for _ in group]}]}
+        finally:
+            self._restore(saved)
+
+        # Budget left in the pool as each call returned; the BUDGET_LOG
+        # ops after the read are charged to the next call, hence the offset
+        calls = [i for i, txn in enumerate(group) if txn.type == "appl"]
+        budget = APP_CALL_BUDGET * len(calls) + len(self.BUDGET_LOG)
+        results = []
+        for i, (txn, stxn) in enumerate(zip(group, block[b"txns"])):
+            result = {}
+            if i in calls:
+                delta = stxn.get(b"dt") or {}
+                left = int.from_bytes(delta[b"lg"][-1], "big")
+                trace = self._trace(txn, delta)
+                if i == calls[-1]:
+                    trace["approval-program-trace"][0]["state-changes"] += self._box_changes(saved["boxes"], boxes_after)
+                result["app-budget-consumed"] = budget - left - len(self.BUDGET_LOG)
+                result["exec-trace"] = trace
+                budget = left
+            results.append(result)
+        return {"txn-groups": [{"txn-results": results}]}
+
+    # Helpers
+
+    def _instrument(self, txn: transaction.Transaction) -> transaction.Transaction:
+        approval = getattr(txn, "approval_program", None)
+        if approval not in self.instrumented:
+            return txn
+        txn = copy.deepcopy(txn)
+        txn.approval_program = self.instrumented[approval]
+        return txn
+
+    def _sign(self, atc: AtomicTransactionComposer) -> Tuple[List[transaction.Transaction], List]:
+        """The group with instrumented programs, re-signed by the composer's signers"""
+        built = atc.build_group()
+        group = [self._instrument(copy.deepcopy(tws.txn)) for tws in built]
+        for txn in group:
+            txn.group = None
+        if len(group) > 1:
+            transaction.assign_group_id(group)
+        signed = [tws.signer.sign_transactions([txn], [0])[0] for tws, txn in zip(built, group)]
+        return group, signed
+
+    def _eval(self, signed: List) -> Dict:
+        try:
+            block = self.ledger.eval_transactions(signed)
+        except Exception as e:
+            # algojig hides the evaluator's error behind a KeyError for apps created by a transaction
+            cause = e.__context__ if isinstance(e, KeyError) and e.__context__ is not None else e
+            try:
+                message = str(cause)
+            except Exception:
+                message = str(cause.args[0])
+            raise RuntimeError(message) from None
+        for stxn in block.get(b"txns") or []:
+            app = self.ledger.apps.get(stxn.get(b"apid"))
+            if app is not None and "approval_program" not in app:
+                app["approval_program"] = self.programs.get(app["approval_program_bytecode"])
+        return block
+
+    def _save(self) -> Dict:
+        fields = ("accounts", "apps", "boxes", "assets", "global_states", "raw_accounts")
+        return {field: copy.deepcopy(getattr(self.ledger, field)) for field in fields}
+
+    def _restore(self, saved: Dict) -> None:
+        for field, value in saved.items():
+            setattr(self.ledger, field, value)
+
+    def _trace(self, txn: transaction.Transaction, delta: Dict) -> Dict:
+        """Simulate-style exec trace rebuilt from an evaluator delta"""
+        changes = [self._change("g", key, value) for key, value in (delta.get(b"gd") or {}).items()]
+        accounts = [txn.sender] + list(getattr(txn, "accounts", None) or [])
+        for index, local_delta in (delta.get(b"ld") or {}).items():
+            for key, value in local_delta.items():
+                change = self._change("l", key, value)
+                change["account"] = accounts[index]
+                changes.append(change)
+        inner = []
+        for itxn in delta.get(b"itx") or []:
+            inner_delta = itxn.get(b"dt") or {}
+            inner.append({
+                "approval-program-trace": [{"state-changes": [
+                    self._change("g", key, value) for key, value in (inner_delta.get(b"gd") or {}).items()
+                ]}],
+            })
+        return {"approval-program-trace": [{"state-changes": changes}], "inner-trace": inner}
+
+    @staticmethod
+    def _change(state_type: str, key: bytes, value: Dict) -> Dict:
+        change = {"app-state-type": state_type, "key": base64.b64encode(key).decode()}
+        action = value.get(b"at")
+        if action == 3:
+            change["operation"] = "d"
+        elif action == 1:
+            change["operation"] = "w"
+            change["new-value"] = {"type": 1, "bytes": base64.b64encode(value.get(b"bs", b"")).decode()}
+        else:
+            change["operation"] = "w"
+            change["new-value"] = {"type": 2, "uint": value.get(b"ui", 0)}
+        return change
+
+    @staticmethod
+    def _box_changes(before: Dict, after: Dict) -> List[Dict]:
+        changes = []
+        for app_id in set(before) | set(after):
+            old, new = before.get(app_id, {}), after.get(app_id, {})
+            for name in set(old) | set(new):
+                if name not in new:
+                    changes.append({"app-state-type": "b", "operation": "d", "key": base64.b64encode(name).decode()})
+                elif old.get(name) != new[name]:
+                    changes.append({
+                        "app-state-type": "b",
+                        "operation": "w",
+                        "key": base64.b64encode(name).decode(),
+                        "new-value": {"type": 1, "bytes": base64.b64encode(new[name] or b"").decode()},
+                    })
+        return changes
+
+
+# ==================== MEASUREMENT ====================
+
+def _state_changes(trace: Optional[Dict]) -> List[Dict]:
+    """State changes of an exec trace, inner transactions included"""
+    if not trace:
+        return []
+    changes = []
+    for unit in trace.get("approval-program-trace") or []:
+        changes.extend(unit.get("state-changes") or [])
+    for inner in trace.get("inner-trace") or []:
+        changes.extend(_state_changes(inner))
+    return changes
+
+
+def _value_length(value: Optional[Dict]) -> int:
+    if not value:
+        return 0
+    if value.get("type") == 1:
+        return len(base64.b64decode(value.get("bytes", "")))
+    return 8
+
+
+def measure(sandbox: Sandbox, app_id: int, atc: AtomicTransactionComposer) -> Measurement:
+    """Simulate a group and measure its last app call"""
+    group = sandbox.simulate(atc)["txn-groups"][0]
+    results = group.get("txn-results") or []
+    calls = [i for i, r in enumerate(results) if "app-budget-consumed" in r]
+    index = calls[-1] if calls else len(results) - 1
+    result = results[index] if results else {}
+
+    # Final length of every key the call touched (None once deleted)
+    final: Dict[Tuple[Optional[str], Optional[str], bytes], Optional[int]] = {}
+    for change in _state_changes(result.get("exec-trace")):
+        slot = (change.get("app-state-type"), change.get("account"), base64.b64decode(change.get("key", "")))
+        final[slot] = _value_length(change.get("new-value")) if change.get("operation") == "w" else None
+    bytes_written = sum(len(key) + length for (_, _, key), length in final.items() if length is not None)
+    box_after = {key: length for (state_type, _, key), length in final.items() if state_type == "b"}
+
+    # Min-balance change of the app account from boxes touched by the call
+    mbr = 0
+    for name, after in box_after.items():
+        before = sandbox.box_length(app_id, name) if app_id else None
+        mbr += (box_mbr(len(name), after) if after is not None else 0)
+        mbr -= (box_mbr(len(name), before) if before is not None else 0)
+
+    return {
+        "ok": "failure-message" not in group,
+        "cost": result.get("app-budget-consumed", 0),
+        "bytes_written": bytes_written,
+        "mbr": mbr,
+        "error": group.get("failure-message"),
+    }
+
+
+# ==================== CONTRACT PROFILES ====================
+
+class ContractProfile:
+    """How to deploy one contract and exercise each of its branches"""
+
+    name = ""
+    version = 6
+    global_schema = transaction.StateSchema(0, 0)
+    local_schema = transaction.StateSchema(0, 0)
+
+    def __init__(self, sandbox: Sandbox, shared: Dict):
+        self.sandbox = sandbox
+        self.shared = shared
+        self.app_id = 0
+
+    def teal(self) -> Tuple[str, str]:
+        raise NotImplementedError
+
+    def create_kwargs(self) -> Dict:
+        return {}
+
+    def setup(self) -> None:
+        """Committed transactions needed before the branches run"""
+
+    def branches(self) -> List[Tuple[str, Callable[[], AtomicTransactionComposer], bool]]:
+        """(branch, group builder, commit after measuring)"""
+        raise NotImplementedError
+
+    # Helpers
+
+    def atc(self, txns: List[transaction.Transaction], keys: Optional[List[str]] = None) -> AtomicTransactionComposer:
+        atc = AtomicTransactionComposer()
+        keys = keys or [self.sandbox.private_key] * len(txns)
+        for txn, key in zip(txns, keys):
+            atc.add_transaction(TransactionWithSigner(txn, AccountTransactionSigner(key)))
+        return atc
+
+    def call(self, args: List, sender_key: Optional[str] = None, **kwargs) -> transaction.Transaction:
+        sender_key = sender_key or self.sandbox.private_key
+        return transaction.ApplicationCallTxn(
+            sender=account.address_from_private_key(sender_key),
+            sp=self.sandbox.params(),
+            index=self.app_id,
+            on_complete=kwargs.pop("on_complete", transaction.OnComplete.NoOpOC),
+            app_args=[arg.encode() if isinstance(arg, str) else arg for arg in args],
+            **kwargs
+        )
+
+    def fund_app(self, amount: int) -> None:
+        self.sandbox.send(
+            [transaction.PaymentTxn(self.sandbox.sender, self.sandbox.params(), logic.get_application_address(self.app_id), amount)],
+            [self.sandbox.private_key]
+        )
+
+    def profile(self) -> Dict:
+        try:
+            approval_teal, clear_teal = self.teal()
+            approval = self.sandbox.compile(approval_teal)
+            clear = self.sandbox.compile(clear_teal)
+        except Exception as e:
+            # Reported (and compared) like a failing branch, not a crash
+            return {"program": None, "error": f"Compile failed: {e}", "branches": {}}
+        create = transaction.ApplicationCreateTxn(
+            sender=self.sandbox.sender,
+            sp=self.sandbox.params(),
+            on_complete=transaction.OnComplete.NoOpOC,
+            approval_program=approval,
+            clear_program=clear,
+            global_schema=self.global_schema,
+            local_schema=self.local_schema,
+            extra_pages=extra_pages(approval, clear),
+            **self.create_kwargs()
+        )
+
+        report = {
+            "program": {"approval_bytes": len(approval), "clear_bytes": len(clear)},
+            "branches": {},
+        }
+        creation = measure(self.sandbox, 0, self.atc([create]))
+        creation["mbr"] += APP_PAGE_MBR * (1 + create.extra_pages) + schema_mbr(self.global_schema)
+        report["branches"]["create"] = creation
+        if not creation["ok"]:
+            return report
+
+        self.app_id = self.sandbox.send([create], [self.sandbox.private_key])["application-index"]
+        self.setup()
+
+        for branch, build, commit in self.branches():
+            atc = build()
+            result = measure(self.sandbox, self.app_id, atc)
+            if branch == "opt_in":
+                result["mbr"] += schema_mbr(self.local_schema)
+            report["branches"][branch] = result
+            if commit and result["ok"]:
+                self.sandbox.execute(atc)
+        return report
+
+
+class IssuerRegistryProfile(ContractProfile):
+    name = "issuer_registry"
+    global_schema = transaction.StateSchema(num_uints=1, num_byte_slices=1)
+    local_schema = transaction.StateSchema(num_uints=2, num_byte_slices=2)
+
+    def teal(self):
+        from issuer_registry_contract import issuer_registry_contract, clear_state_program
+        return (
+            compileTeal(issuer_registry_contract(), Mode.Application, version=self.version),
+            compileTeal(clear_state_program(), Mode.Application, version=self.version),
+        )
+
+    def setup(self):
+        self.shared["issuer_registry_app_id"] = self.app_id
+
+    def branches(self):
+        sender = self.sandbox.sender
+        opt_in = transaction.OnComplete.OptInOC
+        return [
+            ("opt_in", lambda: self.atc([self.call([], on_complete=opt_in)]), True),
+            ("add_issuer", lambda: self.atc([self.call(["add_issuer", "Profiler", "metadata"], accounts=[sender])]), True),
+            ("check_issuer", lambda: self.atc([self.call(["check_issuer"], accounts=[sender])]), False),
+            ("transfer_admin", lambda: self.atc([self.call(["transfer_admin"])]), False),
+            ("remove_issuer", lambda: self.atc([self.call(["remove_issuer"], accounts=[sender])]), False),
+        ]
+
+
+class CertificationProfile(ContractProfile):
+    name = "certification"
+    global_schema = transaction.StateSchema(num_uints=2, num_byte_slices=0)
+    local_schema = transaction.StateSchema(num_uints=2, num_byte_slices=3)
+
+    def teal(self):
+        from certification_contract import certification_contract, clear_state_program
+        return (
+            compileTeal(certification_contract(), Mode.Application, version=self.version),
+            compileTeal(clear_state_program(), Mode.Application, version=self.version),
+        )
+
+    def create_kwargs(self):
+        # Creation reads the registry app id from Txn.applications[1]
+        return {"foreign_apps": [self.shared.get("issuer_registry_app_id", 0)]}
+
+    def setup(self):
+        self.recipient_key, self.recipient = self.sandbox.new_account()
+
+    def branches(self):
+        opt_in = transaction.OnComplete.OptInOC
+        holder_index = (1).to_bytes(8, "big")
+        return [
+            ("opt_in", lambda: self.atc([self.call([], sender_key=self.recipient_key, on_complete=opt_in)], [self.recipient_key]), True),
+            ("issue", lambda: self.atc([self.call(["issue", holder_index, PROFILE_METADATA], accounts=[self.recipient])]), True),
+            ("verify", lambda: self.atc([self.call(["verify", PROFILE_CID], accounts=[self.recipient])]), False),
+            ("get_info", lambda: self.atc([self.call(["get_info"], accounts=[self.recipient])]), False),
+            ("revoke", lambda: self.atc([self.call(["revoke"], accounts=[self.recipient])]), False),
+        ]
+
+
+class InstantVerificationPaymentProfile(ContractProfile):
+    name = "instant_verification_payment"
+    global_schema = transaction.StateSchema(num_uints=3, num_byte_slices=3)
+    local_schema = transaction.StateSchema(num_uints=3, num_byte_slices=0)
+
+    def teal(self):
+        from instant_verification_payment_contract import (
+            instant_verification_payment_contract,
+            clear_state_program,
+        )
+        return (
+            compileTeal(instant_verification_payment_contract(), Mode.Application, version=self.version),
+            compileTeal(clear_state_program(), Mode.Application, version=self.version),
+        )
+
+    def setup(self):
+        self.fund_app(ACCOUNT_MIN_BALANCE)
+        self.user_key, self.user = self.sandbox.new_account(5_000_000)
+
+    def pay_instant(self) -> AtomicTransactionComposer:
+        params = self.sandbox.params()
+        payment = transaction.PaymentTxn(self.user, params, logic.get_application_address(self.app_id), 1_000_000)
+        # Treasury and verifier pool (both the creator until changed) receive the split
+        call = self.call(["pay_instant"], sender_key=self.user_key, accounts=[self.sandbox.sender])
+        # Covers the two inner payments
+        call.fee = 3 * params.min_fee
+        return self.atc([payment, call], [self.user_key, self.user_key])
+
+    def branches(self):
+        opt_in = transaction.OnComplete.OptInOC
+        user_index = (1).to_bytes(8, "big")
+        return [
+            ("opt_in", lambda: self.atc([self.call([], sender_key=self.user_key, on_complete=opt_in)], [self.user_key]), True),
+            ("pay_instant", self.pay_instant, True),
+            ("mark_verified", lambda: self.atc([self.call(["mark_verified", user_index], accounts=[self.user])]), False),
+            ("check_status", lambda: self.atc([self.call(["check_status", user_index], accounts=[self.user])]), False),
+            ("update_fee", lambda: self.atc([self.call(["update_fee", (2_000_000).to_bytes(8, "big")])]), False),
+            ("set_treasury", lambda: self.atc([self.call(["set_treasury", self.sandbox.sender])]), False),
+            ("set_verifier_pool", lambda: self.atc([self.call(["set_verifier_pool", self.sandbox.sender])]), False),
+        ]
+
+
+class UnifiedCertificateProfile(ContractProfile):
+    name = "unified"
+    version = 8
+    global_schema = transaction.StateSchema(num_uints=4, num_byte_slices=1)
+
+    CERT_ID = "PROFILE-0001"
+    BATCH_SIZE = 8
+
+    def teal(self):
+        from unified_certificate_contract import compile_contract
+        approval, clear, self.contract = compile_contract(version=self.version)
+        return approval, clear
+
+    def setup(self):
+        self.fund_app(ACCOUNT_MIN_BALANCE)
+        _, self.recipient = account.generate_account()
+        self.admin_key = self.sandbox.private_key
+        self.admin = self.sandbox.sender
+
+        # Small batch and the proof of its first leaf (the contract hashes the preimage)
+        preimages = [i.to_bytes(LEAF_PREIMAGE_SIZE, "big") for i in range(self.BATCH_SIZE)]
+        level = [hashlib.sha256(MERKLE_LEAF_PREFIX + preimage).digest() for preimage in preimages]
+        self.leaf_preimage = preimages[0]
+        self.proof = b""
+        index = 0
+        while len(level) > 1:
+            # Side byte: 1 = sibling on the right, 0 = on the left
+            self.proof += (b"\x01" if index % 2 == 0 else b"\x00") + level[index ^ 1]
+            level = [
+                hashlib.sha256(MERKLE_NODE_PREFIX + level[i] + level[i + 1]).digest()
+                for i in range(0, len(level), 2)
+            ]
+            index //= 2
+        self.root = level[0]
+
+    def method(self, name: str, args: List, boxes: List[bytes] = (), payment: int = 0) -> AtomicTransactionComposer:
+        params = self.sandbox.params()
+        signer = AccountTransactionSigner(self.admin_key)
+        method_args = list(args)
+        if payment:
+            method_args.append(TransactionWithSigner(
+                transaction.PaymentTxn(self.admin, params, logic.get_application_address(self.app_id), payment),
+                signer
+            ))
+        atc = AtomicTransactionComposer()
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=self.contract.get_method_by_name(name),
+            sender=self.admin,
+            sp=params,
+            signer=signer,
+            method_args=method_args,
+            boxes=[(self.app_id, box) for box in boxes]
+        )
+        return atc
+
+    def branches(self):
+        from algosdk.encoding import decode_address
+        issuer_box = issuer_box_name(decode_address(self.admin))
+        cert_box = cert_box_name(self.CERT_ID)
+        index_box = recipient_box_name(decode_address(self.recipient))
+        cid = cid_to_multihash(PROFILE_CID)
+        opt_in = transaction.OnComplete.OptInOC
+        pointer = metadata_pointer(PROFILE_METADATA)
+        issue_mbr = cert_box_mbr(len(pointer)) + recipient_index_mbr()
+        return [
+            ("opt_in", lambda: self.atc([self.call([], on_complete=opt_in)]), False),
+            ("add_issuer", lambda: self.method(
+                "add_issuer", [self.admin, "Profiler", "metadata"], [issuer_box],
+                payment=issuer_box_mbr(len("Profiler"), len("metadata"))
+            ), True),
+            ("check_issuer", lambda: self.method("check_issuer", [self.admin], [issuer_box]), False),
+            ("issue", lambda: self.method(
+                "issue", [self.CERT_ID, cid, self.recipient, pointer, True, True, 0],
+                [cert_box, index_box, issuer_box], payment=issue_mbr
+            ), True),
+            ("verify", lambda: self.method("verify", [self.CERT_ID, cid], [cert_box]), False),
+            ("verify_holder", lambda: self.method("verify_holder", [self.recipient, cid], [index_box, cert_box]), False),
+            ("get_info", lambda: self.method("get_info", [self.CERT_ID], [cert_box]), False),
+            ("anchor_batch", lambda: self.method(
+                "anchor_batch", [self.root, self.BATCH_SIZE], [batch_box_name(self.root), issuer_box],
+                payment=batch_box_mbr()
+            ), True),
+            ("verify_batch_proof", lambda: self.method(
+                "verify_batch_proof", [self.root, self.leaf_preimage, self.proof], [batch_box_name(self.root)]
+            ), False),
+            ("revoke_batch", lambda: self.method("revoke_batch", [self.root], [batch_box_name(self.root)]), False),
+            ("revoke", lambda: self.method("revoke", [self.CERT_ID], [cert_box]), False),
+            ("toggle_ai", lambda: self.method("toggle_ai", []), False),
+            ("transfer_admin", lambda: self.method("transfer_admin", [self.admin]), False),
+            ("remove_issuer", lambda: self.method("remove_issuer", [self.admin], [issuer_box]), False),
+        ]
+
+
+# Registry first: the certification contract is created against it
+PROFILES = [
+    IssuerRegistryProfile,
+    CertificationProfile,
+    InstantVerificationPaymentProfile,
+    UnifiedCertificateProfile,
+]
+
+
+# ==================== BASELINE ====================
+
+def compare(report: Dict, baseline: Dict, tolerance: float, contracts: Optional[List[str]] = None) -> List[str]:
+    """Regressions of report against baseline (empty when none)
+
+    contracts names the contracts this run was meant to cover (default:
+    every baseline entry); any of them missing from the report counts.
+    """
+    regressions = []
+    for contract in contracts if contracts is not None else baseline:
+        if contract in baseline and contract not in report:
+            regressions.append(f"{contract} is in the baseline but was not profiled")
+    for contract, current in report.items():
+        previous = baseline.get(contract)
+        if previous is None:
+            regressions.append(f"{contract} has no baseline entry (run with --update-baseline)")
+            continue
+        if current["program"] is None:
+            if previous["program"] is not None:
+                regressions.append(f"{contract} no longer compiles: {current['error']}")
+            continue
+        for field, size in current["program"].items():
+            before = (previous["program"] or {}).get(field, size)
+            if size > before:
+                regressions.append(f"{contract} {field}: {before} -> {size}")
+        # A deleted or renamed branch must not pass silently
+        for branch in previous["branches"]:
+            if branch not in current["branches"]:
+                regressions.append(f"{contract}.{branch} is in the baseline but did not run")
+        for branch, result in current["branches"].items():
+            before = previous["branches"].get(branch)
+            if before is None:
+                continue
+            if before["ok"] and not result["ok"]:
+                regressions.append(f"{contract}.{branch} now fails: {result['error']}")
+                continue
+            for field in ("cost", "bytes_written", "mbr"):
+                if result[field] > before[field] * (1 + tolerance) and result[field] > before[field]:
+                    regressions.append(f"{contract}.{branch} {field}: {before[field]} -> {result[field]}")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    for contract, current in report.items():
+        program = current["program"]
+        print("\n" + "-" * 72)
+        if program is None:
+            print(f"{contract}  FAIL")
+            print(f"    {current['error']}")
+            continue
+        print(f"{contract}  (approval {program['approval_bytes']} B, clear {program['clear_bytes']} B)")
+        print("-" * 72)
+        print(f"{'branch':<22}{'status':<8}{'cost':>8}{'bytes written':>16}{'MBR (µAlgo)':>16}")
+        for branch, result in current["branches"].items():
+            status = "ok" if result["ok"] else "FAIL"
+            print(f"{branch:<22}{status:<8}{result['cost']:>8}{result['bytes_written']:>16}{result['mbr']:>16}")
+            if not result["ok"]:
+                print(f"    {result['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile opcode cost and state footprint of the contracts")
+    parser.add_argument("--contract", action="append", help="Only profile these contracts (by name)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write results to {os.path.basename(BASELINE_FILE)}")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Allowed relative increase (0.05 = 5%%)")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    parser.add_argument(
+        "--engine", choices=("localnet", "jig"), default="localnet",
+        help="Sandbox to run on: an algod node, or go-algorand's evaluator via algojig"
+    )
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("CONTRACT PROFILER")
+    print("=" * 72)
+
+    # Checked first: without a baseline the run could never fail
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"ERROR: No baseline at {args.baseline}")
+        print("Record one with --update-baseline and commit it.")
+        sys.exit(3)
+
+    try:
+        sandbox = JigSandbox() if args.engine == "jig" else Sandbox()
+    except Exception as e:
+        print(f"ERROR: No usable sandbox network - {e}")
+        print("Start one with `algokit localnet start`, or point PROFILE_ALGOD_ADDRESS")
+        print("(and PROFILE_MNEMONIC) at another private network, or use --engine jig.")
+        sys.exit(2)
+
+    print(f"Sandbox: {sandbox.address}")
+    print(f"Funding account: {sandbox.sender}")
+
+    shared: Dict = {}
+    report: Dict = {}
+    for profile_class in PROFILES:
+        if args.contract and profile_class.name not in args.contract:
+            continue
+        print(f"\nProfiling {profile_class.name}...")
+        report[profile_class.name] = profile_class(sandbox, shared).profile()
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        baseline.update(report)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\n✓ Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerance, args.contract)
+    if regressions:
+        print("\n" + "=" * 72)
+        print(f"REGRESSIONS ({len(regressions)})")
+        print("=" * 72)
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\n✓ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+TEAL Compile Cache
+
+Lets the deployment scripts skip work for contracts that did not change:
+1. Generation: the TEAL a contract produced is stored under a fingerprint
+   of its Python source files (and every contracts/ module they import),
+   the installed PyTeal version and the TEAL version; on a match PyTeal
+   is not imported or run at all
+2. Compilation: bytecode and program hash are stored under the sha256 of
+   the TEAL version and source, so algod's /v2/teal/compile is only
+   called for TEAL it has never compiled
+3. Programs that do need compiling are sent to algod concurrently
+
+Entries are small JSON files under contracts/.cache/teal/ (git-ignored),
+written atomically. Set TEAL_CACHE=0 to bypass the cache for a run.
+
+Limits:
+- Local imports are found by reading import statements, so a module
+  loaded dynamically (importlib, __import__) is not covered
+- Bytecode is keyed by TEAL text and version only, so entries are shared
+  across networks; a node that assembles differently would not be noticed
+"""
+
+import ast
+import base64
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(HERE, ".cache", "teal")
+
+# Concurrent /v2/teal/compile requests
+COMPILE_MAX_WORKERS = 4
+
+
+class CompiledProgram(NamedTuple):
+    teal: str
+    bytecode: bytes
+    hash: str
+
+
+# name -> (source files, TEAL version, generator returning {part: TEAL source})
+ContractSpec = Tuple[List[str], int, Callable[[], Dict[str, str]]]
+
+
+def pyteal_version() -> str:
+    try:
+        return metadata.version("pyteal")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def local_modules(sources: List[str]) -> List[str]:
+    """The source files plus every module next to them they import, transitively"""
+    pending = [path if os.path.isabs(path) else os.path.join(HERE, path) for path in sources]
+    found: List[str] = []
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.append(path)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = os.path.join(os.path.dirname(path), name.split(".")[0] + ".py")
+                if os.path.isfile(module):
+                    pending.append(module)
+    return sorted(found)
+
+
+def sources_fingerprint(sources: List[str], version: int) -> str:
+    """Hash of the contract's source files and local imports, PyTeal version and TEAL version"""
+    digest = hashlib.sha256(f"pyteal {pyteal_version()}\nteal {version}\n".encode())
+    for path in local_modules(sources):
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(os.path.basename(path).encode() + b"\0")
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def teal_key(teal: str, version: int) -> str:
+    return hashlib.sha256(f"{version}\n{teal}".encode()).hexdigest()
+
+
+class TealCache:
+    """On-disk cache of generated TEAL and compiled bytecode"""
+
+    def __init__(self, cache_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        self.cache_dir = cache_dir or os.getenv("TEAL_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.enabled = enabled if enabled is not None else os.getenv("TEAL_CACHE", "1") != "0"
+        self.generated = 0
+        self.compiled = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, f"{key}.json")
+
+    def _read(self, kind: str, key: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(kind, key), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, kind: str, key: str, entry: Dict) -> None:
+        if not self.enabled:
+            return
+        path = self._path(kind, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            # Atomic so a concurrent deploy never reads a partial entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write TEAL cache entry: {e}")
+
+    def teal(self, sources: List[str], version: int, generate: Callable[[], Dict[str, str]]) -> Dict[str, str]:
+        """TEAL source for each program part, generated only when the sources changed"""
+        fingerprint = sources_fingerprint(sources, version)
+        entry = self._read("generated", fingerprint)
+        if entry is not None:
+            return entry["parts"]
+        parts = generate()
+        self.generated += 1
+        self._write("generated", fingerprint, {"parts": parts})
+        return parts
+
+    def compile(self, client, teal: str, version: int) -> CompiledProgram:
+        """Bytecode and program hash, from the cache or algod"""
+        key = teal_key(teal, version)
+        entry = self._read("compiled", key)
+        if entry is not None:
+            with self._lock:
+                self.hits += 1
+            return CompiledProgram(teal, base64.b64decode(entry["bytecode"]), entry["hash"])
+        response = client.compile(teal)
+        with self._lock:
+            self.compiled += 1
+        self._write("compiled", key, {"bytecode": response["result"], "hash": response["hash"]})
+        return CompiledProgram(teal, base64.b64decode(response["result"]), response["hash"])
+
+    def compile_contracts(self, client, contracts: Dict[str, ContractSpec]) -> Dict[str, Dict[str, CompiledProgram]]:
+        """
+        Compile several contracts: {name: {part: CompiledProgram}}
+
+        TEAL is generated one contract at a time (PyTeal builds programs
+        in shared module state); algod compiles run concurrently.
+        """
+        jobs = []
+        for name, (sources, version, generate) in contracts.items():
+            for part, teal in self.teal(sources, version, generate).items():
+                jobs.append((name, part, teal, version))
+
+        with ThreadPoolExecutor(max_workers=COMPILE_MAX_WORKERS) as pool:
+            futures = [
+                (name, part, pool.submit(self.compile, client, teal, version))
+                for name, part, teal, version in jobs
+            ]
+            programs: Dict[str, Dict[str, CompiledProgram]] = {name: {} for name in contracts}
+            for name, part, future in futures:
+                programs[name][part] = future.result()
+        return programs
+
+    def summary(self) -> str:
+        return (
+            f"TEAL cache: {self.generated} generated, {self.compiled} compiled by algod, "
+            f"{self.hits} reused" + ("" if self.enabled else " (disabled)")
+        )
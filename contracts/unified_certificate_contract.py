@@ -1,273 +1,601 @@
+"""
+SkillDCX Unified Certificate Smart Contract (ARC-4)
+
+Three-Layer Verification System:
+1. Issuer Registry Verification - Check if issuer is authorized
+2. AI Verification - Validate certificate data via AI backend
+3. IPFS Verification - Confirm metadata hash exists and is valid
+
+Features:
+- Integrated issuer management (from issuer_registry_contract.py)
+- Certificate issuance with verification layers (from certification_contract.py)
+- NFT minting logic (from CertificateIssuer.py)
+- Soulbound NFT certificates (non-transferable)
+- Box storage: one record per certificate, keyed by cert id, so
+  capacity scales with the app account balance (see box_layout.py)
+- Batch anchoring: one box per Merkle root covering a whole cohort,
+  with an on-chain inclusion proof check
+- ARC-4 ABI: methods are dispatched by selector with typed arguments;
+  read-only methods (READ_ONLY_METHODS) can be evaluated with simulate
+"""
+
+import json
+import os
+from typing import Literal
+
 from pyteal import *
 
-def unified_certificate_contract():
-    """
-    SkillDCX Unified Certificate Smart Contract
-    
-    Three-Layer Verification System:
-    1. Issuer Registry Verification - Check if issuer is authorized
-    2. AI Verification - Validate certificate data via AI backend
-    3. IPFS Verification - Confirm metadata hash exists and is valid
-    
-    Features:
-    - Integrated issuer management (from issuer_registry_contract.py)
-    - Certificate issuance with verification layers (from certification_contract.py)
-    - NFT minting logic (from CertificateIssuer.py)
-    - Soulbound NFT certificates (non-transferable)
-    """
+from box_layout import (
+    CERT_PREFIX,
+    RECIPIENT_PREFIX,
+    ISSUER_PREFIX,
+    BATCH_PREFIX,
+    BATCH_FLAGS_OFFSET,
+    MERKLE_LEAF_PREFIX,
+    MERKLE_NODE_PREFIX,
+    PROOF_STEP_SIZE,
+    ISSUER_OFFSET,
+    FLAGS_OFFSET,
+    CID_OFFSET,
+    CID_LENGTH,
+    METADATA_POINTER_MAX_LENGTH,
+    MULTIHASH_SHA2_256,
+    FLAG_ACTIVE,
+    FLAG_AI_VERIFIED,
+    FLAG_MANUAL_VERIFIED,
+    INDEX_SLOTS,
+    INDEX_SIZE,
+    INDEX_PAGE_SIZE,
+    METADATA_POINTER_OFFSET,
+    BATCH_RECORD_SIZE,
+    BOX_FLAT_MBR,
+    BOX_BYTE_MBR,
+)
+
+# ==================== GLOBAL STATE KEYS ====================
+admin_address = Bytes("admin")
+total_issuers = Bytes("total_issuers")
+total_certificates = Bytes("total_certs")
+issuer_registry_enabled = Bytes("registry_enabled")
+ai_verification_required = Bytes("ai_required")
+
+# Methods that never change state (ARC-22 "readonly")
+READ_ONLY_METHODS = ("verify", "verify_holder", "get_info", "verify_batch_proof", "check_issuer")
+
+CIDMultihash = abi.StaticBytes[Literal[34]]
+Hash32 = abi.StaticBytes[Literal[32]]
+# LEAF_PREIMAGE_SIZE bytes (see box_layout.py)
+LeafPreimage = abi.StaticBytes[Literal[130]]
+
+# ==================== BOX NAMES ====================
+# Certificate:  c + sha256(cert_id)
+# Recipient:    r + recipient address (32 bytes), further index pages
+#               r + recipient address + page number (8 bytes)
+# Issuer:       i + issuer address (32 bytes)
+# Batch:        b + Merkle root (32 bytes)
+
+def cert_box(cert_id):
+    return Concat(Bytes(CERT_PREFIX), Sha256(cert_id))
+
+def recipient_box(recipient):
+    return Concat(Bytes(RECIPIENT_PREFIX), recipient)
+
+def index_page_box(recipient, slot):
+    """Recipient index page holding the given slot (page 0 has no page suffix)"""
+    return If(
+        slot < Int(INDEX_SLOTS),
+        recipient_box(recipient),
+        Concat(recipient_box(recipient), Itob(slot / Int(INDEX_SLOTS)))
+    )
+
+def index_slot_offset(slot):
+    """Offset of a slot's key within its page (page 0 starts with the count)"""
+    return (
+        If(slot < Int(INDEX_SLOTS), Int(8), Int(0))
+        + (slot % Int(INDEX_SLOTS)) * Int(32)
+    )
+
+def issuer_box(issuer):
+    return Concat(Bytes(ISSUER_PREFIX), issuer)
+
+def batch_box(root):
+    return Concat(Bytes(BATCH_PREFIX), root)
+
+def flag_byte(flags):
+    return Extract(Itob(flags), Int(7), Int(1))
+
+def uint16(value):
+    return Extract(Itob(value), Int(6), Int(2))
+
+# ==================== SUBROUTINES ====================
+
+@Subroutine(TealType.uint64)
+def is_admin():
+    """Check if caller is admin"""
+    return Txn.sender() == App.globalGet(admin_address)
+
+@Subroutine(TealType.uint64)
+def check_issuer_authorized(issuer_addr):
+    """Check if an address is an authorized issuer"""
+    # First byte of the issuer box is the authorization flag. And() does
+    # not short-circuit, so a missing box must not reach GetByte
+    issuer = App.box_get(issuer_box(issuer_addr))
+    return Seq(
+        issuer,
+        If(issuer.hasValue(), GetByte(issuer.value(), Int(0)) == Int(1), Int(0))
+    )
+
+def box_min_balance(value_length, name_length=1 + 32):
+    """Minimum balance of one box (names are a prefix + 32 bytes unless given)"""
+    return Int(BOX_FLAT_MBR) + Int(BOX_BYTE_MBR) * (Int(name_length) + value_length)
+
+def pays_app(payment, amount):
+    """Grouped payment funding new boxes must come from the caller, go to the app account and cover their MBR"""
+    return Assert(
+        payment.get().receiver() == Global.current_application_address(),
+        payment.get().sender() == Txn.sender(),
+        payment.get().amount() >= amount
+    )
+
+# ==================== CONTRACT CREATION / LIFECYCLE ====================
+
+on_creation = Seq([
+    App.globalPut(admin_address, Txn.sender()),
+    App.globalPut(total_issuers, Int(0)),
+    App.globalPut(total_certificates, Int(0)),
+    App.globalPut(issuer_registry_enabled, Int(1)),
+    App.globalPut(ai_verification_required, Int(1)),
+    Approve()
+])
+
+admin_only = Seq([Assert(is_admin()), Approve()])
+
+router = Router(
+    "UnifiedCertificate",
+    BareCallActions(
+        no_op=OnCompleteAction.create_only(on_creation),
+        opt_in=OnCompleteAction.call_only(Approve()),
+        close_out=OnCompleteAction.call_only(Approve()),
+        update_application=OnCompleteAction.call_only(admin_only),
+        delete_application=OnCompleteAction.call_only(admin_only)
+    ),
+    clear_state=Approve(),
+    descr="SkillDCX unified certificate registry with 3-layer verification"
+)
+
+# Selectors are matched in registration order, so the hot verification
+# and issuance paths are registered first and admin calls last.
+
+# ==================== CERTIFICATE VERIFICATION ====================
+
+@router.method
+def verify(cert_id: abi.String, cid: CIDMultihash, *, output: abi.Bool):
+    """True if the certificate exists, is active and AI verified, and its IPFS multihash matches"""
+    stored_cert = App.box_get(cert_box(cert_id.get()))
+    return Seq([
+        stored_cert,
+        output.set(If(
+            stored_cert.hasValue(),
+            And(
+                GetByte(stored_cert.value(), Int(FLAGS_OFFSET)) & Int(FLAG_ACTIVE),
+                GetByte(stored_cert.value(), Int(FLAGS_OFFSET)) & Int(FLAG_AI_VERIFIED),
+                Extract(stored_cert.value(), Int(CID_OFFSET), Int(CID_LENGTH)) == cid.get()
+            ),
+            Int(0)
+        ))
+    ])
+
+@router.method
+def verify_holder(holder: abi.Address, cid: CIDMultihash, *, output: abi.Bool):
+    """True if any active, AI verified certificate held by the address has this IPFS multihash"""
+    holder_index = App.box_get(recipient_box(holder.get()))
+    slot = ScratchVar(TealType.uint64)
+    found = ScratchVar(TealType.uint64)
+    # Flags byte and CID multihash are adjacent in the record; keys past
+    # the first page are read from the overflow pages
+    flags_and_cid = App.box_extract(
+        Concat(
+            Bytes(CERT_PREFIX),
+            App.box_extract(
+                index_page_box(holder.get(), slot.load()),
+                index_slot_offset(slot.load()),
+                Int(32)
+            )
+        ),
+        Int(FLAGS_OFFSET),
+        Int(1 + CID_LENGTH)
+    )
+    record = ScratchVar(TealType.bytes)
+    return Seq([
+        found.store(Int(0)),
+        holder_index,
+        If(holder_index.hasValue()).Then(
+            For(
+                slot.store(Int(0)),
+                And(
+                    Not(found.load()),
+                    slot.load() < ExtractUint64(holder_index.value(), Int(0))
+                ),
+                slot.store(slot.load() + Int(1))
+            ).Do(
+                record.store(flags_and_cid),
+                found.store(And(
+                    GetByte(record.load(), Int(0)) & Int(FLAG_ACTIVE),
+                    GetByte(record.load(), Int(0)) & Int(FLAG_AI_VERIFIED),
+                    Extract(record.load(), Int(1), Int(CID_LENGTH)) == cid.get()
+                ))
+            )
+        ),
+        output.set(found.load())
+    ])
+
+@router.method
+def get_info(cert_id: abi.String, *, output: abi.DynamicBytes):
+    """Raw packed certificate record (see box_layout.py)"""
+    stored_cert = App.box_get(cert_box(cert_id.get()))
+    return Seq([
+        stored_cert,
+        Assert(stored_cert.hasValue()),
+        output.set(stored_cert.value())
+    ])
+
+@router.method
+def verify_batch_proof(root: Hash32, leaf_preimage: LeafPreimage, proof: abi.DynamicBytes, *, output: abi.Bool):
+    """True if the leaf with this preimage is included under an anchored, active Merkle root"""
+    stored_batch = App.box_get(batch_box(root.get()))
+    proof_hash = ScratchVar(TealType.bytes)
+    proof_pos = ScratchVar(TealType.uint64)
+    return Seq([
+        # Each proof step is a side byte (0 = sibling left, 1 = sibling right)
+        # followed by the 32-byte sibling. Deep proofs need pooled budget
+        # (extra app calls in the group, or simulate's extra opcode budget).
+        Assert(Len(proof.get()) % Int(PROOF_STEP_SIZE) == Int(0)),
     
-    # ==================== GLOBAL STATE KEYS ====================
-    admin_address = Bytes("admin")
-    total_issuers = Bytes("total_issuers")
-    total_certificates = Bytes("total_certs")
-    issuer_registry_enabled = Bytes("registry_enabled")
-    ai_verification_required = Bytes("ai_required")
+        # Walk from the leaf to the root; the leaf is hashed here with the
+        # leaf prefix, so an interior node can never be passed off as a leaf
+        proof_hash.store(Sha256(Concat(Bytes(MERKLE_LEAF_PREFIX), leaf_preimage.get()))),
+        For(
+            proof_pos.store(Int(0)),
+            proof_pos.load() < Len(proof.get()),
+            proof_pos.store(proof_pos.load() + Int(PROOF_STEP_SIZE))
+        ).Do(
+            If(GetByte(proof.get(), proof_pos.load()) == Int(0))
+            .Then(proof_hash.store(Sha256(Concat(
+                Bytes(MERKLE_NODE_PREFIX),
+                Extract(proof.get(), proof_pos.load() + Int(1), Int(32)),
+                proof_hash.load()
+            ))))
+            .Else(proof_hash.store(Sha256(Concat(
+                Bytes(MERKLE_NODE_PREFIX),
+                proof_hash.load(),
+                Extract(proof.get(), proof_pos.load() + Int(1), Int(32))
+            ))))
+        ),
     
-    # ==================== LOCAL STATE KEYS ====================
-    # Issuer data (local to issuer addresses)
-    is_authorized = Bytes("authorized")
-    issuer_name = Bytes("issuer_name")
-    issuer_metadata = Bytes("issuer_meta")
-    registration_timestamp = Bytes("reg_time")
+        stored_batch,
+        output.set(If(
+            stored_batch.hasValue(),
+            And(
+                GetByte(stored_batch.value(), Int(BATCH_FLAGS_OFFSET)) & Int(FLAG_ACTIVE),
+                proof_hash.load() == root.get()
+            ),
+            Int(0)
+        ))
+    ])
+
+@router.method
+def check_issuer(issuer: abi.Address, *, output: abi.Bool):
+    """True if the address is an authorized issuer"""
+    return output.set(check_issuer_authorized(issuer.get()))
+
+# ==================== CERTIFICATE ISSUANCE WITH 3-LAYER VERIFICATION ====================
+
+@router.method
+def issue(
+    cert_id: abi.String,
+    cid: CIDMultihash,
+    recipient: abi.Address,
+    metadata_pointer: abi.DynamicBytes,
+    ai_verified: abi.Bool,
+    manual_verified: abi.Bool,
+    nft_asset_id: abi.Uint64,
+    mbr_payment: abi.PaymentTransaction
+):
+    """Record a certificate with a pointer to its metadata (e.g. sha2-256 multihash); mbr_payment funds its boxes"""
+    new_cert_box = App.box_length(cert_box(cert_id.get()))
+    recipient_index = App.box_length(recipient_box(recipient.get()))
+    index_count = ScratchVar(TealType.uint64)
+    return Seq([
+        # The payment covers the certificate box and, for a first
+        # certificate, the recipient index box; a full index page adds a new one
+        recipient_index,
+        index_count.store(
+            If(
+                recipient_index.hasValue(),
+                ExtractUint64(App.box_extract(recipient_box(recipient.get()), Int(0), Int(8)), Int(0)),
+                Int(0)
+            )
+        ),
+        pays_app(
+            mbr_payment,
+            box_min_balance(Int(METADATA_POINTER_OFFSET) + Len(metadata_pointer.get()))
+            + If(
+                index_count.load() % Int(INDEX_SLOTS) == Int(0),
+                If(
+                    index_count.load() == Int(0),
+                    box_min_balance(Int(INDEX_SIZE)),
+                    box_min_balance(Int(INDEX_PAGE_SIZE), 1 + 32 + 8)
+                ),
+                Int(0)
+            )
+        ),
     
-    # Certificate data (local to recipient addresses)
-    cert_id = Bytes("cert_id")
-    cert_ipfs_hash = Bytes("ipfs_hash")
-    cert_issuer = Bytes("issuer")
-    cert_recipient = Bytes("recipient")
-    cert_timestamp = Bytes("timestamp")
-    cert_active = Bytes("active")
-    cert_metadata = Bytes("metadata")
-    cert_ai_verified = Bytes("ai_verified")
-    cert_nft_asset_id = Bytes("nft_asset_id")
+        # LAYER 1: Issuer Registry Verification
+        Assert(check_issuer_authorized(Txn.sender())),
     
-    # ==================== SUBROUTINES ====================
+        # LAYER 2: AI Verification (flag passed from backend after API call)
+        # The backend must call /ai/verifyCertificate and pass result here
+        Assert(ai_verified.get()),
     
-    @Subroutine(TealType.uint64)
-    def is_admin():
-        """Check if caller is admin"""
-        return Txn.sender() == App.globalGet(admin_address)
+        # LAYER 2.5: Manual Verification (required for instant minting)
+        # If manual_verified is false, certificate goes to pending queue
+        # If manual_verified is true, mint immediately (user paid for instant verification)
+        Assert(manual_verified.get()),
     
-    @Subroutine(TealType.uint64)
-    def check_issuer_authorized(issuer_addr):
-        """Check if an address is an authorized issuer"""
-        # Read from global state using address as key
-        return App.globalGet(Concat(Bytes("issuer_"), issuer_addr)) == Int(1)
+        # LAYER 3: IPFS Hash Verification (must be a sha2-256 multihash)
+        # Backend must verify IPFS hash exists before calling
+        Assert(Extract(cid.get(), Int(0), Int(2)) == Bytes(MULTIHASH_SHA2_256)),
+        Assert(Len(metadata_pointer.get()) <= Int(METADATA_POINTER_MAX_LENGTH)),
     
-    # ==================== CONTRACT CREATION ====================
+        # Certificate ids are unique
+        new_cert_box,
+        Assert(Not(new_cert_box.hasValue())),
     
-    on_creation = Seq([
-        App.globalPut(admin_address, Txn.sender()),
-        App.globalPut(total_issuers, Int(0)),
-        App.globalPut(total_certificates, Int(0)),
-        App.globalPut(issuer_registry_enabled, Int(1)),
-        App.globalPut(ai_verification_required, Int(1)),
-        Approve()
-    ])
+        # One box write for the whole fixed-width record
+        App.box_put(
+            cert_box(cert_id.get()),
+            Concat(
+                Txn.sender(),
+                recipient.get(),
+                Itob(Global.latest_timestamp()),
+                Itob(nft_asset_id.get()),
+                flag_byte(Int(FLAG_ACTIVE | FLAG_AI_VERIFIED | FLAG_MANUAL_VERIFIED)),
+                cid.get(),
+                flag_byte(Len(metadata_pointer.get())),
+                metadata_pointer.get()
+            )
+        ),
     
-    # ==================== ISSUER MANAGEMENT ====================
+        # Append the certificate key to the recipient's index
+        If(Not(recipient_index.hasValue()))
+        .Then(Pop(App.box_create(recipient_box(recipient.get()), Int(INDEX_SIZE)))),
+        If(And(index_count.load() >= Int(INDEX_SLOTS), index_count.load() % Int(INDEX_SLOTS) == Int(0)))
+        .Then(Pop(App.box_create(
+            index_page_box(recipient.get(), index_count.load()),
+            Int(INDEX_PAGE_SIZE)
+        ))),
+        App.box_replace(
+            index_page_box(recipient.get(), index_count.load()),
+            index_slot_offset(index_count.load()),
+            Sha256(cert_id.get())
+        ),
+        App.box_replace(
+            recipient_box(recipient.get()),
+            Int(0),
+            Itob(index_count.load() + Int(1))
+        ),
     
-    add_issuer = Seq([
-        # Only admin can add issuers
-        Assert(is_admin()),
-        
-        # Args: [method, issuer_address, name, metadata]
-        Assert(Txn.application_args.length() == Int(4)),
-        
-        # Store issuer authorization in global state using address as key prefix
-        App.globalPut(Concat(Bytes("issuer_"), Txn.application_args[1]), Int(1)),
-        App.globalPut(Concat(Bytes("name_"), Txn.application_args[1]), Txn.application_args[2]),
-        App.globalPut(Concat(Bytes("meta_"), Txn.application_args[1]), Txn.application_args[3]),
-        
         # Increment counter
-        App.globalPut(total_issuers, App.globalGet(total_issuers) + Int(1)),
-        
-        Approve()
+        App.globalPut(total_certificates, App.globalGet(total_certificates) + Int(1))
     ])
+
+# ==================== BATCH ANCHORING ====================
+
+@router.method
+def anchor_batch(root: Hash32, leaf_count: abi.Uint64, mbr_payment: abi.PaymentTransaction):
+    """Anchor the Merkle root of a cohort; mbr_payment funds the batch box"""
+    new_batch_box = App.box_length(batch_box(root.get()))
+    return Seq([
+        # Certificates in the batch are checked off-chain (AI + IPFS layers)
+        # and anchored together; each keeps an inclusion proof off-chain.
+        pays_app(mbr_payment, box_min_balance(Int(BATCH_RECORD_SIZE))),
+        Assert(leaf_count.get() > Int(0)),
     
-    remove_issuer = Seq([
-        # Only admin can remove issuers
-        Assert(is_admin()),
-        
-        # Args: [method, issuer_address]
-        Assert(Txn.application_args.length() == Int(2)),
-        
-        # Verify issuer exists
-        Assert(App.globalGet(Concat(Bytes("issuer_"), Txn.application_args[1])) == Int(1)),
-        
-        # Revoke authorization
-        App.globalPut(Concat(Bytes("issuer_"), Txn.application_args[1]), Int(0)),
-        
-        # Decrement counter
-        App.globalPut(total_issuers, App.globalGet(total_issuers) - Int(1)),
-        
-        Approve()
-    ])
-    
-    check_issuer = Seq([
-        # Args: [method, issuer_address]
-        Assert(Txn.application_args.length() == Int(2)),
-        
-        # Client reads the return value from local state
-        Approve()
-    ])
-    
-    # ==================== CERTIFICATE ISSUANCE WITH 3-LAYER VERIFICATION ====================
-    
-    issue_certificate = Seq([
-        # Args: [method, cert_id, ipfs_hash, recipient_address, metadata, ai_verified_flag, manual_verified_flag, nft_asset_id]
-        Assert(Txn.application_args.length() == Int(8)),
-        
         # LAYER 1: Issuer Registry Verification
         Assert(check_issuer_authorized(Txn.sender())),
-        
-        # LAYER 2: AI Verification (flag passed from backend after API call)
-        # The backend must call /ai/verifyCertificate and pass result here
-        Assert(Btoi(Txn.application_args[5]) == Int(1)),  # ai_verified_flag must be 1
-        
-        # LAYER 2.5: Manual Verification (required for instant minting)
-        # If manual_verified_flag is 0, certificate goes to pending queue
-        # If manual_verified_flag is 1, mint immediately (user paid for instant verification)
-        Assert(Btoi(Txn.application_args[6]) == Int(1)),  # manual_verified_flag must be 1
-        
-        # LAYER 3: IPFS Hash Verification (length check as basic validation)
-        # Backend must verify IPFS hash exists before calling
-        Assert(Len(Txn.application_args[2]) > Int(0)),
-        
-        # Store certificate data in global state using cert_id and recipient address as keys
-        App.globalPut(Concat(Bytes("cert_id_"), Txn.application_args[3]), Txn.application_args[1]),
-        App.globalPut(Concat(Bytes("cert_ipfs_"), Txn.application_args[3]), Txn.application_args[2]),
-        App.globalPut(Concat(Bytes("cert_issuer_"), Txn.application_args[3]), Txn.sender()),
-        App.globalPut(Concat(Bytes("cert_recipient_"), Txn.application_args[3]), Txn.application_args[3]),
-        App.globalPut(Concat(Bytes("cert_time_"), Txn.application_args[3]), Global.latest_timestamp()),
-        App.globalPut(Concat(Bytes("cert_active_"), Txn.application_args[3]), Int(1)),
-        App.globalPut(Concat(Bytes("cert_meta_"), Txn.application_args[3]), Txn.application_args[4]),
-        App.globalPut(Concat(Bytes("cert_ai_"), Txn.application_args[3]), Int(1)),
-        App.globalPut(Concat(Bytes("cert_manual_"), Txn.application_args[3]), Int(1)),
-        App.globalPut(Concat(Bytes("cert_nft_"), Txn.application_args[3]), Txn.application_args[7]),
-        
-        # Increment counter
-        App.globalPut(total_certificates, App.globalGet(total_certificates) + Int(1)),
-        
-        Approve()
-    ])
     
-    # ==================== CERTIFICATE VERIFICATION ====================
+        # A root can only be anchored once
+        new_batch_box,
+        Assert(Not(new_batch_box.hasValue())),
     
-    verify_certificate = Seq([
-        # Args: [method, recipient_address, expected_ipfs_hash]
-        Assert(Txn.application_args.length() == Int(3)),
-        
-        # Check certificate is active
-        Assert(App.globalGet(Concat(Bytes("cert_active_"), Txn.application_args[1])) == Int(1)),
-        
-        # Verify IPFS hash matches
-        Assert(App.globalGet(Concat(Bytes("cert_ipfs_"), Txn.application_args[1])) == Txn.application_args[2]),
-        
-        # Verify AI verification flag
-        Assert(App.globalGet(Concat(Bytes("cert_ai_"), Txn.application_args[1])) == Int(1)),
-        
-        Approve()
-    ])
+        # Batch box: issuer | anchored at | leaf count | flags
+        App.box_put(
+            batch_box(root.get()),
+            Concat(
+                Txn.sender(),
+                Itob(Global.latest_timestamp()),
+                Itob(leaf_count.get()),
+                flag_byte(Int(FLAG_ACTIVE | FLAG_AI_VERIFIED))
+            )
+        ),
     
-    # ==================== CERTIFICATE REVOCATION ====================
+        App.globalPut(
+            total_certificates,
+            App.globalGet(total_certificates) + leaf_count.get()
+        )
+    ])
+
+# ==================== CERTIFICATE REVOCATION ====================
+
+@router.method
+def revoke(cert_id: abi.String):
+    """Mark a certificate inactive (original issuer or admin only)"""
+    stored_cert = App.box_get(cert_box(cert_id.get()))
+    return Seq([
+        stored_cert,
+        Assert(stored_cert.hasValue()),
     
-    revoke_certificate = Seq([
-        # Args: [method, recipient_address]
-        Assert(Txn.application_args.length() == Int(2)),
-        
         # Only original issuer or admin can revoke
         Assert(
             Or(
-                App.globalGet(Concat(Bytes("cert_issuer_"), Txn.application_args[1])) == Txn.sender(),
+                Extract(stored_cert.value(), Int(ISSUER_OFFSET), Int(32)) == Txn.sender(),
                 is_admin()
             )
         ),
-        
+    
         # Mark as inactive
-        App.globalPut(Concat(Bytes("cert_active_"), Txn.application_args[1]), Int(0)),
-        
-        Approve()
+        App.box_replace(
+            cert_box(cert_id.get()),
+            Int(FLAGS_OFFSET),
+            flag_byte(
+                GetByte(stored_cert.value(), Int(FLAGS_OFFSET)) & Int(0xFF ^ FLAG_ACTIVE)
+            )
+        )
     ])
+
+@router.method
+def revoke_batch(root: Hash32):
+    """Mark an anchored batch inactive (anchoring issuer or admin only)"""
+    stored_batch = App.box_get(batch_box(root.get()))
+    return Seq([
+        stored_batch,
+        Assert(stored_batch.hasValue()),
     
-    # ==================== ADMIN FUNCTIONS ====================
+        # Only the issuer that anchored the batch or admin can revoke it
+        Assert(
+            Or(
+                Extract(stored_batch.value(), Int(0), Int(32)) == Txn.sender(),
+                is_admin()
+            )
+        ),
     
-    transfer_admin = Seq([
-        Assert(is_admin()),
-        Assert(Txn.application_args.length() == Int(2)),
-        
-        # Update admin address
-        App.globalPut(admin_address, Txn.application_args[1]),
-        
-        Approve()
+        # Mark as inactive; every certificate in the batch stops verifying
+        App.box_replace(
+            batch_box(root.get()),
+            Int(BATCH_FLAGS_OFFSET),
+            flag_byte(
+                GetByte(stored_batch.value(), Int(BATCH_FLAGS_OFFSET)) & Int(0xFF ^ FLAG_ACTIVE)
+            )
+        )
     ])
-    
-    toggle_ai_verification = Seq([
+
+# ==================== ISSUER MANAGEMENT ====================
+
+@router.method
+def add_issuer(
+    issuer: abi.Address,
+    name: abi.String,
+    metadata: abi.String,
+    mbr_payment: abi.PaymentTransaction
+):
+    """Authorize an issuer (admin only); mbr_payment funds the issuer box"""
+    existing_issuer = App.box_get(issuer_box(issuer.get()))
+    new_mbr = ScratchVar(TealType.uint64)
+    old_mbr = ScratchVar(TealType.uint64)
+    return Seq([
+        # Only admin can add issuers
         Assert(is_admin()),
-        
-        # Toggle AI verification requirement
-        App.globalPut(
-            ai_verification_required,
-            Int(1) - App.globalGet(ai_verification_required)
+        existing_issuer,
+    
+        # The payment covers the new issuer box, less what deleting the
+        # previous record frees
+        new_mbr.store(box_min_balance(Int(1 + 8 + 2) + Len(name.get()) + Len(metadata.get()))),
+        old_mbr.store(
+            If(existing_issuer.hasValue(), box_min_balance(Len(existing_issuer.value())), Int(0))
+        ),
+        pays_app(
+            mbr_payment,
+            If(new_mbr.load() > old_mbr.load(), new_mbr.load() - old_mbr.load(), Int(0))
         ),
-        
-        Approve()
-    ])
     
-    get_certificate_info = Seq([
-        # Args: [method, recipient_address]
-        Assert(Txn.application_args.length() == Int(2)),
-        
-        # Client reads certificate data from local state
-        Approve()
+        # Count the issuer unless it is already active
+        If(Not(If(existing_issuer.hasValue(), GetByte(existing_issuer.value(), Int(0)) == Int(1), Int(0))))
+        .Then(App.globalPut(total_issuers, App.globalGet(total_issuers) + Int(1))),
+    
+        # Replace any previous record (name/metadata may change size)
+        Pop(App.box_delete(issuer_box(issuer.get()))),
+    
+        # Issuer box: flag | registered | name length | name | metadata
+        App.box_put(
+            issuer_box(issuer.get()),
+            Concat(
+                Bytes("base16", "01"),
+                Itob(Global.latest_timestamp()),
+                uint16(Len(name.get())),
+                name.get(),
+                metadata.get()
+            )
+        )
     ])
+
+@router.method
+def remove_issuer(issuer: abi.Address):
+    """Revoke an issuer's authorization (admin only, record kept for history)"""
+    return Seq([
+        # Only admin can remove issuers
+        Assert(is_admin()),
     
-    # ==================== MAIN PROGRAM LOGIC ====================
+        # Verify issuer exists
+        Assert(check_issuer_authorized(issuer.get())),
     
-    program = Cond(
-        [Txn.application_id() == Int(0), on_creation],
-        [Txn.on_completion() == OnComplete.NoOp,
-         Cond(
-             # Issuer management
-             [Txn.application_args[0] == Bytes("add_issuer"), add_issuer],
-             [Txn.application_args[0] == Bytes("remove_issuer"), remove_issuer],
-             [Txn.application_args[0] == Bytes("check_issuer"), check_issuer],
-             
-             # Certificate operations
-             [Txn.application_args[0] == Bytes("issue"), issue_certificate],
-             [Txn.application_args[0] == Bytes("verify"), verify_certificate],
-             [Txn.application_args[0] == Bytes("revoke"), revoke_certificate],
-             [Txn.application_args[0] == Bytes("get_info"), get_certificate_info],
-             
-             # Admin operations
-             [Txn.application_args[0] == Bytes("transfer_admin"), transfer_admin],
-             [Txn.application_args[0] == Bytes("toggle_ai"), toggle_ai_verification],
-             
-             # Default: reject
-             [Int(1), Reject()]
-         )],
-        [Txn.on_completion() == OnComplete.OptIn, Approve()],
-        [Txn.on_completion() == OnComplete.CloseOut, Approve()],
-        [Txn.on_completion() == OnComplete.UpdateApplication, 
-         If(is_admin()).Then(Approve()).Else(Reject())],
-        [Txn.on_completion() == OnComplete.DeleteApplication,
-         If(is_admin()).Then(Approve()).Else(Reject())]
-    )
+        # Revoke authorization
+        App.box_replace(issuer_box(issuer.get()), Int(0), Bytes("base16", "00")),
     
-    return program
+        # Decrement counter
+        App.globalPut(total_issuers, App.globalGet(total_issuers) - Int(1))
+    ])
+
+# ==================== ADMIN FUNCTIONS ====================
+
+@router.method
+def transfer_admin(new_admin: abi.Address):
+    """Hand the admin role to another account"""
+    return Seq([
+        Assert(is_admin()),
+        App.globalPut(admin_address, new_admin.get())
+    ])
+
+@router.method
+def toggle_ai():
+    """Toggle the AI verification requirement"""
+    return Seq([
+        Assert(is_admin()),
+        App.globalPut(
+            ai_verification_required,
+            Int(1) - App.globalGet(ai_verification_required)
+        )
+    ])
+
+
+def compile_contract(version=8):
+    """Compile the router: (approval TEAL, clear TEAL, algosdk ABI Contract)"""
+    return router.compile_program(version=version)
+
+
+def contract_json(contract):
+    """ARC-4 contract description with ARC-22 readonly annotations"""
+    description = contract.dictify()
+    for method in description["methods"]:
+        if method["name"] in READ_ONLY_METHODS:
+            method["readonly"] = True
+    return description
 
 
-def clear_state_program():
-    """Clear state program - always approve for flexibility"""
-    return Approve()
+def write_contract_json(contract, path=None):
+    """Write the ABI description (default: unified_certificate_abi.json next to this file)"""
+    path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "unified_certificate_abi.json")
+    with open(path, "w") as f:
+        json.dump(contract_json(contract), f, indent=2)
+        f.write("\n")
+    return path
 
 
 if __name__ == "__main__":
-    # Compile the contract
-    approval_program = compileTeal(unified_certificate_contract(), Mode.Application, version=6)
-    clear_program = compileTeal(clear_state_program(), Mode.Application, version=6)
+    # Compile the contract (boxes need TEAL v8)
+    approval_program, clear_program, contract = compile_contract()
     
     print("=== UNIFIED CERTIFICATE APPROVAL PROGRAM ===")
     print(approval_program)
     print("\n=== CLEAR STATE PROGRAM ===")
     print(clear_program)
+    print(f"\n✓ ABI written to {write_contract_json(contract)}")